@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+
+from outbound import TokenBucket
+
+
+class Admission:
+    """
+    Decides whether to run a command, with token buckets per user, channel and guild.
+
+    Every command costs some tokens, roughly the number of messages it tends
+    to produce, and runs only if the user's, the channel's and the guild's
+    buckets all have enough. A check is a few dictionary lookups and some
+    arithmetic, so it runs before any of the command's work. Buckets are kept
+    in least-recently-used order and the oldest are dropped past `max_buckets`
+    per scope; a dropped bucket had long refilled anyway.
+
+    Parameters:
+    limits (dict): Scope ("user", "channel" or "guild") mapped to a
+        [tokens, seconds] pair: a burst of that many tokens, refilled over
+        that many seconds. A missing or empty scope isn't limited.
+    guild_limits (dict): Optional guild id mapped to limits that replace the
+        defaults for that guild's scopes.
+    costs (dict): Command name mapped to its cost in tokens (0 exempts it),
+        with "default" for the unlisted commands.
+    """
+
+    SCOPES = ("user", "channel", "guild")
+
+    def __init__(self, limits, guild_limits=None, costs=None, max_buckets=10000):
+        self.limits = limits
+        self.guild_limits = {
+            int(guild_id): {**limits, **overrides} for guild_id, overrides in (guild_limits or {}).items()
+        }
+        self.costs = costs or {}
+        self.max_buckets = max_buckets
+        self.buckets = {scope: OrderedDict() for scope in self.SCOPES}  # scope -> key -> TokenBucket
+        self.warned = set()  # (scope, key) rejected since it last admitted a command
+        self.rejected = 0
+
+    def cost(self, command):
+        return self.costs.get(command, self.costs.get("default", 1))
+
+    def bucket(self, scope, key, limit):
+        buckets = self.buckets[scope]
+        bucket = buckets.get(key)
+        if bucket is None:
+            tokens, seconds = limit
+            bucket = buckets[key] = TokenBucket(tokens, seconds)
+            if len(buckets) > self.max_buckets:
+                evicted, _ = buckets.popitem(last=False)
+                self.warned.discard((scope, evicted))
+        else:
+            buckets.move_to_end(key)
+        return bucket
+
+    def admit(self, command, guild_id, channel_id, user_id, now=None):
+        """
+        Takes a command's cost from every bucket it's subject to, if they all have enough.
+
+        Returns:
+        None if the command may run, otherwise a (scope, retry_after, notify)
+            tuple: the scope whose bucket ran out, the seconds until it has
+            enough again, and whether this is the first rejection since that
+            bucket last admitted a command (to only tell the user once).
+        """
+        cost = self.cost(command)
+        if cost <= 0:
+            return None
+        now = time.monotonic() if now is None else now
+        limits = self.guild_limits.get(guild_id, self.limits)
+
+        buckets = []
+        for scope, key in (("user", (guild_id, user_id)), ("channel", channel_id), ("guild", guild_id)):
+            limit = limits.get(scope)
+            if not limit or key is None:
+                continue
+            bucket = self.bucket(scope, key, limit)
+            bucket.refill(now)
+            # A command costing more than a full bucket only needs a full bucket
+            needed = min(cost, bucket.capacity)
+            if bucket.tokens < needed:
+                self.rejected += 1
+                notify = (scope, key) not in self.warned
+                self.warned.add((scope, key))
+                return scope, (needed - bucket.tokens) / bucket.fill_rate, notify
+            buckets.append((scope, key, bucket, needed))
+
+        for scope, key, bucket, needed in buckets:
+            bucket.tokens -= needed
+            self.warned.discard((scope, key))
+        return None
@@ -0,0 +1,184 @@
+from collections import deque
+
+
+class EggMoves:
+    """
+    Compact form of egg-moves-data.json.
+
+    The file lists every breeding chain for every species and egg move, which
+    repeats the same parent/child pairs thousands of times. Only three facts are
+    kept from it: which species can have each move as an egg move, which species
+    learn it on their own (the last species of a chain), and which parent/child
+    pairs appear in the chains, so breeding exceptions such as baby Pokémon
+    (which breed as their evolved form) are still covered.
+    """
+
+    def __init__(self):
+        self.moves = {}  # species -> list of egg moves, in the order of the data
+        self.carriers = {}  # move -> set of species that can have it as an egg move
+        self.sources = {}  # move -> set of species that learn it without breeding
+        self.edges = {}  # move -> {child: set of parents}
+
+    @classmethod
+    def from_json(cls, egg_moves_data):
+        """Builds the compact form from the parsed contents of egg-moves-data.json."""
+        egg_moves = cls()
+        for species, moves in egg_moves_data.items():
+            egg_moves.moves[species] = list(moves)
+            for move, chains in moves.items():
+                egg_moves.carriers.setdefault(move, set()).add(species)
+                edges = egg_moves.edges.setdefault(move, {})
+                for chain in chains:
+                    # A chain runs from the bred species back to a natural learner
+                    egg_moves.sources.setdefault(move, set()).add(chain[-1])
+                    for child, parent in zip(chain, chain[1:]):
+                        edges.setdefault(child, set()).add(parent)
+        return egg_moves
+
+    def __contains__(self, species):
+        return species in self.moves
+
+    def __iter__(self):
+        return iter(self.moves)
+
+    def __len__(self):
+        return len(self.moves)
+
+
+class BreedingGraph:
+    """
+    Answers "which breeding chains pass move X onto species Y" from a graph.
+
+    For each move, a parent can pass it to a child when the child can have it
+    as an egg move, the parent knows it (naturally or as an egg move), the two
+    share an egg group and the parent can be male. Pairs seen in the original
+    chain data are always allowed. Chains are found by a breadth-first search
+    out from the natural learners, so the shortest chains come first, and the
+    results are memoized per (species, move).
+
+    Parameters:
+    egg_moves (EggMoves): The compact egg move data.
+    egg_groups_data (dict): The parsed contents of egg-groups-data.json.
+    gender_rates (dict): The parsed contents of gender-rates.json.
+    """
+
+    # Gender rates (in eighths female) of species that can never be the father
+    NO_FATHER_RATES = ("-1", "8")
+
+    # Egg groups whose members can't pass moves on by breeding
+    NO_BREEDING_GROUPS = ("cannot-breed", "ditto")
+
+    # Longest chain searched for, in breeding steps (matches the longest chains in the data)
+    MAX_CHAIN_STEPS = 7
+
+    def __init__(self, egg_moves, egg_groups_data, gender_rates):
+        self.egg_moves = egg_moves
+        self.groups = {}  # species -> set of egg group names
+        self.members = {}  # egg group name -> list of species
+        for group in egg_groups_data.values():
+            if group["name"] in self.NO_BREEDING_GROUPS:
+                continue
+            members = [species["name"] for species in group["pokemon_species"]]
+            self.members[group["name"]] = members
+            for species in members:
+                self.groups.setdefault(species, set()).add(group["name"])
+
+        self.no_father = set()
+        for rate in self.NO_FATHER_RATES:
+            if rate in gender_rates:
+                self.no_father.update(
+                    species["name"] for species in gender_rates[rate]["pokemon_list"]
+                )
+
+        self._distances = {}  # move -> {species: breeding steps from a natural learner}
+        self._chains = {}  # (species, move, limit) -> list of chains
+
+    def parents(self, child, move):
+        """Returns the species that can pass `move` directly to `child`."""
+        carriers = self.egg_moves.carriers.get(move, set())
+        sources = self.egg_moves.sources.get(move, set())
+        if child not in carriers:
+            return set()
+
+        parents = set(self.egg_moves.edges.get(move, {}).get(child, ()))
+        for group in self.groups.get(child, ()):
+            for parent in self.members[group]:
+                if (
+                    parent != child
+                    and parent not in self.no_father
+                    and (parent in carriers or parent in sources)
+                ):
+                    parents.add(parent)
+        return parents
+
+    def distances(self, move):
+        """
+        Returns how many breeding steps each species is from knowing `move`.
+
+        Natural learners are 0 steps away. Computed once per move with a
+        multi-source breadth-first search and then reused.
+        """
+        if move in self._distances:
+            return self._distances[move]
+
+        carriers = self.egg_moves.carriers.get(move, set())
+        sources = self.egg_moves.sources.get(move, set())
+        # Invert parents() once so the search can walk from parents to children
+        children = {}
+        for child in carriers:
+            for parent in self.parents(child, move):
+                children.setdefault(parent, []).append(child)
+
+        distance = {species: 0 for species in sources}
+        queue = deque(sources)
+        while queue:
+            parent = queue.popleft()
+            for child in children.get(parent, ()):
+                if child not in distance:
+                    distance[child] = distance[parent] + 1
+                    queue.append(child)
+
+        self._distances[move] = distance
+        return distance
+
+    def chains(self, species, move, limit=30):
+        """
+        Returns up to `limit` breeding chains for `move` onto `species`, shortest first.
+
+        Each chain is a list starting with `species` and ending with a species that
+        learns the move naturally. Chains of the same length are sorted by name.
+        """
+        key = (species, move, limit)
+        if key in self._chains:
+            return self._chains[key]
+
+        distance = self.distances(move)
+        sources = self.egg_moves.sources.get(move, set())
+        found = []
+        if species in distance:
+            # Iterative deepening: the distance table prunes every branch that
+            # can't reach a natural learner within the remaining steps
+            budget = distance[species]
+            longest = max(budget, self.MAX_CHAIN_STEPS)
+            while len(found) < limit and budget <= longest:
+                self._extend([species], budget, move, distance, sources, found, limit)
+                budget += 1
+
+        self._chains[key] = found
+        return found
+
+    def _extend(self, chain, budget, move, distance, sources, found, limit):
+        """Appends the chains that continue `chain` in exactly `budget` more steps."""
+        if len(found) >= limit:
+            return
+        current = chain[-1]
+        if budget == 0:
+            if current in sources and len(chain) > 1:
+                found.append(list(chain))
+            return
+        for parent in sorted(self.parents(current, move)):
+            if parent in chain or distance.get(parent, budget) > budget - 1:
+                continue
+            chain.append(parent)
+            self._extend(chain, budget - 1, move, distance, sources, found, limit)
+            chain.pop()
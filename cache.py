@@ -0,0 +1,127 @@
+import asyncio
+from collections import OrderedDict
+import threading
+import time
+
+
+class RenderCache:
+    """
+    A bounded least-recently-used cache of rendered command replies.
+
+    Keys are (command, normalized argument, data version) tuples, so a data
+    reload naturally stops hitting the entries rendered from the old data and
+    they age out of the cache.
+
+    Parameters:
+    maxsize (int): The number of entries to keep before evicting the least recently used.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        """Returns the cached value for the key and marks it as recently used, or None."""
+        with self._lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entries above maxsize."""
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+class SingleFlight:
+    """
+    Shares one in-flight computation between concurrent callers asking for the same key.
+
+    The first caller starts the work, everyone asking for the same key before
+    it finishes awaits the same result (or exception) instead of repeating it.
+    The work keeps running if a caller is cancelled, so the others still get it.
+    """
+
+    def __init__(self):
+        self.calls = {}  # key -> asyncio.Future of the running computation
+        self.shared = 0
+
+    def __len__(self):
+        return len(self.calls)
+
+    def __contains__(self, key):
+        return key in self.calls
+
+    async def do(self, key, function):
+        """Returns the result of `await function()`, sharing a call already running for the key."""
+        future = self.calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(function())
+            self.calls[key] = future
+            future.add_done_callback(lambda done: self.finish(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    def finish(self, key, future):
+        if self.calls.get(key) is future:
+            del self.calls[key]
+        # Mark the exception as retrieved, in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+
+class RecentReplies:
+    """
+    Remembers the replies sent in each channel for a short time.
+
+    When the same answer is asked for again in the same channel within the
+    window, the bot can point at the earlier message instead of sending the
+    whole reply again.
+
+    Parameters:
+    window (float): How many seconds a reply is remembered.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.entries = OrderedDict()  # (channel id, key) -> (time sent, pages, message)
+
+    def get(self, channel_id, key, pages):
+        """Returns the earlier message with the same pages in the channel, or None."""
+        self.expire()
+        entry = self.entries.get((channel_id, key))
+        if entry is None or entry[1] is not pages:
+            return None
+        return entry[2]
+
+    def put(self, channel_id, key, pages, message):
+        self.entries[(channel_id, key)] = (time.monotonic(), pages, message)
+        self.entries.move_to_end((channel_id, key))
+        self.expire()
+
+    def expire(self):
+        # Entries are kept in the order they were sent, so the expired ones are at the front
+        cutoff = time.monotonic() - self.window
+        while self.entries and next(iter(self.entries.values()))[0] < cutoff:
+            self.entries.popitem(last=False)
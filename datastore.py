@@ -0,0 +1,224 @@
+import json
+import os
+import pickle
+import threading
+import time
+
+from schema import SCHEMAS, validate
+
+# Bump when a loader's output changes shape, so snapshots built by older code are ignored
+SNAPSHOT_FORMAT = 1
+
+
+class Snapshot:
+    """
+    An immutable view of every dataset as it was at one point in time.
+
+    Command handlers keep a reference to the snapshot they started with, so a
+    reload that swaps in a new snapshot never changes data under a running command.
+    """
+
+    def __init__(self, datasets, mtimes, version):
+        self.datasets = datasets
+        self.mtimes = mtimes
+        self.version = version
+        self.derived = {}
+
+    def get(self, name, data_dir="data"):
+        """
+        Returns the parsed contents of data/<name>.json.
+
+        Raises:
+        KeyError: If the dataset file was not present when the data was loaded.
+        """
+        try:
+            return self.datasets[name]
+        except KeyError:
+            raise KeyError(f"Dataset '{name}' is not available in {data_dir}/")
+
+    def derive(self, key, builder):
+        """
+        Returns a structure built from this snapshot's data, building it on first use.
+
+        Derived structures (name indexes, lookup tables) live and die with the
+        snapshot they were built from, so a reload never serves stale ones.
+        """
+        try:
+            return self.derived[key]
+        except KeyError:
+            return self.derived.setdefault(key, builder())
+
+
+class DataStore:
+    """
+    Keeps every dataset from the data folder parsed in memory.
+
+    Each data/*.json file is read and parsed once when the store is created.
+    Command handlers then get the parsed objects from memory, so a lookup costs
+    a dictionary access instead of a full file parse.
+
+    Calling reload() re-parses only the files whose modification time or size
+    changed, validates them and then swaps the new snapshot in with a single
+    assignment.
+
+    Parameters:
+    data_dir (str): The folder containing the data/*.json files.
+    loaders (dict): Optional dataset name mapped to a function that converts the
+        parsed JSON into a more compact or indexed object.
+    skip (iterable): Dataset names that should not be loaded at all.
+    snapshot_path (str): Optional snapshot written by tools/build_snapshot.py to
+        start from. Datasets whose file changed since it was built are parsed
+        from JSON instead.
+    """
+
+    def __init__(self, data_dir="data", loaders=None, skip=(), snapshot_path=None):
+        self.data_dir = data_dir
+        self.loaders = loaders or {}
+        self.skip = set(skip)
+        self._reload_lock = threading.Lock()
+        self.snapshot = Snapshot({}, {}, 0)
+
+        # How the data was loaded at startup, for the boot report
+        started = time.perf_counter()
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot(snapshot_path)
+        self.from_snapshot = sorted(self.snapshot.datasets)
+        self.parsed = self.reload()
+        self.from_snapshot = [name for name in self.from_snapshot if name not in self.parsed]
+        self.load_seconds = time.perf_counter() - started
+
+    @property
+    def version(self):
+        """The version number of the current snapshot, increased on every successful reload."""
+        return self.snapshot.version
+
+    def get(self, name):
+        """Returns the parsed contents of data/<name>.json from the current snapshot."""
+        return self.snapshot.get(name, self.data_dir)
+
+    def scan(self):
+        """
+        Returns the modification time and size of every JSON file in the data folder.
+
+        Returns:
+        dict: Dataset name mapped to a (mtime_ns, size) tuple.
+        """
+        mtimes = {}
+        for entry in os.scandir(self.data_dir):
+            # The dataset name is the file name without its extension (e.g. "pokemon-data")
+            name = entry.name[:-5]
+            if entry.is_file() and entry.name.endswith(".json") and name not in self.skip:
+                stat = entry.stat()
+                mtimes[name] = (stat.st_mtime_ns, stat.st_size)
+        return mtimes
+
+    def changed(self, mtimes=None):
+        """Returns the names of datasets that were added, modified or removed since the last load."""
+        current = self.scan() if mtimes is None else mtimes
+        previous = self.snapshot.mtimes
+        return sorted(
+            name
+            for name in set(current) | set(previous)
+            if current.get(name) != previous.get(name)
+        )
+
+    def parse(self, name):
+        """Parses and validates a single dataset file."""
+        with open(os.path.join(self.data_dir, f"{name}.json"), "r") as file:
+            data = json.load(file)
+
+        # Every dataset is a JSON object keyed by name, id or group
+        if not isinstance(data, dict) or not data:
+            raise ValueError(f"{name}.json must contain a non-empty JSON object")
+
+        # Check the fields the bot reads, so a malformed file is never swapped in
+        if name in SCHEMAS:
+            errors = validate(data, SCHEMAS[name], limit=5)
+            if errors:
+                raise ValueError(f"{name}.json doesn't match its schema: {'; '.join(errors)}")
+
+        if name in self.loaders:
+            return self.loaders[name](data)
+        return data
+
+    def snapshot_header(self):
+        """Returns what a snapshot must have been built with to be usable by this store."""
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "loaders": {
+                name: f"{loader.__module__}.{loader.__qualname__}" for name, loader in self.loaders.items()
+            },
+            "skip": sorted(self.skip),
+        }
+
+    def write_snapshot(self, path):
+        """
+        Writes the current snapshot, with the structures derived from it so far, to a file.
+
+        The file records the modification time and size each dataset had, so
+        load_snapshot() can tell which datasets changed since.
+        """
+        snapshot = self.snapshot
+        with open(path + ".tmp", "wb") as file:
+            pickle.dump(
+                {
+                    **self.snapshot_header(),
+                    "mtimes": snapshot.mtimes,
+                    "datasets": snapshot.datasets,
+                    "derived": snapshot.derived,
+                },
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(path + ".tmp", path)
+
+    def load_snapshot(self, path):
+        """
+        Starts from a snapshot file instead of parsing every JSON file.
+
+        The snapshot is ignored if it was built by a different version of the
+        loaders. Datasets that changed since it was built are then re-parsed by
+        reload() as usual, and its derived structures are only kept if none did.
+        """
+        try:
+            with open(path, "rb") as file:
+                saved = pickle.load(file)
+            if any(saved.get(key) != value for key, value in self.snapshot_header().items()):
+                raise ValueError("it was built by a different version of the bot")
+        except Exception as e:
+            print(f"Error: ignoring data snapshot {path}: {e}")
+            return
+
+        mtimes = saved["mtimes"]
+        self.snapshot = Snapshot(saved["datasets"], mtimes, 0)
+        if not self.changed():
+            self.snapshot.derived.update(saved["derived"])
+
+    def reload(self):
+        """
+        Re-parses the datasets that changed on disk and swaps in a new snapshot.
+
+        This is blocking and is meant to run on a background thread. If any changed
+        file fails to parse or validate, the current snapshot is kept as it is.
+
+        Returns:
+        list: The names of the datasets that were reloaded or removed.
+        """
+        with self._reload_lock:
+            old = self.snapshot
+            mtimes = self.scan()
+            changed = self.changed(mtimes)
+            if not changed:
+                return []
+
+            # Unchanged datasets are shared with the previous snapshot
+            datasets = dict(old.datasets)
+            for name in changed:
+                if name in mtimes:
+                    datasets[name] = self.parse(name)
+                else:
+                    datasets.pop(name, None)
+
+            # Swapping the reference is atomic, in-flight commands keep the old snapshot
+            self.snapshot = Snapshot(datasets, mtimes, old.version + 1)
+            return changed
@@ -0,0 +1,234 @@
+from array import array
+from collections import namedtuple
+from gameclock import next_window, split_condition
+
+
+# A single row of the encounter table, with codes resolved back to strings
+Encounter = namedtuple(
+    "Encounter",
+    [
+        "location", "location_name", "region", "pokemon", "pokemon_id",
+        "type", "rarity", "min_level", "max_level",
+    ],
+)
+
+
+class EncounterTable:
+    """
+    Columnar, indexed storage for the wild encounter data in location-data.json.
+
+    location-rarities.json, location-regions.json and location-types.json hold
+    the same encounter records grouped by a different key. Instead of keeping
+    four copies, every encounter is stored once as a row across a few compact
+    arrays, with repeated strings replaced by small integer codes. Each grouping
+    (location, rarity, region, type and pokemon_id) is an index from a value to
+    the row numbers it contains, so any of them is a dictionary lookup.
+    """
+
+    # Datasets that only regroup location-data.json and don't need to be loaded
+    GROUPED_DATASETS = ("location-rarities", "location-regions", "location-types")
+
+    # Encounter rarities from least to most common. Horde, Lure and Special
+    # encounters aren't ranked.
+    RARITIES = ("Very Rare", "Rare", "Uncommon", "Common", "Very Common")
+
+    def __init__(self):
+        # String tables, the columns below store positions in these lists
+        self.locations = []  # (key, name) e.g. ("KANTO_ROUTE_5", "ROUTE 5")
+        self.conditions = []  # (name without time condition, Condition) per location
+        self.regions = []
+        self.types = []
+        self.rarities = []
+        self.pokemon_names = {}  # pokemon_id -> name
+        self.codes = {"location": {}, "region": {}, "type": {}, "rarity": {}}  # string -> code
+
+        # One array per column, all of the same length
+        self.location_col = array("H")
+        self.region_col = array("B")
+        self.type_col = array("B")
+        self.rarity_col = array("B")
+        self.pokemon_col = array("H")
+        self.min_level_col = array("B")
+        self.max_level_col = array("B")
+
+        # Value -> array of row numbers
+        self.by_location = {}
+        self.by_region = {}
+        self.by_type = {}
+        self.by_rarity = {}
+        self.by_pokemon_id = {}
+        self.pokemon_ids = {}  # lowercase pokemon name -> pokemon_id
+
+    @classmethod
+    def from_json(cls, location_data):
+        """
+        Builds the table from the parsed contents of location-data.json.
+
+        Parameters:
+        location_data (dict): Location key mapped to its name, region and encounters.
+
+        Returns:
+        EncounterTable: The populated table.
+        """
+        table = cls()
+        codes = table.codes
+
+        def code(kind, strings, value):
+            # Give every distinct string a small integer code the first time it's seen
+            if value not in codes[kind]:
+                codes[kind][value] = len(strings)
+                strings.append(value)
+            return codes[kind][value]
+
+        for key, location in location_data.items():
+            location_code = len(table.locations)
+            codes["location"][key] = location_code
+            table.locations.append((key, location["name"]))
+            table.conditions.append(split_condition(location["name"]))
+
+            for encounter in location["encounters"]:
+                row = len(table.pokemon_col)
+                pokemon_id = encounter["pokemon_id"]
+                region = encounter["region_name"]
+
+                table.location_col.append(location_code)
+                table.region_col.append(code("region", table.regions, region))
+                table.type_col.append(code("type", table.types, encounter["type"]))
+                table.rarity_col.append(code("rarity", table.rarities, encounter["rarity"]))
+                table.pokemon_col.append(pokemon_id)
+                table.min_level_col.append(encounter["min_level"])
+                table.max_level_col.append(encounter["max_level"])
+
+                table.pokemon_names[pokemon_id] = encounter["pokemon"]
+                table.pokemon_ids[encounter["pokemon"].lower()] = pokemon_id
+
+                for index, value in (
+                    (table.by_location, key),
+                    (table.by_region, region),
+                    (table.by_type, encounter["type"]),
+                    (table.by_rarity, encounter["rarity"]),
+                    (table.by_pokemon_id, pokemon_id),
+                ):
+                    index.setdefault(value, array("I")).append(row)
+
+        return table
+
+    def __len__(self):
+        return len(self.pokemon_col)
+
+    def row(self, index):
+        """Returns the encounter stored at the given row number."""
+        key, name = self.locations[self.location_col[index]]
+        pokemon_id = self.pokemon_col[index]
+        return Encounter(
+            location=key,
+            location_name=name,
+            region=self.regions[self.region_col[index]],
+            pokemon=self.pokemon_names[pokemon_id],
+            pokemon_id=pokemon_id,
+            type=self.types[self.type_col[index]],
+            rarity=self.rarities[self.rarity_col[index]],
+            min_level=self.min_level_col[index],
+            max_level=self.max_level_col[index],
+        )
+
+    def rows(self, indices):
+        """Returns the encounters for a sequence of row numbers."""
+        return [self.row(index) for index in indices]
+
+    def find(self, pokemon_id=None, location=None, region=None, type=None, rarity=None):
+        """
+        Returns the row numbers matching every given filter, in table order.
+
+        The smallest matching index is scanned and the remaining filters are
+        checked against the coded columns, so no string comparisons are made.
+        """
+        filters = [
+            (index, value, column, codes)
+            for index, value, column, codes in (
+                (self.by_pokemon_id, pokemon_id, self.pokemon_col, None),
+                (self.by_location, location, self.location_col, self.codes["location"]),
+                (self.by_region, region, self.region_col, self.codes["region"]),
+                (self.by_type, type, self.type_col, self.codes["type"]),
+                (self.by_rarity, rarity, self.rarity_col, self.codes["rarity"]),
+            )
+            if value is not None
+        ]
+        if not filters:
+            return range(len(self))
+        if any(value not in index for index, value, _, _ in filters):
+            return []
+
+        filters.sort(key=lambda item: len(item[0][item[1]]))
+        rows = filters[0][0][filters[0][1]]
+        for _, value, column, codes in filters[1:]:
+            wanted = value if codes is None else codes[value]
+            rows = [row for row in rows if column[row] == wanted]
+        return rows
+
+    def available(self, pokemon_id, now, horizon, region=None, min_rarity=None):
+        """
+        Returns the encounters of a Pokémon that are open now or open within `horizon`.
+
+        Rows come from the pokemon_id and region indexes. The time and season
+        condition of each location was parsed when the table was built, and
+        each distinct condition is projected forward once per call.
+
+        Parameters:
+        pokemon_id (int): The Pokémon to look for.
+        now (datetime): The current real time (UTC).
+        horizon (timedelta): How far ahead windows may start.
+        region (str): Optional region name to limit the results to.
+        min_rarity (str): Optional rarity from RARITIES, rarer encounters and
+            unranked ones are left out.
+
+        Returns:
+        list: (row, location name, (start, end)) tuples ordered by when the
+            window starts, with end None for encounters that are always open.
+        """
+        rows = self.find(pokemon_id=pokemon_id, region=region)
+        if min_rarity is not None:
+            ranked = self.RARITIES[self.RARITIES.index(min_rarity):]
+            wanted = {self.codes["rarity"][rarity] for rarity in ranked if rarity in self.codes["rarity"]}
+            rows = [row for row in rows if self.rarity_col[row] in wanted]
+
+        windows = {}  # Condition -> window, shared by the locations with that condition
+        seen = set()
+        results = []
+        for row in rows:
+            name, condition = self.conditions[self.location_col[row]]
+            if condition not in windows:
+                windows[condition] = next_window(condition, now, horizon)
+            if windows[condition] is None:
+                continue
+
+            # location-data.json repeats some encounters, list each one once
+            duplicate = (
+                name, self.region_col[row], self.type_col[row], self.rarity_col[row],
+                self.min_level_col[row], self.max_level_col[row], windows[condition],
+            )
+            if duplicate not in seen:
+                seen.add(duplicate)
+                results.append((row, name, windows[condition]))
+
+        results.sort(key=lambda result: result[2][0])
+        return results
+
+    def for_pokemon(self, name):
+        """Returns every distinct encounter of the Pokémon with the given name, in table order."""
+        pokemon_id = self.pokemon_ids.get(name.lower())
+        if pokemon_id is None:
+            return []
+
+        # location-data.json repeats some encounters, list each one once
+        seen = set()
+        rows = []
+        for row in self.by_pokemon_id[pokemon_id]:
+            duplicate = (
+                self.locations[self.location_col[row]][1], self.region_col[row], self.type_col[row],
+                self.rarity_col[row], self.min_level_col[row], self.max_level_col[row],
+            )
+            if duplicate not in seen:
+                seen.add(duplicate)
+                rows.append(row)
+        return self.rows(rows)
@@ -0,0 +1,259 @@
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+
+# A known Monday at midnight (UTC) when the in-game clock was also at Monday 00:00
+REFERENCE_DATE = datetime(2023, 12, 4)
+
+# 15 seconds of real time = 1 minute of game time, so a game day lasts 6 real hours
+SECONDS_PER_GAME_MINUTE = 15
+GAME_MINUTES_PER_DAY = 24 * 60
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# The season follows the real-world month, cycling every four months
+SEASONS = ("Spring", "Summer", "Autumn", "Winter")
+
+# Day phases as (start, end) in game minutes of the day. Night wraps past midnight.
+PHASES = {
+    "Morning": (4 * 60, 11 * 60),
+    "Day": (11 * 60, 21 * 60),
+    "Night": (21 * 60, 4 * 60),
+}
+
+# Game hours at which the Shoal Cave tide turns. It is low from 3 to 9 and from 15 to 21.
+TIDE_CHANGES = (3, 9, 15, 21)
+
+# Roaming legendaries rotate with the real-world month
+JOHTO_ROAMERS = ["Entei", "Suicune", "Raikou"]
+KANTO_ROAMERS = ["Zapdos", "Moltres", "Articuno"]
+
+# The time and season in location names, e.g. "ROUTE 30 (Day/Morning/SEASON0)"
+CONDITION = re.compile(r"\s*\(([A-Za-z0-9/]+)\)\s*$")
+
+# When an encounter is available: the phases and seasons it needs, None meaning any
+Condition = namedtuple("Condition", ["phases", "seasons"])
+ALWAYS = Condition(None, None)
+
+
+def game_minutes(now):
+    """Returns the number of game minutes passed since REFERENCE_DATE at real time `now`."""
+    return (now - REFERENCE_DATE).total_seconds() / SECONDS_PER_GAME_MINUTE
+
+
+def season(now):
+    """Returns the in-game season at real time `now`."""
+    return SEASONS[(now.month - 1) % 4]
+
+
+def phase(now):
+    """Returns the day phase ("Morning", "Day" or "Night") at real time `now`."""
+    minute = game_minutes(now) % GAME_MINUTES_PER_DAY
+    for name, (start, end) in PHASES.items():
+        if start <= minute < end or (end < start and (minute >= start or minute < end)):
+            return name
+
+
+def tide(now):
+    """Returns the Shoal Cave tide ("Low" or "High") at real time `now`."""
+    game_hour = int(game_minutes(now) // 60) % 24
+    return "Low" if 3 <= game_hour < 9 or 15 <= game_hour < 21 else "High"
+
+
+def roamers(now):
+    """Returns the (Johto, Kanto) roaming legendaries at real time `now`."""
+    return JOHTO_ROAMERS[(now.month - 1) % 3], KANTO_ROAMERS[(now.month - 1) % 3]
+
+
+def next_game_hour(now, hours):
+    """
+    Returns the real time at which the game clock next reaches one of `hours` o'clock.
+
+    A boundary less than a real second away counts as already passed, so
+    calling this again with the returned time gives the following one.
+    """
+    seconds_per_day = GAME_MINUTES_PER_DAY * SECONDS_PER_GAME_MINUTE
+    into_day = (now - REFERENCE_DATE).total_seconds() % seconds_per_day
+    waits = []
+    for hour in hours:
+        wait = (hour * 60 * SECONDS_PER_GAME_MINUTE - into_day) % seconds_per_day
+        waits.append(wait if wait >= 1 else wait + seconds_per_day)
+    return now + timedelta(seconds=min(waits))
+
+
+def split_condition(location_name):
+    """
+    Separates the time condition from a location name.
+
+    Returns:
+    tuple: The name without the condition, and its Condition (ALWAYS if it has none).
+    """
+    match = CONDITION.search(location_name)
+    if not match:
+        return location_name, ALWAYS
+
+    phases, seasons = set(), set()
+    for part in match.group(1).split("/"):
+        if part.title() in PHASES:
+            phases.add(part.title())
+        elif part.upper().startswith("SEASON") and part[6:].isdigit():
+            seasons.add(SEASONS[int(part[6:]) % 4])
+        else:
+            # Not a time condition, e.g. "(B1F)", so keep it in the name
+            return location_name, ALWAYS
+
+    condition = Condition(
+        frozenset(phases) if phases and len(phases) < len(PHASES) else None,
+        frozenset(seasons) if seasons and len(seasons) < len(SEASONS) else None,
+    )
+    return location_name[: match.start()], condition
+
+
+def arcs(phases):
+    """
+    Merges a set of phases into arcs of the game day.
+
+    Returns:
+    list: (start, length) pairs in game minutes, e.g. Night and Morning become
+        one arc from 21:00 lasting 14 hours.
+    """
+    merged = []
+    for start, end in sorted(PHASES[name] for name in phases):
+        length = (end - start) % GAME_MINUTES_PER_DAY
+        # Join arcs where one ends exactly where the next starts
+        if merged and sum(merged[-1]) % GAME_MINUTES_PER_DAY == start:
+            merged[-1] = (merged[-1][0], merged[-1][1] + length)
+        else:
+            merged.append((start, length))
+
+    # The last arc may run into the first one past midnight
+    if len(merged) > 1 and sum(merged[-1]) % GAME_MINUTES_PER_DAY == merged[0][0]:
+        merged[0] = (merged[-1][0], merged[-1][1] + merged[0][1])
+        merged.pop()
+    return merged
+
+
+def next_phase_window(phases, start):
+    """
+    Returns when the game clock is next within `phases`, from real time `start`.
+
+    The position in the game day is computed once and the distance to each arc
+    follows from it, so no stepping through time is needed.
+
+    Returns:
+    tuple: The (start, end) real datetimes of the window.
+    """
+    minute = game_minutes(start) % GAME_MINUTES_PER_DAY
+    best = None
+    for arc_start, length in arcs(phases):
+        offset = (minute - arc_start) % GAME_MINUTES_PER_DAY
+        if offset < length:
+            # Inside the arc already, it ends after the rest of its length
+            window = (0, length - offset)
+        else:
+            wait = GAME_MINUTES_PER_DAY - offset
+            window = (wait, wait + length)
+        if best is None or window[0] < best[0]:
+            best = window
+
+    return tuple(start + timedelta(seconds=minutes * SECONDS_PER_GAME_MINUTE) for minutes in best)
+
+
+def month_start(now, months=0):
+    """Returns midnight on the first day of the month `months` after the month of `now`."""
+    month = now.month - 1 + months
+    return datetime(now.year + month // 12, month % 12 + 1, 1)
+
+
+def next_window(condition, now, horizon=timedelta(0)):
+    """
+    Returns the first time window in which an encounter condition holds.
+
+    Season spans are whole real months, found by jumping month to month, and
+    day phases come from next_phase_window() within each span.
+
+    Parameters:
+    condition (Condition): The phases and seasons the encounter needs.
+    now (datetime): The current real time (UTC).
+    horizon (timedelta): Only windows starting within this long from now count.
+
+    Returns:
+    tuple: The (start, end) real datetimes of the window, with end None if the
+        condition always holds, or None if no window starts within the horizon.
+    """
+    if condition.phases is None and condition.seasons is None:
+        return now, None
+
+    for months in range(len(SEASONS) + 1):
+        span_start = max(now, month_start(now, months))
+        span_end = month_start(now, months + 1)
+        if span_start > now + horizon:
+            return None
+        if condition.seasons is not None and season(span_start) not in condition.seasons:
+            continue
+        if condition.phases is None:
+            # The window runs on through the following months while their seasons are allowed too
+            following = months + 1
+            while season(month_start(now, following)) in condition.seasons:
+                following += 1
+            return span_start, month_start(now, following)
+
+        start, end = next_phase_window(condition.phases, span_start)
+        if start < span_end:
+            if start > now + horizon:
+                return None
+            # The window only ends at the month boundary if the next month's season rules it out
+            if condition.seasons is not None and season(span_end) not in condition.seasons:
+                end = min(end, span_end)
+            return start, end
+    return None
+
+
+def get_pokemmo_day_and_time(now=None):
+    """
+    Returns the current in-game day and time for PokeMMO based on the real-world time.
+
+    Real-world to game time conversion in PokeMMO:
+    - 15 seconds of real time = 1 minute of game time
+    - 6 hours of real time = 24 hours of game time
+
+    Additionally, it includes the current in-game season, shoal cave tide based on the month and time,
+    and roaming legendaries in Johto and Kanto.
+
+    Parameters:
+    now (datetime): The real-world time (UTC) to use instead of the current time.
+
+    Returns:
+    str: Current in-game day and time, season, shoal cave tide, and roaming legendaries in PokeMMO.
+    """
+    # Get the current real-world time (UTC)
+    now = now or datetime.utcnow()
+
+    # Convert real-world time since the reference date to game time minutes
+    game_time_minutes = game_minutes(now)
+
+    # Calculate the in-game hour, minute, and day
+    game_hour = int(game_time_minutes // 60) % 24
+    game_minute = int(game_time_minutes % 60)
+    game_days_passed = int(game_time_minutes // GAME_MINUTES_PER_DAY)
+
+    # Map the weekday number to a day name
+    in_game_day_name = DAYS_OF_WEEK[game_days_passed % 7]
+
+    # Determine the current season based on the real-world month
+    current_season = season(now)
+
+    # Determine the shoal cave tide based on the in-game time
+    shoal_cave_tide = tide(now)
+
+    # Determine the roaming legendaries for Johto and Kanto
+    johto_legendary, kanto_legendary = roamers(now)
+
+    return (
+        f"Day: {in_game_day_name}, Time: {game_hour:02d}:{game_minute:02d}\n"
+        f"Season: {current_season}\n"
+        f"Shoal Cave Tide: {shoal_cave_tide}\n"
+        f"Johto Roamer: {johto_legendary}\n"
+        f"Kanto Roamer: {kanto_legendary}"
+    )
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Histogram bucket upper bounds in seconds, from 0.1 ms to 10 s
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def escape(value):
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def peak_memory_mb():
+    """Returns the peak resident memory of this process in MB, or None where it can't be measured."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Histogram:
+    """Counts observations into fixed buckets, the way Prometheus histograms do."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Returns the upper bound of the bucket holding the q-th quantile (an estimate)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class Metrics:
+    """
+    Thread-safe counters and histograms with Prometheus text exposition.
+
+    Every metric is identified by a name and a set of labels, e.g.
+    metrics.inc("commands_total", command="pokemon", status="ok").
+
+    Parameters:
+    prefix (str): Prepended to every metric name in the exposition.
+    """
+
+    def __init__(self, prefix="pokemmo_bot_"):
+        self.prefix = prefix
+        self.descriptions = {}  # name -> (type, help text)
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self._lock = threading.Lock()
+
+    def describe(self, name, kind, help_text):
+        """Registers the type ("counter" or "histogram") and help text of a metric."""
+        self.descriptions[name] = (kind, help_text)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observes how long the body of the with-block takes, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter(self, name, **labels):
+        """Returns the value of a counter, or the sum over all labels if none are given."""
+        with self._lock:
+            if labels:
+                return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+            return sum(value for (key, _), value in self.counters.items() if key == name)
+
+    def histogram(self, name, **labels):
+        """Returns the histogram for a name and labels, or None if nothing was observed."""
+        return self.histograms.get((name, tuple(sorted(labels.items()))))
+
+    def label_values(self, name, label):
+        """Returns the sorted values a label has taken for a metric."""
+        with self._lock:
+            keys = list(self.counters) + list(self.histograms)
+        return sorted({dict(labels)[label] for key, labels in keys if key == name and label in dict(labels)})
+
+    def render(self):
+        """
+        Returns every metric in the Prometheus text exposition format.
+
+        Returns:
+        str: The exposition, ready to serve from /metrics.
+        """
+        def format_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, list(histogram.counts), histogram.sum, histogram.count, histogram.buckets)
+                for key, histogram in self.histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def header(name):
+            if name not in described and name in self.descriptions:
+                kind, help_text = self.descriptions[name]
+                lines.append(f"# HELP {self.prefix}{name} {help_text}")
+                lines.append(f"# TYPE {self.prefix}{name} {kind}")
+                described.add(name)
+
+        for (name, labels), value in counters:
+            header(name)
+            lines.append(f"{self.prefix}{name}{format_labels(labels)} {value}")
+
+        for (name, labels), counts, total, count, buckets in histograms:
+            header(name)
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.prefix}{name}_bucket{format_labels(labels, [('le', bound)])} {cumulative}"
+                )
+            lines.append(f"{self.prefix}{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{self.prefix}{name}_count{format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+class RateLimitLogHandler(logging.Handler):
+    """
+    Counts Discord rate limits from discord.py's HTTP log messages.
+
+    discord.py (2.3) handles rate limits itself and only reports them in the
+    "discord.http" log. Every 429 response is logged once as "We are being
+    rate limited", and a global one is followed straight away by "Global rate
+    limit has been hit", so a 429 is only counted as a route 429 once the next
+    unrelated message shows it wasn't global. Waiting on a used up bucket
+    before sending is only logged at DEBUG.
+
+    Use install() to attach it: discord.http then has to log at DEBUG, and
+    the handler passes on to the usual handlers only what they would have
+    seen before.
+    """
+
+    # discord/http.py's format strings
+    RATE_LIMITED = "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds."
+    RATE_LIMITED_TOO_LONG = (
+        "We are being rate limited. %s %s responded with 429. Timeout of %.2f was too long, erroring instead."
+    )
+    HANDLED_BY_BUCKET = "Rate limit is being handled by bucket hash %s with %r major parameters"
+    GLOBAL = "Global rate limit has been hit. Retrying in %.2f seconds."
+    EXHAUSTED = "A rate limit bucket (%s) has been exhausted. Pre-emptively rate limiting..."
+
+    def __init__(self, metrics, forward_to=None):
+        super().__init__(logging.DEBUG)
+        self.metrics = metrics
+        self.forward_to = forward_to
+        self.pending = None  # the wait of a 429 not yet known to be route or global
+
+    @classmethod
+    def install(cls, metrics, name="discord.http"):
+        logger = logging.getLogger(name)
+        handler = cls(metrics, forward_to=logger.parent)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.addHandler(handler)
+        return handler
+
+    def count(self, scope, retry_after):
+        self.metrics.inc("rate_limits_total", scope=scope)
+        self.metrics.inc("rate_limit_wait_seconds_total", retry_after, scope=scope)
+
+    def flush(self):
+        if self.pending is not None:
+            self.count("route", self.pending)
+            self.pending = None
+
+    def emit(self, record):
+        if record.msg == self.GLOBAL and self.pending is not None:
+            self.count("global", self.pending)
+            self.pending = None
+        elif record.msg != self.HANDLED_BY_BUCKET:
+            self.flush()
+            if record.msg == self.RATE_LIMITED:
+                self.pending = float(record.args[-1])
+            elif record.msg == self.RATE_LIMITED_TOO_LONG:
+                # discord.py raises RateLimited instead of waiting
+                self.count("route", 0.0)
+            elif record.msg == self.EXHAUSTED:
+                self.metrics.inc("rate_limit_preemptive_total")
+
+        # Only what the parent loggers would have let through before discord.http logged at DEBUG
+        if self.forward_to is not None and record.levelno >= self.forward_to.getEffectiveLevel():
+            self.forward_to.handle(record)
+
+
+async def serve_metrics(metrics, host="127.0.0.1", port=9100):
+    """
+    Serves metrics.render() over HTTP at /metrics for Prometheus to scrape.
+
+    Returns:
+    asyncio.AbstractServer: The running server.
+    """
+    async def handle(reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Read and ignore the request headers
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", metrics.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,151 @@
+import re
+from bisect import bisect_left
+
+
+def normalize(name):
+    """
+    Normalizes a user-typed or dataset name so that equivalent spellings match.
+
+    Case is ignored, apostrophes and periods are dropped and runs of spaces,
+    underscores and hyphens become a single hyphen, so "Mr. Mime", "mr mime"
+    and "MR_MIME" all normalize to "mr-mime".
+    """
+    name = re.sub(r"['’.]", "", name.strip().lower())
+    return re.sub(r"[\s_-]+", "-", name).strip("-")
+
+
+def trigrams(name):
+    """Returns the set of three-character substrings of a padded, normalized name."""
+    padded = f"  {name} "
+    return {padded[i: i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    A precomputed index for resolving names typed by users to dataset keys.
+
+    Exact lookups go through a dictionary of normalized names, prefix lookups
+    bisect a sorted list of normalized names and "did you mean" suggestions
+    come from a trigram index, so none of them scan the dataset.
+
+    Parameters:
+    names (dict): Name as it appears in the data mapped to the dataset key it
+        refers to. The key itself is used when a plain iterable is given.
+    """
+
+    def __init__(self, names):
+        if not isinstance(names, dict):
+            names = {name: name for name in names}
+
+        self.keys = {}  # normalized name -> dataset key
+        for name, key in names.items():
+            self.keys.setdefault(normalize(name), key)
+
+        # Names written without separators, so "mrmime" still finds "mr-mime"
+        self.compact = {}
+        for normalized, key in self.keys.items():
+            self.compact.setdefault(normalized.replace("-", ""), key)
+
+        self.sorted_names = sorted(self.keys)
+
+        self.postings = {}  # trigram -> positions in sorted_names
+        self.sizes = []  # number of trigrams of each name in sorted_names
+        for position, normalized in enumerate(self.sorted_names):
+            grams = trigrams(normalized)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, query):
+        return self.resolve(query) is not None
+
+    def resolve(self, query):
+        """
+        Returns the dataset key for a name, ignoring case, spacing and punctuation.
+
+        Returns:
+        The matching dataset key, or None if the name isn't known.
+        """
+        normalized = normalize(query)
+        key = self.keys.get(normalized)
+        if key is None:
+            key = self.compact.get(normalized.replace("-", ""))
+        return key
+
+    def prefix(self, query, limit=25):
+        """Returns up to `limit` normalized names starting with the query, in sorted order."""
+        normalized = normalize(query)
+        start = bisect_left(self.sorted_names, normalized)
+        matches = []
+        for name in self.sorted_names[start: start + limit]:
+            if not name.startswith(normalized):
+                break
+            matches.append(name)
+        return matches
+
+    def complete(self, query, limit=25, popularity=None, candidates=200):
+        """
+        Returns up to `limit` normalized names to offer while the query is being typed.
+
+        Names starting with the query come first, the most popular of them
+        ahead of the rest, followed by suggest() matches for misspellings.
+        Everything is served from the sorted names and trigram postings, so
+        this stays well within the autocomplete deadline.
+
+        Parameters:
+        query (str): What has been typed so far.
+        limit (int): The most names to return (Discord allows 25).
+        popularity (dict): Optional normalized name mapped to how often it was looked up.
+        candidates (int): How many prefix matches to rank by popularity.
+        """
+        normalized = normalize(query)
+        if popularity and not normalized:
+            # Nothing typed yet, offer the most popular names
+            popular = [name for name in popularity if name in self.keys]
+            matches = sorted(popular, key=lambda name: -popularity[name])[:limit]
+        else:
+            matches = self.prefix(query, candidates)
+            if popularity:
+                # A stable sort, so equally popular names stay in alphabetical order
+                matches.sort(key=lambda name: -popularity.get(name, 0))
+            matches = matches[:limit]
+
+        if len(matches) < limit:
+            # Fill up with close spellings, or with the first names when nothing is typed
+            seen = set(matches)
+            extra = self.suggest(query, limit) if normalized else self.prefix("", limit)
+            matches.extend(name for name in extra if name not in seen)
+        return matches[:limit]
+
+    def suggest(self, query, limit=3, threshold=0.3):
+        """
+        Returns up to `limit` normalized names that look like the query.
+
+        Names are ranked by the Dice coefficient of their trigram sets, only
+        counting names that share at least one trigram with the query.
+        """
+        grams = trigrams(normalize(query))
+        shared = {}
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + self.sizes[position])
+            if score >= threshold:
+                scored.append((-score, self.sorted_names[position]))
+
+        scored.sort()
+        return [name for _, name in scored[:limit]]
+
+
+def did_you_mean(index, query):
+    """Returns a " Did you mean: ...?" sentence for a failed lookup, or an empty string."""
+    suggestions = index.suggest(query)
+    if not suggestions:
+        return ""
+    return f" Did you mean: {', '.join(suggestions)}?"
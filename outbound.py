@@ -0,0 +1,213 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+
+# Discord's limits for a single message
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+MAX_EMBED_LENGTH = 6000
+
+
+class TokenBucket:
+    """
+    Paces calls to at most `rate` per `per` seconds, allowing bursts of `capacity`.
+
+    acquire() reserves its token before sleeping, so callers sharing a bucket
+    are spaced out correctly without a lock.
+
+    Parameters:
+    rate (float): Tokens added every `per` seconds.
+    per (float): The period of the rate, in seconds.
+    capacity (float): Optional, the most tokens the bucket holds, i.e. the
+        largest burst. Defaults to `rate`.
+    """
+
+    def __init__(self, rate, per=1.0, capacity=None):
+        self.capacity = rate if capacity is None else capacity
+        self.fill_rate = rate / per
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now=None):
+        """Adds the tokens earned since the last update, up to the capacity."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    async def acquire(self):
+        self.refill()
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.fill_rate)
+
+
+class Outgoing:
+    """A message waiting to be sent, and the future its sender awaits."""
+
+    def __init__(self, target, send, kwargs):
+        self.target = target
+        self.send = send
+        self.kwargs = kwargs
+        self.future = asyncio.get_running_loop().create_future()
+
+
+def merge(first, second):
+    """
+    Returns the keyword arguments of one message carrying both, or None if they can't be combined.
+
+    Plain text messages are joined up to 2000 characters and embed-only
+    messages are sent together, up to 10 embeds and 6000 characters. Messages
+    with buttons or anything else are always sent on their own.
+    """
+    if set(first) == set(second) == {"content"}:
+        content = f"{first['content']}\n{second['content']}"
+        return {"content": content} if len(content) <= MAX_CONTENT_LENGTH else None
+
+    embeds = []
+    for kwargs in (first, second):
+        if set(kwargs) == {"embed"}:
+            embeds.append(kwargs["embed"])
+        elif set(kwargs) == {"embeds"}:
+            embeds.extend(kwargs["embeds"])
+        else:
+            return None
+    if len(embeds) > MAX_EMBEDS or sum(len(embed) for embed in embeds) > MAX_EMBED_LENGTH:
+        return None
+    return {"embeds": embeds}
+
+
+class ChannelQueue:
+    """
+    The messages waiting to be sent to one channel, queued per user.
+
+    Users take turns, so one user's burst of commands doesn't hold up
+    everyone else's replies in the channel.
+    """
+
+    def __init__(self):
+        self.users = OrderedDict()  # user id -> deque of Outgoing
+
+    def __bool__(self):
+        return bool(self.users)
+
+    def put(self, user_id, outgoing):
+        self.users.setdefault(user_id, deque()).append(outgoing)
+
+    def take(self):
+        """
+        Removes the next user's next message, together with any of their queued
+        messages to the same target that can be merged into it.
+
+        Returns:
+        tuple: The keyword arguments to send and the Outgoing messages they carry.
+        """
+        user_id, queue = next(iter(self.users.items()))
+        batch = [queue.popleft()]
+        kwargs = batch[0].kwargs
+        while queue and queue[0].target == batch[0].target:
+            merged = merge(kwargs, queue[0].kwargs)
+            if merged is None:
+                break
+            kwargs = merged
+            batch.append(queue.popleft())
+
+        # Move the user to the back of the rotation, or drop them once they're done
+        del self.users[user_id]
+        if queue:
+            self.users[user_id] = queue
+        return kwargs, batch
+
+
+class Outbox:
+    """
+    Sends messages through per-channel queues, paced to stay within Discord's rate limits.
+
+    Each channel has its own token bucket (Discord allows about 5 messages per
+    5 seconds in a channel) and every channel shares a global one, so bursts
+    are smoothed out before they reach Discord instead of running into 429
+    responses that stall all of the bot's traffic. A channel's queue is drained
+    by one task, which only runs while the queue has messages.
+
+    Only queued messages for the same user and target are merged: several
+    messages replying to one command, or the announcements waiting for a
+    channel (sent with no user or target). Replies to different commands
+    stay separate messages, since each one replies to its own command.
+
+    Parameters:
+    channel_rate (int): Messages per 5 seconds allowed in one channel.
+    global_rate (int): Messages per second allowed across all channels.
+    global_burst (int): Messages sent at once across all channels before
+        the global rate applies. Kept small, so a burst after a quiet spell
+        doesn't take up most of a second's allowance at once.
+    max_buckets (int): Channel buckets to keep, least recently used first
+        out. A dropped bucket had long refilled anyway.
+    """
+
+    def __init__(self, channel_rate=5, global_rate=45, global_burst=5, max_buckets=10000):
+        self.channel_rate = channel_rate
+        self.global_bucket = TokenBucket(global_rate, capacity=global_burst)
+        self.max_buckets = max_buckets
+        self.queues = {}  # channel id -> ChannelQueue
+        self.buckets = OrderedDict()  # channel id -> TokenBucket
+        self.tasks = {}  # channel id -> the task draining its queue
+        self.merged = 0
+
+    def __len__(self):
+        return sum(len(queue) for channel in self.queues.values() for queue in channel.users.values())
+
+    async def send(self, channel_id, user_id, target, send, **kwargs):
+        """
+        Queues a message and waits until it has been sent.
+
+        Parameters:
+        channel_id (int): The channel the message goes to.
+        user_id (int): Who the message is for, to take turns between users.
+        target: What the message replies to. Only queued messages with the
+            same target are merged.
+        send (coroutine function): Sends the message, e.g. ctx.reply or channel.send.
+        kwargs: The message, as keyword arguments for `send`.
+
+        Returns:
+        discord.Message: The message that was sent. Merged messages all return
+            the one message that carried them.
+        """
+        outgoing = Outgoing(target, send, kwargs)
+        self.queues.setdefault(channel_id, ChannelQueue()).put(user_id, outgoing)
+        if channel_id not in self.tasks:
+            self.tasks[channel_id] = asyncio.create_task(self.drain(channel_id))
+        return await outgoing.future
+
+    async def drain(self, channel_id):
+        queue = self.queues[channel_id]
+        bucket = self.buckets.get(channel_id)
+        if bucket is None:
+            bucket = self.buckets[channel_id] = TokenBucket(self.channel_rate, 5.0)
+            if len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(channel_id)
+        try:
+            while queue:
+                # Wait for the buckets first, so messages queued meanwhile can be merged
+                await bucket.acquire()
+                await self.global_bucket.acquire()
+                kwargs, batch = queue.take()
+                self.merged += len(batch) - 1
+                try:
+                    message = await batch[0].send(**kwargs)
+                except Exception as e:
+                    for outgoing in batch:
+                        if not outgoing.future.done():
+                            outgoing.future.set_exception(e)
+                else:
+                    for outgoing in batch:
+                        if not outgoing.future.done():
+                            outgoing.future.set_result(message)
+        finally:
+            # Only reached with messages left if the task was cancelled, e.g. on shutdown
+            for user_queue in queue.users.values():
+                for outgoing in user_queue:
+                    outgoing.future.cancel()
+            del self.tasks[channel_id]
+            del self.queues[channel_id]
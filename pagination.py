@@ -0,0 +1,202 @@
+import asyncio
+import time
+import discord
+
+
+def fit(items, limit, separator="\n"):
+    """
+    Splits strings into consecutive chunks that each fit in `limit` characters when joined.
+
+    Parameters:
+    items (list): The strings to split, each at most `limit` characters.
+    limit (int): The most characters a chunk may take, joined with `separator`.
+    separator (str): What the chunk's strings will be joined with.
+
+    Returns:
+    list: The chunks, each a list of strings.
+    """
+    chunks, chunk, length = [], [], 0
+    for item in items:
+        # Every item after the first in a chunk also takes a separator
+        added = len(item) + (len(separator) if chunk else 0)
+        if chunk and length + added > limit:
+            chunks.append(chunk)
+            chunk, length, added = [], 0, len(item)
+        chunk.append(item)
+        length += added
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class Pages:
+    """
+    A sequence of reply pages that are rendered on first access.
+
+    Each page is a dict of keyword arguments for ctx.reply() (content and/or
+    embed). Only the pages someone actually flips to are ever rendered, and a
+    rendered page is kept so it isn't formatted twice.
+
+    Parameters:
+    count (int): The number of pages.
+    render_page (callable): Takes a page index and returns that page's reply dict.
+    """
+
+    def __init__(self, count, render_page):
+        self.count = count
+        self._render_page = render_page
+        self._pages = {}
+
+    @classmethod
+    def of(cls, *replies):
+        """Returns Pages for replies that are already rendered."""
+        return cls(len(replies), replies.__getitem__)
+
+    @classmethod
+    def chunked(cls, items, size, render_chunk):
+        """
+        Returns Pages showing `size` items per page.
+
+        Parameters:
+        items (list): The items to split across pages.
+        size (int): The number of items per page.
+        render_chunk (callable): Takes a chunk of items and its page index and returns the page.
+        """
+        count = (len(items) + size - 1) // size
+        return cls(count, lambda index: render_chunk(items[index * size: (index + 1) * size], index))
+
+    @classmethod
+    def fitted(cls, lines, limit, render_chunk, separator="\n"):
+        """
+        Returns Pages showing as many lines per page as fit in `limit` characters.
+
+        Parameters:
+        lines (list): The lines of text to split across pages, each at most `limit` characters.
+        limit (int): The most characters a page's lines may take, joined with `separator`.
+        render_chunk (callable): Takes a chunk of lines and its page index and returns the page.
+        separator (str): What the page's lines will be joined with, newlines by default.
+        """
+        chunks = fit(lines, limit, separator)
+        return cls(len(chunks), lambda index: render_chunk(chunks[index], index))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        page = self._pages.get(index)
+        if page is None:
+            page = self._pages.setdefault(index, self._render_page(index))
+        return page
+
+
+class Paginator(discord.ui.View):
+    """
+    Previous/next buttons that flip a single message through its pages.
+
+    The view stops listening after `timeout` seconds without a button press,
+    and only the user who ran the command can flip the pages. Pages that
+    haven't been rendered yet are rendered on `executor`, off the event loop.
+    """
+
+    def __init__(self, pages, author_id, timeout, executor=None):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.author_id = author_id
+        self.executor = executor
+        self.index = 0
+        self.message = None
+        self.last_used = time.monotonic()
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+        self.page_number.label = f"{self.index + 1}/{len(self.pages)}"
+
+    async def interaction_check(self, interaction):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Only the person who ran the command can change pages.", ephemeral=True
+            )
+            return False
+        return True
+
+    async def show(self, interaction, index):
+        self.last_used = time.monotonic()
+        self.index = index
+        self.update_buttons()
+        loop = asyncio.get_running_loop()
+        page = await loop.run_in_executor(self.executor, self.pages.__getitem__, index)
+        await interaction.response.edit_message(
+            content=page.get("content"), embed=page.get("embed"), view=self
+        )
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction, button):
+        await self.show(interaction, self.index - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_number(self, interaction, button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction, button):
+        await self.show(interaction, self.index + 1)
+
+    async def on_timeout(self):
+        await self.close()
+
+    async def close(self):
+        """Stops the view and removes its buttons from the message."""
+        self.stop()
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+
+class PaginatorRegistry:
+    """
+    Keeps track of the paginated messages that still have live buttons.
+
+    Views expire after `timeout` idle seconds. When more than `max_views` are
+    live at once, the least recently used one is closed early so idle views
+    can't pile up in memory.
+    """
+
+    def __init__(self, max_views=100, timeout=300, executor=None):
+        self.max_views = max_views
+        self.timeout = timeout
+        self.executor = executor
+        self.views = {}  # message id -> Paginator
+
+    async def send(self, ctx, pages, reply=None):
+        """
+        Replies with the first page, adding page buttons when there is more than one.
+
+        Parameters:
+        ctx (commands.Context): The invocation context.
+        pages (Pages): The reply pages.
+        reply (coroutine function): Sends the reply, ctx.reply by default.
+
+        Returns:
+        discord.Message: The message that was sent.
+        """
+        reply = reply or ctx.reply
+        if len(pages) <= 1:
+            return await reply(**pages[0])
+
+        view = Paginator(pages, ctx.author.id, self.timeout, self.executor)
+        view.message = await reply(**pages[0], view=view)
+        self.views[view.message.id] = view
+
+        # Forget views that already timed out, then evict the least recently used ones
+        for message_id in [key for key, live in self.views.items() if live.is_finished()]:
+            del self.views[message_id]
+        while len(self.views) > self.max_views:
+            message_id = min(self.views, key=lambda key: self.views[key].last_used)
+            await self.views.pop(message_id).close()
+        return view.message
@@ -0,0 +1,100 @@
+import heapq
+import json
+import os
+from operator import itemgetter
+
+
+class TopK:
+    """
+    Approximate counts of the most frequent keys, in a fixed amount of memory.
+
+    This is the Space-Saving algorithm: at most `capacity` keys are counted,
+    and a new key replaces the least counted one, taking over its count. Keys
+    asked for often enough always stay in, with counts that are at most the
+    evicted count too high, while one-off typos keep replacing each other at
+    the bottom.
+
+    Parameters:
+    capacity (int): The number of keys to count.
+    """
+
+    def __init__(self, capacity=500, counts=None):
+        self.capacity = capacity
+        self.counts = dict(counts or {})  # key -> count
+
+    def add(self, key, count=1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.capacity:
+            counts[key] = count
+        else:
+            evicted = min(counts, key=counts.get)
+            counts[key] = counts.pop(evicted) + count
+
+    def most_common(self, n):
+        """Returns the n most counted (key, count) pairs, most counted first."""
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+
+class Popularity:
+    """
+    How often each command was asked for each argument, kept across restarts.
+
+    Successful lookups are counted per command in a TopK. The counts rank
+    autocomplete suggestions and pick the replies to render into the cache
+    at startup, and save() writes them to a JSON file for the next start.
+
+    Parameters:
+    path (str): The file the counts are saved to, or None to not save them.
+    capacity (int): How many arguments to count per command.
+    """
+
+    def __init__(self, path=None, capacity=500):
+        self.path = path
+        self.capacity = capacity
+        self.commands = {}  # command -> TopK of normalized arguments
+        self.changed = False
+
+    def record(self, command, argument):
+        if command not in self.commands:
+            self.commands[command] = TopK(self.capacity)
+        self.commands[command].add(argument)
+        self.changed = True
+
+    def counts(self, command):
+        """Returns the normalized arguments of a command mapped to their counts."""
+        topk = self.commands.get(command)
+        return topk.counts if topk is not None else {}
+
+    def top(self, n):
+        """Returns the n most asked for (command, argument) pairs across all commands, most asked first."""
+        pairs = (
+            (count, command, argument)
+            for command, topk in self.commands.items()
+            for argument, count in topk.counts.items()
+        )
+        return [(command, argument) for _, command, argument in heapq.nlargest(n, pairs, key=itemgetter(0))]
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as file:
+                saved = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Error: ignoring popularity file {self.path}: {e}")
+            return
+        for command, counts in saved.items():
+            topk = self.commands.setdefault(command, TopK(self.capacity))
+            for argument, count in TopK(self.capacity, counts).most_common(self.capacity):
+                topk.add(argument, count)
+
+    def save(self):
+        """Writes the counts to the file, if anything was counted since the last save."""
+        if not self.path or not self.changed:
+            return
+        with open(self.path + ".tmp", "w") as file:
+            json.dump({command: topk.counts for command, topk in self.commands.items()}, file)
+        os.replace(self.path + ".tmp", self.path)
+        self.changed = False
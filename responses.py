@@ -0,0 +1,927 @@
+from datetime import datetime, timedelta
+from discord import Embed
+import numpy as np
+from breeding import BreedingGraph
+from encounters import EncounterTable
+from gameclock import phase, season
+from names import NameIndex, did_you_mean, normalize
+from pagination import Pages, fit
+from search import SearchIndex
+import statcalc
+from statcalc import BaseStats, Natures
+import typechart
+from typechart import TypeTable
+
+
+# The most characters Discord accepts in an embed field's value
+FIELD_LIMIT = 1024
+
+
+class NotFound(Exception):
+    """Raised by a renderer when the requested name doesn't exist. The message is sent to the user."""
+
+
+# How to get the user-facing names of datasets that aren't simply keyed by name
+NAME_SOURCES = {
+    "egg-groups-data": lambda data: {group["name"]: key for key, group in data.items()},
+    "item-data": lambda data: {
+        **{key: key for key in data},
+        **{item["name"]: key for key, item in data.items()},
+    },
+    "location-data": lambda table: {name: name for name in table.pokemon_ids},
+}
+
+
+def name_index(snapshot, dataset):
+    """
+    Returns the shared name index for a dataset, built once per data snapshot.
+
+    Parameters:
+    snapshot (Snapshot): The data snapshot the command is working with.
+    dataset (str): The dataset name, e.g. "pokemon-data".
+
+    Returns:
+    NameIndex: Resolves normalized, prefix and misspelled names to dataset keys.
+    """
+    data = snapshot.get(dataset)
+    source = NAME_SOURCES.get(dataset, lambda data: {key: key for key in data})
+    return snapshot.derive(("names", dataset), lambda: NameIndex(source(data)))
+
+
+def breeding_graph(snapshot):
+    """Returns the breeding graph for a data snapshot, built on first use."""
+    return snapshot.derive(
+        "breeding",
+        lambda: BreedingGraph(
+            snapshot.get("egg-moves-data"),
+            snapshot.get("egg-groups-data"),
+            snapshot.get("gender-rates"),
+        ),
+    )
+
+
+def search_index(snapshot):
+    """Returns the attribute bitsets used by !find for a data snapshot, built on first use."""
+    return snapshot.derive(
+        "search",
+        lambda: SearchIndex.build(
+            snapshot.get("types-data"),
+            snapshot.get("pvp-data"),
+            snapshot.get("egg-groups-data"),
+            snapshot.get("abilities-data"),
+            snapshot.get("obtainable-data"),
+        ),
+    )
+
+
+def require(snapshot, what, *datasets):
+    """
+    Checks that the datasets a command needs were loaded, before looking anything up in them.
+
+    Raises:
+    NotFound: Saying that `what` isn't available, if any of them is missing from the data folder.
+    """
+    missing = [f"{dataset}.json" for dataset in datasets if dataset not in snapshot.datasets]
+    if missing:
+        raise NotFound(f"{what} data isn't available: the data folder has no {' or '.join(missing)}.")
+
+
+def stat_tables(snapshot):
+    """Returns the base stat matrix and the nature multipliers for a data snapshot, built on first use."""
+    return snapshot.derive(
+        "stats",
+        lambda: (
+            BaseStats.from_json(snapshot.get("pokemon-data")),
+            Natures.from_json(snapshot.get("natures-data")),
+        ),
+    )
+
+
+def type_table(snapshot):
+    """Returns the type effectiveness of every attacking type against every Pokémon, built on first use."""
+    return snapshot.derive("typechart", lambda: TypeTable.from_json(snapshot.get("types-data")))
+
+
+# Renderers below turn a data snapshot and a command argument into the Pages
+# of the reply. Each page is a dict of keyword arguments for ctx.reply(), so
+# the result can be cached and sent again as it is. Long results are split
+# into pages that are only rendered when someone flips to them.
+
+
+def get_evolution_chain(chain):
+    """Returns the evolution chain as "A -> B -> C", or just the species name if it doesn't evolve."""
+    # If there is no 'evolves_to' key or it's empty, return just the species name.
+    if "evolves_to" not in chain or not chain["evolves_to"]:
+        return chain["species"]["name"].title()
+
+    # Start with the current species name
+    evolutions = [chain["species"]["name"].title()]
+
+    # Iterate over all possible evolutions
+    for evolution in chain["evolves_to"]:
+        # Recursively get the evolution chain for the next level
+        next_evolution = get_evolution_chain(evolution)
+        # Append the next evolution to the list
+        evolutions.append(next_evolution)
+
+    # Join all the evolutions with arrows to show the path
+    return " -> ".join(evolutions)
+
+
+def render_pokemon(snapshot, name):
+    """Renders the information embed for a specific Pokémon."""
+    pokemon_data = snapshot.get("pokemon-data")
+
+    # Find the Pokémon by name
+    names = name_index(snapshot, "pokemon-data")
+    pokemon_info = pokemon_data.get(names.resolve(name))
+
+    if not pokemon_info:
+        raise NotFound(
+            "Pokémon not found. Please check the name and try again."
+            + did_you_mean(names, name)
+        )
+
+    # Create an embed object for the response
+    embed = Embed(
+        title=pokemon_info["name"].title(), color=0x00FF00
+    )  # You can change the color
+
+    # Set the thumbnail of the embed to the front image
+    embed.set_thumbnail(url=pokemon_info["sprites"]["front_default"])
+
+    # Add fields to the embed
+    embed.add_field(
+        name="Types",
+        value=", ".join(pokemon_info["types"]).title(),
+        inline=False,
+    )
+    embed.add_field(
+        name="Abilities",
+        value=", ".join(
+            f"{ability['ability_name'].title()}"
+            + (" (Hidden)" if ability["is_hidden"] else "")
+            for ability in pokemon_info["abilities"]
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="Base Stats",
+        value="\n".join(
+            f"**{stat['stat_name'].title()}**: {stat['base_stat']}"
+            for stat in pokemon_info["stats"]
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="Capture Rate",
+        value=str(pokemon_info["capture_rate"]),
+        inline=False,
+    )
+    # embed.add_field(
+    #     name="Base Experience",
+    #     value=str(pokemon_info["base_experience"]),
+    #     inline=False,
+    # )
+    embed.add_field(
+        name="Egg Groups",
+        value=", ".join(pokemon_info["egg_groups"]).title(),
+        inline=False,
+    )
+    # embed.add_field(
+    #     name="Growth Rate",
+    #     value=pokemon_info["growth_rate"].title(),
+    #     inline=False,
+    # )
+
+    # Evolution Chain
+    evolution_chain = get_evolution_chain(pokemon_info["evolution_chain"]["chain"])
+
+    # Only add the 'Evolution Chain' field if there is an evolution chain
+    if evolution_chain and evolution_chain != pokemon_info["name"].title():
+        embed.add_field(
+            name="Evolution Chain",
+            value=evolution_chain,
+            inline=False,
+        )
+
+    return Pages.of({"embed": embed})
+
+
+def render_types(snapshot, type_name):
+    """Renders a specific Pokémon type, or the list of all types for 'all'."""
+    types_data = snapshot.get("types-data")
+
+    if type_name.lower() == "all":
+        # List all Pokémon type names
+        all_types = ", ".join(types_data.keys())
+        return Pages.of({"content": f"All Types: {all_types}"})
+
+    # Find the type by name
+    names = name_index(snapshot, "types-data")
+    type_key = names.resolve(type_name)
+    type_data = types_data.get(type_key)
+
+    if not type_data:
+        raise NotFound(
+            f"Pokémon Type '{type_name}' not found. Please check the name and try again."
+            + did_you_mean(names, type_name)
+        )
+
+    # Split the Pokémon and the moves of the type into parts that fit in an embed field
+    pokemon_parts = fit([pokemon["name"] for pokemon in type_data["pokemon"]], FIELD_LIMIT, ", ")
+    move_parts = fit([move["name"] for move in type_data["moves"]], FIELD_LIMIT, ", ")
+
+    # Each page lists the next part of both
+    def render_type_page(index):
+        embed = Embed(title=f"Pokémon Type: {type_key.title()}", color=0x00FF00)
+        if index < len(pokemon_parts):
+            embed.add_field(name="Pokémon of this Type", value=", ".join(pokemon_parts[index]), inline=False)
+        if index < len(move_parts):
+            embed.add_field(name="Moves of this Type", value=", ".join(move_parts[index]), inline=False)
+        return {"embed": embed}
+
+    return Pages(max(len(pokemon_parts), len(move_parts), 1), render_type_page)
+
+
+def render_tiers(snapshot, tier_name):
+    """Renders a specific PvP tier, or the list of all tiers for 'all'."""
+    pvp_data = snapshot.get("pvp-data")
+
+    if tier_name.lower() == "all":
+        # List all tier names
+        all_tiers = ", ".join(pvp_data.keys())
+        return Pages.of({"content": f"All Tiers: {all_tiers}"})
+
+    # Find the tier by name
+    names = name_index(snapshot, "pvp-data")
+    tier_key = names.resolve(tier_name)
+    tier_info = pvp_data.get(tier_key)
+
+    if not tier_info:
+        raise NotFound(
+            f"PvP Tier '{tier_name}' not found. Please check the name and try again."
+            + did_you_mean(names, tier_name)
+        )
+
+    # List the Pokémon in the tier, as many per page as fit in an embed field
+    pokemon_names = [pokemon["name"].title().replace("-", " ") for pokemon in tier_info]
+
+    def render_tier_page(chunk, index):
+        embed = Embed(title=f"PvP Tier: {tier_key}", color=0x00FF00)
+        embed.add_field(name="Pokémon in this Tier", value=", ".join(chunk), inline=False)
+        return {"embed": embed}
+
+    return Pages.fitted(pokemon_names, FIELD_LIMIT, render_tier_page, ", ")
+
+
+def render_egggroup(snapshot, group_name):
+    """Renders a specific Egg Group, or the list of all Egg Groups for 'all'."""
+    egg_groups_data = snapshot.get("egg-groups-data")
+
+    if group_name.lower() == "all":
+        # List all Egg Group names
+        all_groups = ", ".join(
+            group["name"].title() for group in egg_groups_data.values()
+        )
+        return Pages.of({"content": f"All Egg Groups: {all_groups}"})
+
+    # Find the Egg Group by name
+    names = name_index(snapshot, "egg-groups-data")
+    egg_group_info = egg_groups_data.get(names.resolve(group_name))
+
+    if not egg_group_info:
+        raise NotFound(
+            f"Egg Group '{group_name}' not found. Please check the name and try again."
+            + did_you_mean(names, group_name)
+        )
+
+    # List the Pokémon species in the Egg Group, as many per page as fit in an embed field
+    species_names = [
+        species["name"].title().replace("-", " ")
+        for species in egg_group_info["pokemon_species"]
+    ]
+
+    def render_egggroup_page(chunk, index):
+        embed = Embed(title=f"Egg Group: {egg_group_info['name'].title()}", color=0x00FF00)
+        embed.add_field(name="Pokémon Species", value=", ".join(chunk), inline=False)
+        return {"embed": embed}
+
+    return Pages.fitted(species_names, FIELD_LIMIT, render_egggroup_page, ", ")
+
+
+def render_egg_moves(snapshot, pokemon):
+    """Renders the egg moves of a Pokémon, one page per move with its 30 shortest breeding chains."""
+    egg_moves = snapshot.get("egg-moves-data")
+
+    # Find the Pokémon by name
+    names = name_index(snapshot, "egg-moves-data")
+    key = names.resolve(pokemon)
+
+    if key not in egg_moves:
+        raise NotFound(f"No egg move data found for {pokemon}." + did_you_mean(names, pokemon))
+
+    graph = breeding_graph(snapshot)
+
+    # One page per move, the chains are only searched for when the page is shown
+    def render_move_page(moves, index):
+        move = moves[0]
+        response = f"**{move}** (Shortest chains, limit 30):\n"
+        for chain in graph.chains(key, move, limit=30):
+            response += " -> ".join(chain) + "\n"
+        return {"content": response}
+
+    return Pages.chunked(egg_moves.moves[key], 1, render_move_page)
+
+
+def render_locations(snapshot, name):
+    """Renders the locations where a Pokémon can be found, as many per page as fit in an embed field."""
+    encounter_table = snapshot.get("location-data")
+
+    # Find the Pokémon's encounters through the pokemon_id index
+    names = name_index(snapshot, "location-data")
+    locations = encounter_table.for_pokemon(names.resolve(name) or name)
+
+    if not locations:
+        raise NotFound(f"No location data found for {name}." + did_you_mean(names, name))
+
+    pokemon_name = locations[0].pokemon.title()
+    lines = [
+        f"{location.location_name.title()}, {location.region} "
+        f"(Lvl {location.min_level}-{location.max_level}, {location.type}, {location.rarity})"
+        for location in locations
+    ]
+
+    def render_location_page(chunk, index):
+        embed = Embed(
+            title=f"Locations for {pokemon_name} (Part {index + 1})",
+            color=0x00FF00,
+        )
+        embed.add_field(name="Locations", value="\n".join(chunk), inline=False)
+        return {"embed": embed}
+
+    return Pages.fitted(lines, FIELD_LIMIT, render_location_page)
+
+
+def render_find(snapshot, query):
+    """Renders the Pokémon matching every filter of a !find query, 40 per page."""
+    search = search_index(snapshot)
+
+    try:
+        filters = search.parse(query)
+    except ValueError as e:
+        raise NotFound(str(e))
+
+    matches = search.pokemon(search.search(filters))
+    if not matches:
+        raise NotFound(f"No Pokémon match '{query}'.")
+
+    # One page per 40 Pokémon
+    def render_find_page(chunk, index):
+        # The query goes in the description, titles are limited to 256 characters
+        embed = Embed(
+            title=f"Pokémon matching every filter ({len(matches)})",
+            description=query[:4096],
+            color=0x00FF00,
+        )
+
+        pokemon_list = ", ".join(name.title().replace("-", " ") for _, name in chunk)
+        embed.add_field(name=f"Results (Part {index + 1})", value=pokemon_list, inline=False)
+        return {"embed": embed}
+
+    return Pages.chunked(matches, 40, render_find_page)
+
+
+def format_duration(delta):
+    """Formats a real-time duration as "42 min", "3 h 05 min" or "12 days"."""
+    minutes = max(int(delta.total_seconds() // 60), 0)
+    if minutes < 60:
+        return f"{minutes} min"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} h {minutes % 60:02d} min"
+    return f"{minutes // (24 * 60)} days"
+
+
+def render_where(snapshot, query):
+    """
+    Renders where a Pokémon can be caught now, or within the next N real minutes.
+
+    The query is the Pokémon name followed by optional filters: "in:30" for
+    the next 30 minutes, "region:sinnoh" and "rarity:common" for Common or
+    more common encounters.
+    """
+    encounter_table = snapshot.get("location-data")
+    names = name_index(snapshot, "location-data")
+
+    # Split the filters from the words of the Pokémon name
+    words, minutes, region, min_rarity = [], 0, None, None
+    for term in query.split():
+        key, _, value = term.partition(":")
+        key = key.lower()
+        if not value:
+            words.append(term)
+        elif key in ("in", "within"):
+            if not value.isdigit():
+                raise NotFound(f"'{term}' should be a number of minutes, e.g. in:30.")
+            minutes = int(value)
+        elif key in ("region", "r"):
+            region = next(
+                (name for name in encounter_table.by_region if name.lower() == value.lower()), None
+            )
+            if region is None:
+                raise NotFound(
+                    f"Unknown region '{value}'. Regions: {', '.join(encounter_table.by_region)}."
+                )
+        elif key == "rarity":
+            # "very-rare" and "veryrare" both match Very Rare, a space would split the term
+            min_rarity = next(
+                (
+                    rarity for rarity in EncounterTable.RARITIES
+                    if normalize(rarity).replace("-", "") == normalize(value).replace("-", "")
+                ),
+                None,
+            )
+            if min_rarity is None:
+                raise NotFound(
+                    f"Unknown rarity '{value}'. "
+                    f"Rarities: {', '.join(normalize(rarity) for rarity in EncounterTable.RARITIES)}."
+                )
+        else:
+            raise NotFound(f"I don't understand '{term}'. Use in:, region: or rarity:.")
+
+    name = " ".join(words)
+    if not name:
+        raise NotFound("Give the name of a Pokémon, e.g. gible in:60.")
+    pokemon_id = encounter_table.pokemon_ids.get(names.resolve(name) or name.lower())
+    if pokemon_id is None:
+        raise NotFound(f"No location data found for {name}." + did_you_mean(names, name))
+
+    now = datetime.utcnow()
+    available = encounter_table.available(
+        pokemon_id, now, timedelta(minutes=minutes), region, min_rarity
+    )
+    pokemon_name = encounter_table.pokemon_names[pokemon_id].title()
+    when = f"in the next {minutes} minutes" if minutes else "right now"
+
+    if not available:
+        raise NotFound(f"{pokemon_name} can't be caught {when} with those filters.")
+
+    lines = []
+    for row, location_name, (start, end) in available:
+        encounter = encounter_table.row(row)
+        if end is None:
+            window = "always"
+        elif start <= now:
+            window = f"now, for {format_duration(end - now)}"
+        else:
+            window = f"in {format_duration(start - now)}, for {format_duration(end - start)}"
+        lines.append(
+            f"{location_name.title()}, {encounter.region} "
+            f"(Lvl {encounter.min_level}-{encounter.max_level}, {encounter.type}, "
+            f"{encounter.rarity}): {window}"
+        )
+
+    def render_where_page(chunk, index):
+        embed = Embed(
+            title=f"Where to catch {pokemon_name} {when} (Part {index + 1})",
+            description=f"It's {phase(now)} in {season(now)}.",
+            color=0x00FF00,
+        )
+        embed.add_field(name="Locations", value="\n".join(chunk), inline=False)
+        return {"embed": embed}
+
+    return Pages.fitted(lines, FIELD_LIMIT, render_where_page)
+
+
+def format_stat_row(label, stats):
+    """Formats a row of six stats after a label, for a monospaced table."""
+    return f"{label:<19}" + "".join(f"{stat:>5}" for stat in stats)
+
+
+def render_stats(snapshot, query):
+    """
+    Renders the stats of a Pokémon, or of every Pokémon in a PvP tier, at a level.
+
+    The query is a Pokémon name or "tier:<tier>", followed by any of: a level
+    (default 50), a nature, IVs and then EVs as six numbers like
+    31/31/31/31/31/31 (default all 31 IVs and no EVs), and "speed:<stat>" or
+    "speed:<pokemon>" to find the best nature and fewest Speed EVs that reach
+    that Speed stat or outspeed that Pokémon at its fastest.
+    """
+    require(snapshot, "Stats", "pokemon-data", "natures-data")
+    base_stats, natures = stat_tables(snapshot)
+    names = name_index(snapshot, "pokemon-data")
+
+    # Split the options from the words of the Pokémon name
+    words, level, nature, tier, target, ivs_text, evs_text = [], 50, None, None, None, None, None
+    for term in query.split():
+        key, _, value = term.partition(":")
+        key = key.lower() if value else None
+        value = value or term
+        if key in ("tier", "pvp"):
+            tier_names = name_index(snapshot, "pvp-data")
+            tier = tier_names.resolve(value)
+            if tier is None:
+                raise NotFound(f"PvP Tier '{value}' not found." + did_you_mean(tier_names, value))
+        elif key in ("speed", "spe"):
+            target = value
+        elif key in ("iv", "ivs"):
+            ivs_text = value
+        elif key in ("ev", "evs"):
+            evs_text = value
+        elif key in ("level", "lv") or (key is None and value.isdigit()):
+            if not value.isdigit() or not 1 <= int(value) <= 100:
+                raise NotFound("The level should be a number between 1 and 100.")
+            level = int(value)
+        elif key == "nature" or (key is None and normalize(value) in natures.rows):
+            if normalize(value) not in natures.rows:
+                raise NotFound(f"Unknown nature '{value}'.")
+            nature = natures.rows[normalize(value)]
+        elif key is None and "/" in value:
+            # The first spread given is the IVs, the second the EVs
+            if ivs_text is None:
+                ivs_text = value
+            else:
+                evs_text = value
+        elif key is None:
+            words.append(term)
+        else:
+            raise NotFound(f"I don't understand '{term}'. Use tier:, speed:, level:, nature:, iv: or ev:.")
+
+    try:
+        ivs = np.full(len(statcalc.STATS), statcalc.MAX_IV)
+        if ivs_text is not None:
+            ivs = statcalc.parse_spread(ivs_text, statcalc.MAX_IV)
+        evs = np.zeros(len(statcalc.STATS), dtype=np.int64)
+        if evs_text is not None:
+            evs = statcalc.parse_spread(evs_text, statcalc.MAX_EV, statcalc.MAX_TOTAL_EVS)
+    except ValueError as e:
+        raise NotFound(str(e))
+
+    # Which Pokémon: one by name, or every one in the tier
+    name = " ".join(words)
+    if tier is not None:
+        if name:
+            raise NotFound("Give either a Pokémon or a tier, not both.")
+        rows = base_stats.select(pokemon["id"] for pokemon in snapshot.get("pvp-data")[tier])
+        title = f"{tier} tier"
+    else:
+        key = names.resolve(name)
+        if key not in base_stats.rows:
+            raise NotFound(
+                "Pokémon not found. Please check the name and try again." + did_you_mean(names, name)
+            )
+        rows = np.array([base_stats.rows[key]])
+        title = key.title()
+    spread = f"Level {level}, IVs {'/'.join(map(str, ivs))}, EVs {'/'.join(map(str, evs))}"
+    header = format_stat_row("", statcalc.STAT_LABELS)
+
+    if target is None:
+        if tier is None:
+            # Every nature, or the one asked for
+            base = base_stats.matrix[rows[0]]
+            chosen = range(len(natures.names)) if nature is None else [nature]
+            stats = statcalc.calculate(base, level, ivs, evs, natures.matrix[list(chosen)])
+            lines = [header, format_stat_row("Base", base)]
+            lines += [format_stat_row(natures.describe(row), stats[i]) for i, row in enumerate(chosen)]
+            embed = Embed(
+                title=f"{title} stats", description="```\n" + "\n".join(lines) + "\n```", color=0x00FF00
+            )
+            embed.set_footer(text=spread)
+            return Pages.of({"embed": embed})
+
+        # Every Pokémon in the tier with one nature, fastest first
+        if nature is None:
+            nature = next(row for row in range(len(natures.names)) if (natures.matrix[row] == 10).all())
+        stats = statcalc.calculate(base_stats.matrix[rows], level, ivs, evs, natures.matrix[nature])
+        order = np.argsort(-stats[:, statcalc.SPEED], kind="stable")
+        table = [(base_stats.names[rows[i]], stats[i]) for i in order]
+
+        def render_tier_stats_page(chunk, index):
+            lines = [header] + [format_stat_row(pokemon[:19].title(), row) for pokemon, row in chunk]
+            embed = Embed(
+                title=f"{title} stats, {natures.describe(nature)} (Part {index + 1})",
+                description="```\n" + "\n".join(lines) + "\n```",
+                color=0x00FF00,
+            )
+            embed.set_footer(text=spread)
+            return {"embed": embed}
+
+        return Pages.chunked(table, 20, render_tier_stats_page)
+
+    # Speed benchmark: a number, or outspeeding a Pokémon at its fastest
+    if target.isdigit():
+        goal, goal_text = int(target), f"reach {target} Speed"
+    else:
+        key = names.resolve(target)
+        if key not in base_stats.rows:
+            raise NotFound(f"Pokémon '{target}' not found." + did_you_mean(names, target))
+        fastest = statcalc.calculate_stat(
+            base_stats.matrix[base_stats.rows[key], statcalc.SPEED], level, statcalc.MAX_IV, statcalc.MAX_EV, 11
+        )
+        goal, goal_text = int(fastest) + 1, f"outspeed max Speed {key.title()} ({fastest})"
+
+    best, speed_evs, speed, reachable = statcalc.speed_benchmark(
+        base_stats.matrix[rows], level, ivs, natures, goal
+    )
+    results = [
+        (base_stats.names[row], natures.describe(best[i]), int(speed_evs[i]), int(speed[i]))
+        for i, row in enumerate(rows)
+        if reachable[i]
+    ]
+    # Fewest Speed EVs first
+    results.sort(key=lambda result: result[2])
+    unreachable = [base_stats.names[row].title() for i, row in enumerate(rows) if not reachable[i]]
+    if not results:
+        raise NotFound(f"{title} can't {goal_text} at level {level}.")
+
+    def render_benchmark_page(chunk, index):
+        lines = [f"{'Pokémon':<19}{'Best nature':<19}{'EVs':>4}{'Spe':>5}"]
+        lines += [
+            f"{pokemon[:19].title():<19}{nature_text:<19}{evs:>4}{stat:>5}"
+            for pokemon, nature_text, evs, stat in chunk
+        ]
+        embed = Embed(
+            title=f"{title}: best natures to {goal_text} (Part {index + 1})",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=0x00FF00,
+        )
+        if unreachable:
+            embed.add_field(name="Can't reach it", value=join_names(unreachable, FIELD_LIMIT), inline=False)
+        embed.set_footer(text=f"{spread} (Speed EVs as needed, the rest in the higher attacking stat)")
+        return {"embed": embed}
+
+    return Pages.chunked(results, 20, render_benchmark_page)
+
+
+def join_names(names, limit):
+    """
+    Joins names with commas, ending in "and N more" when they don't all fit in `limit` characters.
+
+    Returns:
+    str: At most `limit` characters, naming as many as fit and counting the rest.
+    """
+    listed = ", ".join(names)
+    if len(listed) <= limit:
+        return listed
+
+    # Leave room for the count of the names left out
+    budget = limit - len(f" and {len(names)} more")
+    kept, length = [], 0
+    for name in names:
+        length += len(name) + (2 if kept else 0)
+        if length > budget:
+            break
+        kept.append(name)
+    return ", ".join(kept) + f" and {len(names) - len(kept)} more"
+
+
+def coverage_summary(table, targets, attack_types):
+    """Describes how well a set of attacking types hits the target Pokémon, naming the ones that wall it."""
+    best = typechart.best_multipliers(table.defense[targets], attack_types)
+    summary = (
+        f"Super effective against {(best > 1).sum()} of {len(targets)}, neutral against {(best == 1).sum()}, "
+        f"resisted by {((best < 1) & (best > 0)).sum()} and no effect on {(best == 0).sum()}."
+    )
+    walls = [table.names[row].title() for row in targets[best < 1]]
+    if walls:
+        # The summary shares its embed field with the list
+        summary += f"\nWalled by: {join_names(walls, 900)}"
+    return summary
+
+
+def render_coverage(snapshot, query):
+    """
+    Renders the type coverage of a team of Pokémon, or of a moveset.
+
+    The query is a list of Pokémon or of moves, optionally with "tier:<tier>"
+    to only count the Pokémon of that tier as targets. For a team, it shows
+    how many members are weak to or resist each type and what their STAB
+    types hit. For moves, it shows what they hit, and when one Pokémon is
+    given with fewer than four moves, which move from its learnset adds the
+    most coverage.
+    """
+    require(snapshot, "Type", "types-data")
+    table = type_table(snapshot)
+
+    team, moves, tier = [], [], None
+    for term in query.replace(",", " ").split():
+        key, _, value = term.partition(":")
+        if value and key.lower() in ("tier", "pvp"):
+            tier_names = name_index(snapshot, "pvp-data")
+            tier = tier_names.resolve(value)
+            if tier is None:
+                raise NotFound(f"PvP Tier '{value}' not found." + did_you_mean(tier_names, value))
+        elif term in table.pokemon_names:
+            team.append(table.pokemon_names.resolve(term))
+        elif term in table.move_names:
+            moves.append(table.move_names.resolve(term))
+        else:
+            suggestions = table.pokemon_names.suggest(term, 2) + table.move_names.suggest(term, 2)
+            raise NotFound(
+                f"'{term}' isn't a Pokémon or a move I know."
+                + (f" Did you mean: {', '.join(suggestions)}?" if suggestions else "")
+            )
+    if not team and not moves:
+        raise NotFound("Give a team of Pokémon, or a moveset, e.g. garchomp earthquake outrage.")
+    if moves and len(team) > 1:
+        raise NotFound("Give either a team of Pokémon, or one Pokémon with its moves.")
+
+    if tier is not None:
+        targets = table.select(pokemon["id"] for pokemon in snapshot.get("pvp-data")[tier])
+        against = f"the {tier} tier"
+    else:
+        targets = np.arange(len(table.names))
+        against = "every Pokémon"
+
+    if not moves:
+        # Team: defensive weaknesses per attacking type, and the coverage of the team's STAB types
+        members = [table.rows[name] for name in team]
+        weak, resist, immune = typechart.team_weaknesses(table.defense[members])
+        lines = [f"{'Attack':<10}{'Weak':>5}{'Resist':>7}{'Immune':>7}"]
+        for index, type_name in enumerate(typechart.TYPES):
+            # Flag the types more of the team is weak to than can take them
+            flag = "  !" if weak[index] > resist[index] + immune[index] else ""
+            lines.append(f"{type_name.title():<10}{weak[index]:>5}{resist[index]:>7}{immune[index]:>7}{flag}")
+        stab = sorted({index for row in members for index in table.types[row] if index >= 0})
+
+        embed = Embed(
+            title=f"Coverage of {', '.join(name.title() for name in team)}",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=0x00FF00,
+        )
+        embed.add_field(
+            name=f"STAB coverage against {against}",
+            value=coverage_summary(table, targets, stab),
+            inline=False,
+        )
+        return Pages.of({"embed": embed})
+
+    # Moveset: what the moves hit, and the best move to add from the Pokémon's learnset
+    attack_types = [table.move_types[move] for move in moves]
+    user = f"{team[0].title()}'s " if team else ""
+    embed = Embed(
+        title=f"Coverage of {user}{', '.join(move.title() for move in moves)}",
+        description="Types: " + ", ".join(typechart.TYPES[index].title() for index in attack_types),
+        color=0x00FF00,
+    )
+    embed.add_field(
+        name=f"Against {against}", value=coverage_summary(table, targets, attack_types), inline=False
+    )
+
+    if team and len(moves) < 4:
+        try:
+            require(snapshot, "Learnset", "pokemon-data", "moves-data")
+        except NotFound as e:
+            # The coverage itself only needs the types, so still show it
+            embed.add_field(name="Best moves to add", value=str(e), inline=False)
+            return Pages.of({"embed": embed})
+        pokemon_info = snapshot.get("pokemon-data").get(team[0])
+        if not pokemon_info:
+            raise NotFound(f"No learnset found for {team[0].title()}.")
+
+        # Damaging moves only
+        moves_data = snapshot.get("moves-data")
+        candidates = {}  # move name -> (type index, power); a move can be learned several ways
+        for move in pokemon_info["moves"]:
+            name = move["name"]
+            move_info = moves_data.get(name, {})
+            if name in moves or name not in table.move_types:
+                continue
+            if move_info.get("damage_class") == "status" or not move_info.get("power"):
+                continue
+            candidates[name] = (table.move_types[name], move_info.get("power") or 0)
+        candidates = [(name, type_index, power) for name, (type_index, power) in candidates.items()]
+
+        if candidates:
+            unresisted, super_effective = typechart.rank_additions(
+                table.defense[targets], attack_types, np.array([type_index for _, type_index, _ in candidates])
+            )
+            # Most walls broken first, then most new super effective hits, then the strongest move
+            ranking = sorted(
+                range(len(candidates)),
+                key=lambda i: (-unresisted[i], -super_effective[i], -candidates[i][2], candidates[i][0]),
+            )
+            lines = [
+                f"**{candidates[i][0].title()}** ({typechart.TYPES[candidates[i][1]].title()}"
+                + (f", {candidates[i][2]} power" if candidates[i][2] else "")
+                + f"): +{unresisted[i]} not resisted, +{super_effective[i]} super effective"
+                for i in ranking[:10]
+            ]
+            embed.add_field(name="Best moves to add", value="\n".join(lines), inline=False)
+
+    return Pages.of({"embed": embed})
+
+
+def render_learnmoves(snapshot, name):
+    """Renders the moves a Pokémon can learn, 40 per page."""
+    pokemon_data = snapshot.get("pokemon-data")
+
+    # Find the Pokémon by name
+    names = name_index(snapshot, "pokemon-data")
+    pokemon_info = pokemon_data.get(names.resolve(name))
+
+    if not pokemon_info or "moves" not in pokemon_info:
+        raise NotFound(f"No move data found for {name}." + did_you_mean(names, name))
+
+    # One page per 40 moves
+    def render_moves_page(moves, index):
+        # Create an embed object for the response
+        embed = Embed(
+            title=f"Learnable Moves for {pokemon_info['name'].title()}",
+            color=0x00FF00,
+        )
+
+        moves_text = "\n".join(
+            (
+                f"{move['name'].title()} (Lvl {move['level']})"
+                if move["type"] == "level"
+                else f"{move['name'].title()} ({move['type'].title()})"
+            )
+            for move in moves
+        )
+
+        # Add field to embed
+        embed.add_field(name="Moves", value=moves_text, inline=False)
+        return {"embed": embed}
+
+    return Pages.chunked(pokemon_info["moves"], 40, render_moves_page)
+
+
+def render_ability(snapshot, ability_name):
+    """Renders an ability's effect followed by the Pokémon that have it, 30 per page."""
+    abilities_data = snapshot.get("abilities-data")
+
+    # Find the ability by name
+    names = name_index(snapshot, "abilities-data")
+    ability_info = abilities_data.get(names.resolve(ability_name))
+
+    if not ability_info:
+        raise NotFound(
+            f"Ability '{ability_name}' not found. Please check the name and try again."
+            + did_you_mean(names, ability_name)
+        )
+
+    # Create an embed object for the response
+    embed = Embed(title=f"Ability: {ability_info['name'].title()}", color=0x00FF00)
+
+    # Add fields to the embed
+    embed.add_field(name="Effect", value=ability_info["effect"], inline=False)
+
+    # The first page is the embed, followed by one page per 30 Pokémon
+    pokemon_list = ability_info["pokemon_with_ability"]
+
+    def render_page(index):
+        if index == 0:
+            return {"embed": embed}
+        pokemon_chunk = pokemon_list[(index - 1) * 30: index * 30]
+        pokemon_names = ", ".join(pokemon["name"].title() for pokemon in pokemon_chunk)
+        return {
+            "content": f"Pokémon with '{ability_info['name'].title()}' ability: {pokemon_names}"
+        }
+
+    return Pages(1 + (len(pokemon_list) + 29) // 30, render_page)
+
+
+def render_move(snapshot, move_name):
+    """Renders a move's details followed by the Pokémon that can learn it, 30 per page."""
+    moves_data = snapshot.get("moves-data")
+
+    # Find the move by name
+    names = name_index(snapshot, "moves-data")
+    move_info = moves_data.get(names.resolve(move_name))
+
+    if not move_info:
+        raise NotFound(
+            f"Move '{move_name}' not found. Please check the name and try again."
+            + did_you_mean(names, move_name)
+        )
+
+    # Create an embed object for the response
+    embed = Embed(title=f"Move: {move_info['name'].title()}", color=0x00FF00)
+
+    # Add fields to the embed
+    embed.add_field(name="Type", value=move_info["type"].title(), inline=True)
+    embed.add_field(
+        name="Damage Class",
+        value=move_info["damage_class"].title(),
+        inline=True,
+    )
+    embed.add_field(name="Power", value=str(move_info["power"]), inline=True)
+    embed.add_field(name="PP", value=str(move_info["pp"]), inline=True)
+    embed.add_field(name="Accuracy", value=str(move_info["accuracy"]), inline=True)
+    embed.add_field(name="Effect", value=move_info["effect"], inline=False)
+
+    # The first page is the embed, followed by one page per 30 Pokémon
+    pokemon_list = move_info["learned_by_pokemon"]
+
+    def render_page(index):
+        if index == 0:
+            return {"embed": embed}
+        pokemon_chunk = pokemon_list[(index - 1) * 30: index * 30]
+        pokemon_names = ", ".join(pokemon["name"].title() for pokemon in pokemon_chunk)
+        return {
+            "content": f"Pokémon that can learn '{move_info['name'].title()}': {pokemon_names}"
+        }
+
+    return Pages(1 + (len(pokemon_list) + 29) // 30, render_page)
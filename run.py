@@ -1,88 +1,560 @@
+import asyncio
+import logging
+import os
+import signal
+import time
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 import yaml
-import json
-from discord import Embed
-from datetime import datetime
-
-# Load configuration from config.yml
-with open("config.yml", "r") as file:
+from admission import Admission
+from breeding import EggMoves
+from cache import RecentReplies, RenderCache, SingleFlight
+from datastore import DataStore
+from encounters import EncounterTable
+from gameclock import get_pokemmo_day_and_time
+from metrics import Metrics, RateLimitLogHandler, peak_memory_mb, serve_metrics
+from names import normalize
+from outbound import Outbox
+from pagination import PaginatorRegistry
+from popularity import Popularity
+import responses
+from responses import NotFound
+from scheduler import EventScheduler
+from shards import Supervisor, shard_groups
+from workers import Busy, WorkerPool
+
+# Load configuration from config.yml (or the file named by the BOT_CONFIG environment variable)
+with open(os.environ.get("BOT_CONFIG", "config.yml"), "r") as file:
     config = yaml.safe_load(file)
 
 TOKEN = config["token"]
 COMMAND_CHANNEL_ID = config["command_channel_id"]
+DATA_DIR = config.get("data_dir", "data")
+# Written by tools/build_snapshot.py, loaded instead of parsing the JSON files that haven't changed
+DATA_SNAPSHOT = config.get("data_snapshot", os.path.join(DATA_DIR, "snapshot.pickle"))
+# Seconds between checks of the data folder for changed files (0 disables watching)
+DATA_RELOAD_INTERVAL = config.get("data_reload_interval", 0)
+# Local port for the Prometheus /metrics endpoint (0 disables it)
+METRICS_PORT = config.get("metrics_port", 0)
+# Register the slash commands with Discord on startup
+SYNC_SLASH_COMMANDS = config.get("sync_slash_commands", True)
+# Number of gateway shards (0 runs a single unsharded connection) and the processes to spread them over
+SHARD_COUNT = config.get("shard_count", 0)
+SHARD_PROCESSES = config.get("shard_processes", 1)
+# Which shard process this is, set in each worker by run_shard_group()
+PROCESS_INDEX = 0
+# Where lookup counts are kept across restarts, how often they're saved, and how many
+# of the most asked for replies to render into the cache at startup (0 disables warming)
+POPULARITY_FILE = config.get("popularity_file", "popularity.json")
+POPULARITY_SAVE_INTERVAL = config.get("popularity_save_interval", 300)
+CACHE_WARM_COUNT = config.get("cache_warm_count", 100)
+# Per-user, per-channel and per-guild command limits, see the README
+THROTTLE = config.get("throttle") or {}
+
+# Per-command timings, counts and Discord rate limit waits
+metrics = Metrics()
+metrics.describe("commands_total", "counter", "Commands handled, by command and outcome.")
+metrics.describe("command_seconds", "histogram", "Total time to handle a command.")
+metrics.describe(
+    "command_phase_seconds", "histogram",
+    "Time spent per command phase (lookup, queue, render, send).",
+)
+metrics.describe(
+    "render_cache_total", "counter", "Render cache lookups, by result (hit, miss or coalesced)."
+)
+metrics.describe(
+    "duplicate_replies_total", "counter", "Replies collapsed into a link to the same answer in the channel."
+)
+metrics.describe("throttled_total", "counter", "Commands refused by admission control, by scope.")
+metrics.describe("autocomplete_seconds", "histogram", "Time to compute autocomplete suggestions.")
+metrics.describe("data_reload_seconds", "histogram", "Time to reload changed data files.")
+metrics.describe("rate_limits_total", "counter", "Discord 429 responses, by scope (route or global).")
+metrics.describe(
+    "rate_limit_wait_seconds_total", "counter", "Seconds spent waiting out Discord 429 responses."
+)
+metrics.describe(
+    "rate_limit_preemptive_total", "counter", "Times discord.py held requests back because a bucket was used up."
+)
+RateLimitLogHandler.install(metrics)
+
+# Parse every dataset in the data folder once, so commands only do in-memory lookups.
+# Encounters are kept once in an indexed table instead of four grouped JSON copies,
+# and egg moves are reduced to the facts the breeding graph needs.
+store = DataStore(
+    DATA_DIR,
+    loaders={
+        "egg-moves-data": EggMoves.from_json,
+        "location-data": EncounterTable.from_json,
+    },
+    skip=EncounterTable.GROUPED_DATASETS,
+    snapshot_path=DATA_SNAPSHOT,
+)
+# Report how long startup loading took and how much memory the data needs
+memory = peak_memory_mb()
+print(
+    f"Loaded {len(store.snapshot.datasets)} datasets in {store.load_seconds * 1000:.0f} ms "
+    f"({len(store.from_snapshot)} from the snapshot, {len(store.parsed)} parsed from JSON)"
+    + (f", {memory:.0f} MB resident" if memory is not None else "")
+)
+
+# Rendered replies, keyed by (command, normalized argument, data version)
+render_cache = RenderCache(config.get("render_cache_size", 1024))
+# Renders in progress, shared by identical requests that arrive meanwhile
+in_flight = SingleFlight()
+# Replies sent recently in each channel, to point repeated questions at (0 disables)
+DUPLICATE_REPLY_WINDOW = config.get("duplicate_reply_window", 0)
+recent_replies = RecentReplies(DUPLICATE_REPLY_WINDOW)
+
+# Lookups and rendering run on worker threads so they never block the gateway
+workers = WorkerPool(
+    max_workers=config.get("worker_threads", 4),
+    concurrency=config.get("command_concurrency"),
+    max_waiting=config.get("command_queue_limit", 10),
+)
+# Tasks started in the background, referenced until they finish so they aren't garbage collected
+background_tasks = set()
+
+
+def render_first_page(command, renderer, snapshot, argument, queued):
+    """Runs a renderer and renders its first page, on a worker thread."""
+    started = time.perf_counter()
+    metrics.observe("command_phase_seconds", started - queued, command=command, phase="queue")
+    with metrics.timer("command_phase_seconds", command=command, phase="render"):
+        pages = renderer(snapshot, argument)
+        # Pages render on first access: render the first one here, off the event loop and inside the timer
+        pages[0]
+    return pages
+
+
+async def render(command, argument, renderer, key=None):
+    """
+    Returns the replies for a command, rendering them on a worker thread on a cache miss.
+
+    Concurrent requests with the same cache key share a single render.
+
+    Parameters:
+    command (str): The command name, part of the cache key.
+    argument (str): The argument as typed, normalized for the cache key.
+    renderer (callable): Takes the data snapshot and the argument and returns the replies.
+    key (str): Optional cache key for the argument, instead of normalize(argument).
+
+    Returns:
+    Pages: The reply pages, each a keyword argument dict for ctx.reply().
+    """
+    with metrics.timer("command_phase_seconds", command=command, phase="lookup"):
+        snapshot = store.snapshot
+        key = (command, key or normalize(argument), snapshot.version)
+        pages = render_cache.get(key)
+
+    if pages is not None:
+        result = "hit"
+    elif key in in_flight:
+        result = "coalesced"
+    else:
+        result = "miss"
+    metrics.inc("render_cache_total", command=command, result=result)
+
+    if pages is None:
+        async def render_and_cache():
+            pages = await workers.run(
+                command, render_first_page, command, renderer, snapshot, argument, time.perf_counter()
+            )
+            render_cache.put(key, pages)
+            return pages
+
+        # Identical requests arriving while this one renders wait for the same result
+        pages = await in_flight.do(key, render_and_cache)
+    return pages
+
+
+# The dataset each lookup command's argument is a name from, for autocomplete
+NAME_DATASETS = {
+    "pokemon": "pokemon-data",
+    "types": "types-data",
+    "tiers": "pvp-data",
+    "egggroup": "egg-groups-data",
+    "eggmoves": "egg-moves-data",
+    "locations": "location-data",
+    "learnmoves": "pokemon-data",
+    "ability": "abilities-data",
+    "move": "moves-data",
+}
+
+# The renderers of the commands whose replies only depend on the argument and the data,
+# so their most popular replies can be rendered into the cache ahead of time
+RENDERERS = {
+    "pokemon": responses.render_pokemon,
+    "types": responses.render_types,
+    "tiers": responses.render_tiers,
+    "egggroup": responses.render_egggroup,
+    "eggmoves": responses.render_egg_moves,
+    "locations": responses.render_locations,
+    "learnmoves": responses.render_learnmoves,
+    "ability": responses.render_ability,
+    "move": responses.render_move,
+    "find": responses.render_find,
+    "stats": responses.render_stats,
+    "coverage": responses.render_coverage,
+}
+
+# How often each argument was looked up successfully, per command, to rank
+# autocomplete and to pick the replies to warm the cache with
+popularity = Popularity(POPULARITY_FILE or None)
+
+
+async def reply_with(ctx, command, argument, renderer, what, key=None):
+    """
+    Renders a lookup command's reply and sends it, handling the ways it can fail.
+
+    Parameters:
+    ctx (commands.Context): The invocation context.
+    command (str): The command name, used for caching and metrics.
+    argument (str): The argument as typed by the user.
+    renderer (callable): The renderer from responses.py for this command.
+    what (str): What kind of data the command fetches, for the error message.
+    key (str): Optional cache key for the argument, see render().
+    """
+    reply = queued_reply(ctx)
+    if ctx.interaction is not None:
+        # Slash commands must be answered within 3 seconds, but the render may wait for a worker
+        await ctx.defer()
+    try:
+        pages = await render(command, argument, renderer, key)
+        key = (command, key or normalize(argument))
+        with metrics.timer("command_phase_seconds", command=command, phase="send"):
+            # Only the user who asked can flip a paginated reply's pages, so those are always sent in full
+            collapsible = DUPLICATE_REPLY_WINDOW > 0 and len(pages) == 1
+            earlier = None
+            if collapsible:
+                earlier = recent_replies.get(ctx.channel.id, key, pages)
+            if earlier is not None:
+                # The same answer was just posted here, link to it instead of repeating it
+                metrics.inc("duplicate_replies_total", command=command)
+                await reply(content=f"Same answer as just above: {earlier.jump_url}")
+            else:
+                message = await paginators.send(ctx, pages, reply)
+                if collapsible:
+                    recent_replies.put(ctx.channel.id, key, pages, message)
+        ctx.outcome = "ok"
+        if command in RENDERERS:
+            popularity.record(command, key[1])
+    except NotFound as e:
+        ctx.outcome = "not_found"
+        await reply(content=str(e))
+    except Busy:
+        ctx.outcome = "busy"
+        await reply(content="I'm busy with a lot of requests right now. Please try again in a moment.")
+    except Exception as e:
+        ctx.outcome = "error"
+        print(f"Error: {e}")
+        await reply(content=f"Sorry, I couldn't fetch the {what} data.")
+
+
+def autocomplete(command):
+    """
+    Returns an autocomplete callback for a lookup command's slash command argument.
+
+    Suggestions come from the dataset's in-memory NameIndex, most popular
+    first, so no data file is read while the user types.
+    """
+    dataset = NAME_DATASETS[command]
+
+    async def callback(interaction, current):
+        with metrics.timer("autocomplete_seconds", dataset=dataset):
+            try:
+                names = responses.name_index(store.snapshot, dataset)
+            except KeyError:
+                return []
+            matches = names.complete(current, popularity=popularity.counts(command))
+        return [app_commands.Choice(name=name, value=name) for name in matches]
+
+    return callback
+
+
+# Outgoing replies and announcements, queued per channel and paced to Discord's rate limits
+outbox = Outbox(
+    channel_rate=config.get("channel_send_rate", 5),
+    global_rate=config.get("global_send_rate", 45),
+)
+
+
+def queued_reply(ctx):
+    """
+    Returns a function that replies to the command through the outbox.
+
+    Slash command replies are followups to the deferred interaction and don't
+    count against the channel's message limit, so they are sent directly.
+    """
+    if ctx.interaction is not None:
+        return ctx.reply
+
+    async def reply(**kwargs):
+        return await outbox.send(ctx.channel.id, ctx.author.id, ctx.message.id, ctx.reply, **kwargs)
+
+    return reply
+
+
+# Token buckets every command must pass before it runs. A command's cost is roughly
+# how many messages it produces: the long paginated lookups cost more, admin commands nothing.
+admission = Admission(
+    limits={
+        "user": THROTTLE.get("user", [8, 20]),
+        "channel": THROTTLE.get("channel", [20, 20]),
+        "guild": THROTTLE.get("guild", [60, 20]),
+    },
+    guild_limits=THROTTLE.get("guilds"),
+    costs={
+        "default": 1,
+        "eggmoves": 3,
+        "locations": 2,
+        "learnmoves": 2,
+        "find": 2,
+        "where": 2,
+        "stats": 2,
+        "reload": 0,
+        "metrics": 0,
+        "subscribe": 0,
+        "unsubscribe": 0,
+        **THROTTLE.get("costs", {}),
+    },
+)
+
+
+class Throttled(commands.CheckFailure):
+    """Raised by the admission check when a user, channel or guild has run out of tokens."""
+
+    def __init__(self, scope, retry_after, notify):
+        super().__init__(f"Throttled by the {scope} limit for {retry_after:.1f} s")
+        self.scope = scope
+        self.retry_after = retry_after
+        self.notify = notify
+
+
+# Paginated replies with live page buttons, closed when idle or evicted
+paginators = PaginatorRegistry(
+    max_views=config.get("max_paginated_messages", 100),
+    timeout=config.get("page_timeout", 300),
+    executor=workers.executor,
+)
+
 
 intents = discord.Intents.default()
 intents.message_content = True  # To read message content
 intents.guilds = True  # To access guilds (servers)
 
-bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True)
+if SHARD_COUNT or SHARD_PROCESSES > 1:
+    bot = commands.AutoShardedBot(
+        command_prefix="!",
+        intents=intents,
+        case_insensitive=True,
+        shard_count=SHARD_COUNT or SHARD_PROCESSES,
+    )
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True)
+
+
+async def announce(channel_id, content):
+    """Posts a scheduled announcement to a subscribed channel."""
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        # Deleted, or in a guild served by another shard process, which announces it instead
+        return
+    await outbox.send(channel_id, None, None, channel.send, content=content)
+
+
+# Tide, day phase, roamer and season announcements for subscribed channels
+scheduler = EventScheduler(announce, config.get("subscriptions_file", "subscriptions.json"))
+
 
+def build_name_indexes(snapshot):
+    """Builds the name index of every autocompleted dataset, so the first keystroke doesn't wait for one."""
+    for dataset in set(NAME_DATASETS.values()):
+        if dataset in snapshot.datasets:
+            responses.name_index(snapshot, dataset)
 
-def get_pokemmo_day_and_time():
+
+async def warm_cache(count):
     """
-    Returns the current in-game day and time for PokeMMO based on the real-world time.
+    Renders the first page of the most popular replies into the cache, one at a time.
 
-    Real-world to game time conversion in PokeMMO:
-    - 15 seconds of real time = 1 minute of game time
-    - 6 hours of real time = 24 hours of game time
+    Returns:
+    int: The number of replies rendered.
+    """
+    snapshot = store.snapshot
+    warmed = 0
+    for command, argument in popularity.top(count):
+        key = (command, argument, snapshot.version)
+        if key in render_cache or command not in RENDERERS:
+            continue
+        try:
+            pages = await workers.run(
+                command, render_first_page, command, RENDERERS[command], snapshot, argument, time.perf_counter()
+            )
+        except Exception:
+            # Names that no longer exist, or the pool being busy with real requests
+            continue
+        render_cache.put(key, pages)
+        warmed += 1
+    return warmed
 
-    Additionally, it includes the current in-game season, shoal cave tide based on the month and time,
-    and roaming legendaries in Johto and Kanto.
+
+async def reload_data():
+    """
+    Re-parses changed data files on a background thread and swaps them in.
 
     Returns:
-    str: Current in-game day and time, season, shoal cave tide, and roaming legendaries in PokeMMO.
+    list: The names of the datasets that were reloaded or removed.
+    """
+    loop = asyncio.get_running_loop()
+    with metrics.timer("data_reload_seconds"):
+        changed = await loop.run_in_executor(workers.executor, store.reload)
+    await loop.run_in_executor(workers.executor, build_name_indexes, store.snapshot)
+    if changed and CACHE_WARM_COUNT > 0:
+        # The cached replies were rendered from the old data, render the popular ones again
+        task = asyncio.create_task(warm_cache(CACHE_WARM_COUNT))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    return changed
+
+
+@tasks.loop(seconds=max(DATA_RELOAD_INTERVAL, 1))
+async def watch_data():
+    """Reloads the data folder whenever a file's modification time or size changes."""
+    # Scanning the folder only stats the files, parsing is left to reload_data
+    if not store.changed():
+        return
+    try:
+        changed = await reload_data()
+        print(f"Reloaded data (version {store.version}): {', '.join(changed)}")
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+@tasks.loop(seconds=max(POPULARITY_SAVE_INTERVAL, 1))
+async def save_popularity():
+    """Saves the lookup counts, so the next start can warm the cache with the popular replies."""
+    try:
+        popularity.save()
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+@save_popularity.after_loop
+async def save_popularity_on_exit():
+    # Runs when the loop is cancelled on shutdown, so the latest counts aren't lost
+    try:
+        popularity.save()
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+def admit(ctx):
     """
-    # Get the current real-world time (UTC)
-    now = datetime.utcnow()
-
-    # Calculate the total minutes passed since a known reference date (e.g., a recent Monday at midnight)
-    reference_date = datetime(2023, 12, 4)  # This date should be a Monday in UTC
-    delta = now - reference_date
-
-    # Convert real-world minutes to game time minutes
-    game_time_minutes = delta.total_seconds() / 15
-
-    # Calculate the in-game hour, minute, and day
-    game_hour = int(game_time_minutes // 60) % 24
-    game_minute = int(game_time_minutes % 60)
-    game_days_passed = int(game_time_minutes // (24 * 60))
-
-    # Calculate the in-game weekday
-    game_weekday = game_days_passed % 7
-
-    # Map the weekday number to a day name
-    days_of_week = [
-        "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
-    ]
-    in_game_day_name = days_of_week[game_weekday]
-
-    # Determine the current season based on the real-world month
-    months_to_seasons = {
-        1: "Spring", 2: "Summer", 3: "Autumn", 4: "Winter",
-        5: "Spring", 6: "Summer", 7: "Autumn", 8: "Winter",
-        9: "Spring", 10: "Summer", 11: "Autumn", 12: "Winter"
-    }
-    current_season = months_to_seasons[now.month]
-
-    # Determine the shoal cave tide based on the in-game time
-    shoal_cave_tide = "Low" if 3 <= game_hour < 9 or 15 <= game_hour < 21 else "High"
-
-    # Determine the roaming legendaries for Johto and Kanto
-    johto_legendaries = ["Entei", "Suicune", "Raikou"]
-    kanto_legendaries = ["Zapdos", "Moltres", "Articuno"]
-
-    current_month = now.month
-    johto_legendary = johto_legendaries[(current_month - 1) % 3]
-    kanto_legendary = kanto_legendaries[(current_month - 1) % 3]
-
-    return (
-        f"Day: {in_game_day_name}, Time: {game_hour:02d}:{game_minute:02d}\n"
-        f"Season: {current_season}\n"
-        f"Shoal Cave Tide: {shoal_cave_tide}\n"
-        f"Johto Roamer: {johto_legendary}\n"
-        f"Kanto Roamer: {kanto_legendary}"
+    Takes the command's tokens from the user's, channel's and guild's buckets.
+
+    Raises:
+    Throttled: If one of them doesn't have enough left.
+    """
+    rejection = admission.admit(
+        ctx.command.qualified_name,
+        ctx.guild.id if ctx.guild is not None else None,
+        ctx.channel.id,
+        ctx.author.id,
     )
+    if rejection is not None:
+        metrics.inc("throttled_total", scope=rejection[0])
+        raise Throttled(*rejection)
+
+
+async def answer_interaction(ctx, content):
+    """
+    Answers a slash command that hasn't been answered, visible only to the user.
+
+    Discord shows "The application did not respond" for slash commands left unanswered.
+    """
+    if ctx.interaction is None or ctx.interaction.response.is_done():
+        return
+    try:
+        await ctx.interaction.response.send_message(content, ephemeral=True)
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+@bot.listen("on_command_error")
+async def report_command_error(ctx, error):
+    if isinstance(error, Throttled):
+        who = "You're" if error.scope == "user" else f"This {error.scope} is"
+        notice = f"{who} sending commands too quickly. Try again in {max(error.retry_after, 1):.0f} s."
+        if ctx.interaction is not None:
+            # Only the user sees the answer to a slash command, so every one can be answered
+            await answer_interaction(ctx, notice)
+        elif error.notify:
+            # Only say so once, further commands are dropped quietly until the bucket admits one again
+            try:
+                await queued_reply(ctx)(content=notice)
+            except Exception as e:
+                print(f"Error: {e}")
+        return
+    if isinstance(error, commands.CheckFailure):
+        # The only check on the slash commands is in_command_channel
+        await answer_interaction(ctx, f"Please use my commands in <#{COMMAND_CHANNEL_ID}>.")
+    else:
+        await answer_interaction(ctx, "Sorry, something went wrong.")
+    # Listening for command errors turns off discord.py's own logging of them, so log them the same way
+    logging.getLogger("discord.ext.commands.bot").error(
+        "Ignoring exception in command %s", ctx.command, exc_info=error
+    )
+
+
+@bot.before_invoke
+async def start_timer(ctx):
+    # Admit here rather than in a global check: checks also run when !help lists the commands
+    # a user can run, and before the command's own checks (e.g. the command channel)
+    admit(ctx)
+    ctx.started = time.perf_counter()
+
+
+@bot.after_invoke
+async def record_command(ctx):
+    """Records the total time and outcome of every command."""
+    command = ctx.command.qualified_name
+    outcome = getattr(ctx, "outcome", "error" if ctx.command_failed else "ok")
+    metrics.inc("commands_total", command=command, outcome=outcome)
+    metrics.observe("command_seconds", time.perf_counter() - ctx.started, command=command)
+
+
+def close_bot():
+    """Closes the bot from a signal handler, so shutdown runs the same as after Ctrl+C."""
+    task = asyncio.create_task(bot.close())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+@bot.event
+async def setup_hook():
+    scheduler.start()
+    loop = asyncio.get_running_loop()
+    if SHARD_PROCESSES > 1:
+        # The supervisor stops shard processes with SIGTERM, close cleanly so the lookup counts are saved
+        loop.add_signal_handler(signal.SIGTERM, close_bot)
+    await loop.run_in_executor(workers.executor, build_name_indexes, store.snapshot)
+    # Render the replies people asked for most before the last restart, before connecting
+    popularity.load()
+    if CACHE_WARM_COUNT > 0:
+        started = time.perf_counter()
+        warmed = await warm_cache(CACHE_WARM_COUNT)
+        print(f"Warmed the render cache with {warmed} replies in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if POPULARITY_FILE:
+        save_popularity.start()
+    # Slash commands are global, so only the first shard process registers them
+    if SYNC_SLASH_COMMANDS and PROCESS_INDEX == 0:
+        await bot.tree.sync()
+    if DATA_RELOAD_INTERVAL > 0:
+        watch_data.start()
+    if METRICS_PORT:
+        # Each shard process serves its own metrics, on consecutive ports
+        await serve_metrics(metrics, port=METRICS_PORT + PROCESS_INDEX)
 
 
 # A decorator to check if the command was invoked in the correct channel
@@ -96,14 +568,14 @@ def in_command_channel():
 @in_command_channel()
 async def hello_cmd(ctx):
     """Replies with a hello message."""
-    await ctx.message.reply(f"Hello, {ctx.author.display_name}!")
+    await queued_reply(ctx)(content=f"Hello, {ctx.author.display_name}!")
 
 
 @bot.command(name="time", aliases=["gametime"])
 async def time_cmd(ctx):
     """Replies with the current in-game day and time in PokeMMO."""
     in_game_time = get_pokemmo_day_and_time()
-    await ctx.message.reply(f"{in_game_time}")
+    await queued_reply(ctx)(content=f"{in_game_time}")
 
 
 @bot.command(name="commands")
@@ -113,476 +585,230 @@ async def _commands(ctx):
     helptext = "Here are the available commands:\n"
     for command in bot.commands:
         helptext += f"!{command.name} : {command.help}\n"
-    await ctx.message.reply(helptext)
+    await queued_reply(ctx)(content=helptext)
+
+
+@bot.command(name="subscribe", aliases=["sub"])
+@commands.has_permissions(manage_channels=True)
+async def subscribe_cmd(ctx, *kinds: str):
+    """Posts tide, phase, roamer and/or season changes in this channel (all if none are given). (Channel managers only.)"""
+    kinds = [kind.lower() for kind in kinds] or list(EventScheduler.KINDS)
+    unknown = [kind for kind in kinds if kind not in EventScheduler.KINDS]
+    if unknown:
+        await queued_reply(ctx)(
+            content=f"Unknown event '{unknown[0]}'. Choose from: {', '.join(EventScheduler.KINDS)}."
+        )
+        return
+
+    subscribed = scheduler.subscribe(ctx.channel.id, kinds)
+    await queued_reply(ctx)(
+        content=f"This channel now gets announcements for: {', '.join(sorted(subscribed))}."
+    )
 
 
-@bot.command(name="pokemon", aliases=["p"])
-@in_command_channel()
-async def pokemon_cmd(ctx, name: str):
-    """Provides information about a specific Pokémon."""
-    try:
-        # Load the Pokémon data from the JSON file
-        with open("data/pokemon-data.json", "r") as file:
-            pokemon_data = json.load(file)
-
-        # Find the Pokémon by name
-        pokemon_info = pokemon_data.get(name.lower())
-
-        if pokemon_info:
-            # Create an embed object for the response
-            embed = Embed(
-                title=pokemon_info["name"].title(), color=0x00FF00
-            )  # You can change the color
-
-            # Set the thumbnail of the embed to the front image
-            embed.set_thumbnail(url=pokemon_info["sprites"]["front_default"])
-
-            # Add fields to the embed
-            embed.add_field(
-                name="Types",
-                value=", ".join(pokemon_info["types"]).title(),
-                inline=False,
-            )
-            embed.add_field(
-                name="Abilities",
-                value=", ".join(
-                    f"{ability['ability_name'].title()}"
-                    + (" (Hidden)" if ability["is_hidden"] else "")
-                    for ability in pokemon_info["abilities"]
-                ),
-                inline=False,
-            )
-            embed.add_field(
-                name="Base Stats",
-                value="\n".join(
-                    f"**{stat['stat_name'].title()}**: {stat['base_stat']}"
-                    for stat in pokemon_info["stats"]
-                ),
-                inline=False,
-            )
-            embed.add_field(
-                name="Capture Rate",
-                value=str(pokemon_info["capture_rate"]),
-                inline=False,
-            )
-            # embed.add_field(
-            #     name="Base Experience",
-            #     value=str(pokemon_info["base_experience"]),
-            #     inline=False,
-            # )
-            embed.add_field(
-                name="Egg Groups",
-                value=", ".join(pokemon_info["egg_groups"]).title(),
-                inline=False,
-            )
-            # embed.add_field(
-            #     name="Growth Rate",
-            #     value=pokemon_info["growth_rate"].title(),
-            #     inline=False,
-            # )
-
-            # Evolution Chain
-            def get_evolution_chain(chain):
-                # If there is no 'evolves_to' key or it's empty, return an empty string.
-                if "evolves_to" not in chain or not chain["evolves_to"]:
-                    return chain["species"]["name"].title()
-
-                # Start with the current species name
-                evolutions = [chain["species"]["name"].title()]
-
-                # Iterate over all possible evolutions
-                for evolution in chain["evolves_to"]:
-                    # Recursively get the evolution chain for the next level
-                    next_evolution = get_evolution_chain(evolution)
-                    # Append the next evolution to the list
-                    evolutions.append(next_evolution)
-
-                # Join all the evolutions with arrows to show the path
-                return " -> ".join(evolutions)
-
-            evolution_chain = get_evolution_chain(
-                pokemon_info["evolution_chain"]["chain"]
-            )
+@bot.command(name="unsubscribe", aliases=["unsub"])
+@commands.has_permissions(manage_channels=True)
+async def unsubscribe_cmd(ctx, *kinds: str):
+    """Stops announcements in this channel, for the given events or all of them. (Channel managers only.)"""
+    remaining = scheduler.unsubscribe(ctx.channel.id, [kind.lower() for kind in kinds])
+    if remaining:
+        await queued_reply(ctx)(
+            content=f"This channel still gets announcements for: {', '.join(sorted(remaining))}."
+        )
+    else:
+        await queued_reply(ctx)(content="This channel no longer gets any announcements.")
 
-            # Only add the 'Evolution Chain' field if there is an evolution chain
-            if evolution_chain and evolution_chain != pokemon_info["name"].title():
-                embed.add_field(
-                    name="Evolution Chain",
-                    value=evolution_chain,
-                    inline=False,
-                )
 
-            # Send the embed as a reply to the invoking message
-            await ctx.reply(embed=embed)
-        else:
-            await ctx.message.reply(
-                "Pokémon not found. Please check the name and try again."
+@bot.command(name="reload")
+@commands.has_permissions(administrator=True)
+async def reload_cmd(ctx):
+    """Reloads changed data files without restarting the bot. (Administrators only.)"""
+    try:
+        changed = await reload_data()
+        if changed:
+            await queued_reply(ctx)(
+                content=f"Reloaded {', '.join(changed)} (data version {store.version})."
             )
+        else:
+            await queued_reply(ctx)(content="No data files have changed.")
     except Exception as e:
         print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the Pokémon data.")
+        await queued_reply(ctx)(
+            content="Sorry, I couldn't reload the data. The previous data is still in use."
+        )
+
+
+@bot.command(name="metrics")
+@commands.has_permissions(administrator=True)
+async def metrics_cmd(ctx):
+    """Shows per-command counts, errors and latencies. (Administrators only.)"""
+    lines = [f"{'Command':<11}{'Count':>7}{'Errors':>8}{'p50 ms':>9}{'p99 ms':>9}{'Hit %':>7}"]
+    for command in metrics.label_values("command_seconds", "command"):
+        histogram = metrics.histogram("command_seconds", command=command)
+        errors = metrics.counter("commands_total", command=command, outcome="error")
+        # Requests that shared another one's render count as hits
+        hits = metrics.counter("render_cache_total", command=command, result="hit") + metrics.counter(
+            "render_cache_total", command=command, result="coalesced"
+        )
+        misses = metrics.counter("render_cache_total", command=command, result="miss")
+        hit_rate = f"{100 * hits / (hits + misses):.0f}" if hits + misses else "-"
+        lines.append(
+            f"{command:<11}{histogram.count:>7}{errors:>8}"
+            f"{histogram.quantile(0.5) * 1000:>9.1f}{histogram.quantile(0.99) * 1000:>9.1f}{hit_rate:>7}"
+        )
+
+    rate_limits = metrics.counter("rate_limits_total")
+    waited = metrics.counter("rate_limit_wait_seconds_total")
+    preemptive = metrics.counter("rate_limit_preemptive_total")
+    lines.append(
+        f"\nRate limited {rate_limits:.0f} times, waited {waited:.1f} s in total; "
+        f"{preemptive:.0f} pre-emptive waits for a used up bucket."
+    )
+    lines.append(f"{len(outbox)} messages queued to send, {outbox.merged} merged into others.")
+    lines.append(f"{admission.rejected} commands refused by the throttle.")
+    await queued_reply(ctx)(content="```\n" + "\n".join(lines) + "\n```")
+
+
+@bot.hybrid_command(name="pokemon", aliases=["p"])
+@app_commands.describe(name="The Pokémon's name")
+@app_commands.autocomplete(name=autocomplete("pokemon"))
+@in_command_channel()
+async def pokemon_cmd(ctx, name: str):
+    """Provides information about a specific Pokémon."""
+    await reply_with(ctx, "pokemon", name, responses.render_pokemon, "Pokémon")
 
 
-@bot.command(name="types", aliases=["type"])
+@bot.hybrid_command(name="types", aliases=["type"])
+@app_commands.describe(type_name="A type, or 'all'")
+@app_commands.autocomplete(type_name=autocomplete("types"))
 @in_command_channel()
 async def types_cmd(ctx, type_name: str):
     """Provides information about a specific Pokémon type or lists all types if 'all' is specified."""
-    try:
-        # Load the Pokémon type data from the JSON file
-        with open("data/types-data.json", "r") as file:
-            types_data = json.load(file)
-
-        if (type_name.lower() == "all"):
-            # List all Pokémon type names
-            all_types = ", ".join(types_data.keys())
-            await ctx.reply(f"All Types: {all_types}")
-        else:
-            # Find the type by name
-            type_data = types_data.get(type_name.lower(), None)
-
-            if type_data:
-                # Create an embed object for the response
-                embed = Embed(
-                    title=f"Pokémon Type: {type_name.title()}", color=0x00FF00
-                )
-
-                # List the Pokémon in the type
-                pokemon_list = ", ".join(
-                    f"{pokemon['name']}" for pokemon in type_data["pokemon"]
-                )
-                embed.add_field(
-                    name="Pokémon of this Type", value=pokemon_list, inline=False
-                )
-
-                # List the moves of the type
-                moves_list = ", ".join(f"{move['name']}" for move in type_data["moves"])
-                embed.add_field(
-                    name="Moves of this Type", value=moves_list, inline=False
-                )
-
-                # Send the embed as a reply to the invoking message
-                await ctx.reply(embed=embed)
-            else:
-                await ctx.reply(
-                    f"Pokémon Type '{type_name}' not found. Please check the name and try again."
-                )
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.reply("Sorry, I couldn't fetch the Pokémon type data.")
+    await reply_with(ctx, "types", type_name, responses.render_types, "Pokémon type")
 
 
-@bot.command(name="tiers", aliases=["tier", "pvp"])
+@bot.hybrid_command(name="tiers", aliases=["tier", "pvp"])
+@app_commands.describe(tier_name="A PvP tier, or 'all'")
+@app_commands.autocomplete(tier_name=autocomplete("tiers"))
 @in_command_channel()
 async def tiers_cmd(ctx, tier_name: str):
     """Provides information about a specific PvP tier or lists all tiers if 'all' is specified."""
-    try:
-        # Load the PvP tier data from the JSON file
-        with open("data/pvp-data.json", "r") as file:
-            pvp_data = json.load(file)
-
-        if (tier_name.lower() == "all"):
-            # List all tier names
-            all_tiers = ", ".join(pvp_data.keys())
-            await ctx.reply(f"All Tiers: {all_tiers}")
-        else:
-            # Find the tier by name
-            tier_info = pvp_data.get(tier_name.upper(), None)
-
-            if tier_info:
-                # Create an embed object for the response
-                embed = Embed(title=f"PvP Tier: {tier_name.upper()}", color=0x00FF00)
-
-                # List the Pokémon in the tier
-                pokemon_list = ", ".join(
-                    pokemon["name"].title().replace("-", " ") for pokemon in tier_info
-                )
-                embed.add_field(
-                    name="Pokémon in this Tier", value=pokemon_list, inline=False
-                )
-
-                # Send the embed as a reply to the invoking message
-                await ctx.reply(embed=embed)
-            else:
-                await ctx.reply(
-                    f"PvP Tier '{tier_name}' not found. Please check the name and try again."
-                )
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.reply("Sorry, I couldn't fetch the PvP tier data.")
+    await reply_with(ctx, "tiers", tier_name, responses.render_tiers, "PvP tier")
 
 
-@bot.command(name="egggroup", aliases=["eg"])
+@bot.hybrid_command(name="egggroup", aliases=["eg"])
+@app_commands.describe(group_name="An Egg Group, or 'all'")
+@app_commands.autocomplete(group_name=autocomplete("egggroup"))
 @in_command_channel()
 async def egggroup_cmd(ctx, group_name: str):
     """Provides information about a specific Egg Group or lists all Egg Groups if 'all' is specified."""
-    try:
-        # Load the Egg Group data from the JSON file
-        with open("data/egg-groups-data.json", "r") as file:
-            egg_groups_data = json.load(file)
-
-        if (group_name.lower() == "all"):
-            # List all Egg Group names
-            all_groups = ", ".join(
-                group["name"].title() for group in egg_groups_data.values()
-            )
-            await ctx.reply(f"All Egg Groups: {all_groups}")
-        else:
-            # Find the Egg Group by name
-            egg_group_info = next(
-                (
-                    group
-                    for group in egg_groups_data.values()
-                    if group["name"].lower() == group_name.lower()
-                ),
-                None,
-            )
-
-            if egg_group_info:
-                # Create an embed object for the response
-                embed = Embed(
-                    title=f"Egg Group: {egg_group_info['name'].title()}", color=0x00FF00
-                )
-
-                # List the Pokémon species in the Egg Group
-                pokemon_list = ", ".join(
-                    species["name"].title().replace("-", " ")
-                    for species in egg_group_info["pokemon_species"]
-                )
-                embed.add_field(
-                    name="Pokémon Species", value=pokemon_list, inline=False
-                )
-
-                # Send the embed as a reply to the invoking message
-                await ctx.reply(embed=embed)
-            else:
-                await ctx.message.reply(
-                    f"Egg Group '{group_name}' not found. Please check the name and try again."
-                )
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the Egg Group data.")
+    await reply_with(ctx, "egggroup", group_name, responses.render_egggroup, "Egg Group")
 
 
-@bot.command(name="eggmoves", aliases=["em"])
+@bot.hybrid_command(
+    name="eggmoves",
+    aliases=["em"],
+    # Slash command descriptions are limited to 100 characters
+    description="Egg moves and breeding chains for a Pokémon, up to 30 shortest chains per move.",
+)
+@app_commands.describe(pokemon="The Pokémon's name")
+@app_commands.autocomplete(pokemon=autocomplete("eggmoves"))
 @in_command_channel()
 async def egg_moves_cmd(ctx, pokemon: str):
-    """Responds with egg moves and breeding chains for the specified Pokemon. (Limit 30 per move.)"""
-    try:
-        # Load the egg moves data from the JSON file within the command
-        with open("data/egg-moves-data.json", "r") as file:
-            egg_moves_data = json.load(file)
-
-        pokemon = pokemon.lower()  # Convert to lowercase to match keys in the JSON file
-
-        if pokemon in egg_moves_data:
-            # Respond with moves and a maximum of 30 breed chains for each move
-            for move, chains in egg_moves_data[pokemon].items():
-                response = f"**{move}** (Limit 30):\n"
-                for chain in chains[:30]:  # Limit to 30 chains
-                    response += " -> ".join(chain) + "\n"
-                await ctx.message.reply(response)
-        else:
-            await ctx.message.reply(f"No egg move data found for {pokemon}.")
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the egg moves data.")
+    """Responds with egg moves and breeding chains for the specified Pokemon. (Up to 30 shortest chains per move.)"""
+    await reply_with(ctx, "eggmoves", pokemon, responses.render_egg_moves, "egg moves")
 
 
-@bot.command(name="locations", aliases=["l"])
+@bot.hybrid_command(name="locations", aliases=["l"])
+@app_commands.describe(name="The Pokémon's name")
+@app_commands.autocomplete(name=autocomplete("locations"))
 @in_command_channel()
 async def locations_cmd(ctx, name: str):
     """Provides information about locations where a specific Pokémon can be found."""
-    try:
-        # Load the location data from the JSON file
-        with open("data/pokemon-data.json", "r") as file:
-            pokemon_data = json.load(file)
-
-        # Find the Pokémon by name
-        pokemon_info = pokemon_data.get(name.lower())
-
-        if pokemon_info and "location_area_encounters" in pokemon_info:
-            locations = pokemon_info["location_area_encounters"]
-            # Split the locations into chunks of 25
-            location_chunks = [
-                locations[i: i + 25] for i in range(0, len(locations), 25)
-            ]
-
-            for index, chunk in enumerate(location_chunks, start=1):
-                embed = Embed(
-                    title=f"Locations for {pokemon_info['name'].title()} (Part {index})",
-                    color=0x00FF00,
-                )
-
-                location_text = "\n".join(
-                    f"{location['location']} (Lvl {location['min_level']}-{location['max_level']}, {location['rarity']}%)"
-                    for location in chunk
-                )
+    await reply_with(ctx, "locations", name, responses.render_locations, "location")
 
-                embed.add_field(name="Locations", value=location_text, inline=False)
 
-                # Send each embed in a separate message
-                await ctx.reply(embed=embed)
-
-        else:
-            await ctx.message.reply(f"No location data found for {name}.")
-
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the location data.")
-
-
-@bot.command(name="learnmoves", aliases=["lm"])
+@bot.hybrid_command(name="learnmoves", aliases=["lm"])
+@app_commands.describe(name="The Pokémon's name")
+@app_commands.autocomplete(name=autocomplete("learnmoves"))
 @in_command_channel()
 async def learnmoves_cmd(ctx, name: str):
     """Provides information about moves that a specific Pokémon can learn."""
-    try:
-        # Load the Pokémon data from the JSON file
-        with open("data/pokemon-data.json", "r") as file:
-            pokemon_data = json.load(file)
-
-        # Find the Pokémon by name
-        pokemon_info = pokemon_data.get(name.lower())
-
-        if pokemon_info and "moves" in pokemon_info:
-            # Split the moves into chunks of 40
-            moves_chunks = [
-                pokemon_info["moves"][i: i + 40]
-                for i in range(0, len(pokemon_info["moves"]), 40)
-            ]
-
-            for moves in moves_chunks:
-                # Create an embed object for the response
-                embed = Embed(
-                    title=f"Learnable Moves for {pokemon_info['name'].title()}",
-                    color=0x00FF00,
-                )
-
-                moves_text = "\n".join(
-                    (
-                        f"{move['name'].title()} (Lvl {move['level']})"
-                        if move["type"] == "level"
-                        else f"{move['name'].title()} ({move['type'].title()})"
-                    )
-                    for move in moves
-                )
-
-                # Add field to embed
-                embed.add_field(name="Moves", value=moves_text, inline=False)
-
-                # Send the embed as a reply to the invoking message
-                await ctx.reply(embed=embed)
-
-        else:
-            await ctx.message.reply(f"No move data found for {name}.")
-
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the learnable moves data.")
+    await reply_with(ctx, "learnmoves", name, responses.render_learnmoves, "learnable moves")
 
 
-@bot.command(name="ability", aliases=["a"])
+@bot.hybrid_command(name="ability", aliases=["a"])
+@app_commands.describe(ability_name="The ability's name")
+@app_commands.autocomplete(ability_name=autocomplete("ability"))
 @in_command_channel()
 async def ability_cmd(ctx, ability_name: str):
     """Provides information about a specific ability and Pokémon that can learn it."""
-    try:
-        # Load the ability data from the JSON file
-        with open("data/abilities-data.json", "r") as file:
-            abilities_data = json.load(file)
-
-        # Find the ability by name
-        ability_info = abilities_data.get(ability_name.lower())
-
-        if ability_info:
-            # Create an embed object for the response
-            embed = Embed(
-                title=f"Ability: {ability_info['name'].title()}", color=0x00FF00
-            )
-
-            # Add fields to the embed
-            embed.add_field(name="Effect", value=ability_info["effect"], inline=False)
-
-            # Send the embed as a reply to the invoking message
-            await ctx.reply(embed=embed)
-
-            # Split the Pokémon into chunks of 30
-            pokemon_chunks = [
-                ability_info["pokemon_with_ability"][i: i + 30]
-                for i in range(0, len(ability_info["pokemon_with_ability"]), 30)
-            ]
+    await reply_with(ctx, "ability", ability_name, responses.render_ability, "ability")
 
-            for pokemon_chunk in pokemon_chunks:
-                pokemon_names = ", ".join(
-                    pokemon["name"].title() for pokemon in pokemon_chunk
-                )
-                await ctx.message.reply(
-                    f"Pokémon with '{ability_info['name'].title()}' ability: {pokemon_names}"
-                )
 
-        else:
-            await ctx.message.reply(
-                f"Ability '{ability_name}' not found. Please check the name and try again."
-            )
-
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the ability data.")
-
-
-@bot.command(name="move", aliases=["m"])
+@bot.hybrid_command(name="move", aliases=["m"])
+@app_commands.describe(move_name="The move's name")
+@app_commands.autocomplete(move_name=autocomplete("move"))
 @in_command_channel()
 async def move_cmd(ctx, move_name: str):
     """Provides information about a specific move and Pokémon that can learn it."""
-    try:
-        # Load the move data from the JSON file
-        with open("data/moves-data.json", "r") as file:
-            moves_data = json.load(file)
-
-        # Find the move by name
-        move_info = moves_data.get(move_name.lower())
-
-        if move_info:
-            # Create an embed object for the response
-            embed = Embed(title=f"Move: {move_info['name'].title()}", color=0x00FF00)
-
-            # Add fields to the embed
-            embed.add_field(name="Type", value=move_info["type"].title(), inline=True)
-            embed.add_field(
-                name="Damage Class",
-                value=move_info["damage_class"].title(),
-                inline=True,
-            )
-            embed.add_field(name="Power", value=str(move_info["power"]), inline=True)
-            embed.add_field(name="PP", value=str(move_info["pp"]), inline=True)
-            embed.add_field(
-                name="Accuracy", value=str(move_info["accuracy"]), inline=True
-            )
-            embed.add_field(name="Effect", value=move_info["effect"], inline=False)
+    await reply_with(ctx, "move", move_name, responses.render_move, "move")
 
-            # Send the embed as a reply to the invoking message
-            await ctx.reply(embed=embed)
 
-            # Split the Pokémon into chunks of 30
-            pokemon_chunks = [
-                move_info["learned_by_pokemon"][i: i + 30]
-                for i in range(0, len(move_info["learned_by_pokemon"]), 30)
-            ]
+@bot.hybrid_command(name="find", aliases=["search"])
+@app_commands.describe(query="Filters such as type:dragon tier:ou egg:monster obtainable")
+@in_command_channel()
+async def find_cmd(ctx, *, query: str):
+    """Finds Pokémon matching every filter, e.g. type:dragon tier:ou egg:monster obtainable."""
+    # normalize() would merge "-tier:ou" into the previous term, so key on the terms as typed
+    key = " ".join(query.lower().split())
+    await reply_with(ctx, "find", query, responses.render_find, "search", key)
 
-            for pokemon_chunk in pokemon_chunks:
-                pokemon_names = ", ".join(
-                    pokemon["name"].title() for pokemon in pokemon_chunk
-                )
-                await ctx.message.reply(
-                    f"Pokémon that can learn '{move_info['name'].title()}': {pokemon_names}"
-                )
 
-        else:
-            await ctx.message.reply(
-                f"Move '{move_name}' not found. Please check the name and try again."
-            )
+@bot.hybrid_command(name="where", aliases=["w"])
+@app_commands.describe(query="A Pokémon, optionally with in:<minutes>, region:<region> and rarity:<rarity>")
+@in_command_channel()
+async def where_cmd(ctx, *, query: str):
+    """Shows where a Pokémon can be caught right now, e.g. gible in:60 region:sinnoh rarity:common."""
+    # The answer depends on the game clock, so cached replies are only reused within the same minute
+    key = f"{' '.join(query.lower().split())} @{int(time.time() // 60)}"
+    await reply_with(ctx, "where", query, responses.render_where, "location", key)
 
-    except Exception as e:
-        print(f"Error: {e}")
-        await ctx.message.reply("Sorry, I couldn't fetch the move data.")
+
+@bot.hybrid_command(name="stats", aliases=["calc"])
+@app_commands.describe(query="A Pokémon or tier:<tier>, with optional level, nature, IVs, EVs and speed:<target>")
+@in_command_channel()
+async def stats_cmd(ctx, *, query: str):
+    """Calculates stats for each nature, or the best nature for a Speed target, e.g. garchomp speed:300."""
+    key = " ".join(query.lower().split())
+    await reply_with(ctx, "stats", query, responses.render_stats, "stats", key)
 
 
-bot.run(TOKEN)
+@bot.hybrid_command(name="coverage", aliases=["cov"])
+@app_commands.describe(query="A team of Pokémon, or a Pokémon and its moves, optionally with tier:<tier>")
+@in_command_channel()
+async def coverage_cmd(ctx, *, query: str):
+    """Shows the type coverage of a team or a moveset, e.g. garchomp earthquake outrage tier:ou."""
+    key = " ".join(query.lower().replace(",", " ").split())
+    await reply_with(ctx, "coverage", query, responses.render_coverage, "coverage", key)
+
+
+def run_shard_group(index, shard_ids):
+    """Runs the bot for a group of shards, in a worker process started by the supervisor."""
+    global PROCESS_INDEX
+    PROCESS_INDEX = index
+    if POPULARITY_FILE and index:
+        # Each shard process counts its own share of the lookups
+        root, extension = os.path.splitext(POPULARITY_FILE)
+        popularity.path = f"{root}.{index}{extension}"
+    bot.shard_ids = shard_ids
+    bot.run(TOKEN)
+
+
+if __name__ == "__main__":
+    if SHARD_PROCESSES > 1:
+        # The data is already loaded, the shard processes share it from here
+        groups = shard_groups(SHARD_COUNT or SHARD_PROCESSES, SHARD_PROCESSES)
+        Supervisor(run_shard_group, groups).run()
+    else:
+        bot.run(TOKEN)
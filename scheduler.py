@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+from gameclock import (
+    PHASES, TIDE_CHANGES, month_start, next_game_hour, phase, roamers, season, tide,
+)
+
+
+# Game hours at which a new day phase starts
+PHASE_CHANGES = tuple(start // 60 for start, _ in PHASES.values())
+
+
+def next_event(kind, now):
+    """
+    Returns the real time of the next event of a kind after `now`.
+
+    Every event follows from the game clock formulas in gameclock.py, so the
+    time is computed directly instead of checking the clock until it changes.
+    """
+    if kind == "tide":
+        return next_game_hour(now, TIDE_CHANGES)
+    if kind == "phase":
+        return next_game_hour(now, PHASE_CHANGES)
+    # Roamers and seasons change with the real-world month
+    return month_start(now, 1)
+
+
+def announcement(kind, now):
+    """Returns the message announcing an event of a kind that happened at `now`."""
+    if kind == "tide":
+        return f"The Shoal Cave tide is now {tide(now)}."
+    if kind == "phase":
+        return f"It's now {phase(now)} in PokeMMO."
+    if kind == "season":
+        return f"The season is now {season(now)}."
+    johto, kanto = roamers(now)
+    return f"The roaming legendaries are now {johto} in Johto and {kanto} in Kanto."
+
+
+class EventScheduler:
+    """
+    Announces game clock events to the channels that subscribed to them.
+
+    One heap holds the next event of every kind, ordered by time. A single task
+    sleeps until the earliest one, announces it, and pushes the next event of
+    the same kind, so there is no polling between events. Subscriptions are
+    saved to a JSON file so they survive restarts.
+
+    Parameters:
+    send (coroutine function): Awaited with a channel id and the message content.
+    path (str): The file subscriptions are kept in.
+    """
+
+    KINDS = ("tide", "phase", "roamer", "season")
+
+    def __init__(self, send, path="subscriptions.json"):
+        self.send = send
+        self.path = path
+        self.subscriptions = {}  # channel id -> set of event kinds
+        self.heap = []  # (time, kind) of the next event of each kind
+        self.task = None
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.subscriptions = {
+                    int(channel_id): set(kinds) for channel_id, kinds in json.load(file).items()
+                }
+
+    def save(self):
+        # Write a temporary file and swap it in, so a crash mid-write can't truncate the subscriptions.
+        # Shard processes share the file, so each writes its own temporary file.
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({channel_id: sorted(kinds) for channel_id, kinds in self.subscriptions.items()}, file)
+        os.replace(temporary, self.path)
+
+    def subscribe(self, channel_id, kinds):
+        """Subscribes a channel to event kinds and returns every kind it's subscribed to."""
+        # Other shard processes may have changed the file since it was loaded
+        self.load()
+        self.subscriptions.setdefault(channel_id, set()).update(kinds)
+        self.save()
+        return self.subscriptions[channel_id]
+
+    def unsubscribe(self, channel_id, kinds=None):
+        """Unsubscribes a channel from event kinds, or from all of them, and returns what's left."""
+        self.load()
+        remaining = self.subscriptions.get(channel_id, set()) - set(kinds or self.KINDS)
+        if remaining:
+            self.subscriptions[channel_id] = remaining
+        else:
+            self.subscriptions.pop(channel_id, None)
+        self.save()
+        return remaining
+
+    def channels(self, kind):
+        """Returns the ids of the channels subscribed to an event kind."""
+        return [channel_id for channel_id, kinds in self.subscriptions.items() if kind in kinds]
+
+    def start(self):
+        """Schedules the next event of every kind and starts announcing them."""
+        now = datetime.utcnow()
+        self.heap = [(next_event(kind, now), kind) for kind in self.KINDS]
+        heapq.heapify(self.heap)
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            when, kind = self.heap[0]
+            delay = (when - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                # Check again after waking up, in case the system clock moved
+                await asyncio.sleep(delay)
+                continue
+
+            if delay < -60:
+                # Long overdue (e.g. the machine was suspended), skip to the next one quietly
+                heapq.heapreplace(self.heap, (next_event(kind, datetime.utcnow()), kind))
+                continue
+
+            heapq.heapreplace(self.heap, (next_event(kind, when), kind))
+            # Describe the clock just after the change, clear of rounding at the boundary
+            content = announcement(kind, when + timedelta(seconds=1))
+            # Send to every channel at once, so one slow channel doesn't hold up the others
+            results = await asyncio.gather(
+                *(self.send(channel_id, content) for channel_id in self.channels(kind)),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error: {result}")
@@ -0,0 +1,102 @@
+class Nullable:
+    """Marks a schema value that may also be null."""
+
+    def __init__(self, spec):
+        self.spec = spec
+
+
+# The shape of each data/*.json file, limited to the fields the bot reads.
+# A type means the value must be of that type, [spec] a list of items
+# matching spec, {"*": spec} an object whose values all match spec and any
+# other dict an object with (at least) those keys.
+NAMED = {"name": str, "id": int}
+ENCOUNTER = {
+    "pokemon": str, "pokemon_id": int, "type": str, "region_name": str,
+    "min_level": int, "max_level": int, "rarity": str,
+}
+SCHEMAS = {
+    "abilities-data": {
+        "*": {"id": int, "name": str, "effect": Nullable(str), "pokemon_with_ability": [NAMED]}
+    },
+    "egg-groups-data": {"*": {"id": int, "name": str, "pokemon_species": [NAMED]}},
+    "egg-moves-data": {"*": {"*": [[str]]}},
+    "gender-rates": {"*": {"name": str, "pokemon_list": [NAMED]}},
+    "item-data": {"*": {"id": int, "name": str, "effect": Nullable(str)}},
+    "location-data": {"*": {"name": str, "encounters": [ENCOUNTER]}},
+    "location-rarities": {"*": [ENCOUNTER]},
+    "location-regions": {"*": [ENCOUNTER]},
+    "location-types": {"*": [ENCOUNTER]},
+    "natures-data": {"*": {"id": int, "name": str}},
+    "obtainable-data": {"*": [NAMED]},
+    "pvp-data": {"*": [NAMED]},
+    "types-data": {"*": {"pokemon": [NAMED], "moves": [NAMED]}},
+    "pokemon-data": {
+        "*": {
+            "name": str,
+            "id": int,
+            "types": [str],
+            "abilities": [{"ability_name": str, "is_hidden": bool}],
+            "stats": [{"stat_name": str, "base_stat": int}],
+            "capture_rate": int,
+            "egg_groups": [str],
+            "sprites": {"front_default": Nullable(str)},
+            "evolution_chain": {"chain": {"species": {"name": str}}},
+            "moves": [{"name": str, "type": str}],
+        }
+    },
+    "moves-data": {
+        "*": {
+            "name": str,
+            "type": str,
+            "damage_class": str,
+            "power": Nullable(int),
+            "pp": Nullable(int),
+            "accuracy": Nullable(int),
+            "effect": Nullable(str),
+            "learned_by_pokemon": [{"name": str}],
+        }
+    },
+}
+
+
+def validate(value, spec, path="", errors=None, limit=20):
+    """
+    Checks a parsed JSON value against a schema spec.
+
+    Parameters:
+    value: The parsed JSON value.
+    spec: The schema, see SCHEMAS.
+    path (str): Where the value is, for the error messages.
+    limit (int): Stop after this many errors.
+
+    Returns:
+    list: Error messages, empty if the value matches.
+    """
+    errors = [] if errors is None else errors
+    if len(errors) >= limit:
+        return errors
+
+    if isinstance(spec, Nullable):
+        if value is not None:
+            validate(value, spec.spec, path, errors, limit)
+    elif isinstance(spec, list):
+        if not isinstance(value, list):
+            errors.append(f"{path or '/'}: expected a list, got {type(value).__name__}")
+        else:
+            for index, item in enumerate(value):
+                validate(item, spec[0], f"{path}[{index}]", errors, limit)
+    elif isinstance(spec, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{path or '/'}: expected an object, got {type(value).__name__}")
+        elif "*" in spec:
+            for key, item in value.items():
+                validate(item, spec["*"], f"{path}/{key}", errors, limit)
+        else:
+            for key, item_spec in spec.items():
+                if key not in value:
+                    errors.append(f"{path}/{key}: missing")
+                else:
+                    validate(value[key], item_spec, f"{path}/{key}", errors, limit)
+    elif spec is int and isinstance(value, bool) or not isinstance(value, spec):
+        errors.append(f"{path or '/'}: expected {spec.__name__}, got {type(value).__name__}")
+    return errors
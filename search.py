@@ -0,0 +1,143 @@
+from names import NameIndex, did_you_mean, normalize
+
+
+class SearchIndex:
+    """
+    Precomputed per-attribute bitsets for filtering Pokémon on several attributes at once.
+
+    Every Pokémon id found in the data gets a bit position, ordered by id. Each
+    attribute value (a type, tier, egg group, ability or obtainability) maps to
+    a Python int with the bits of the Pokémon that have it, so combining
+    filters is a handful of bitwise AND/OR operations instead of scans over the
+    nested lists in the JSON files.
+    """
+
+    # Attribute names and the aliases accepted in queries
+    ATTRIBUTES = {
+        "type": ("type", "t"),
+        "tier": ("tier", "pvp"),
+        "egg": ("egg", "egggroup", "eg"),
+        "ability": ("ability", "a"),
+    }
+
+    def __init__(self):
+        self.ids = []  # bit position -> pokemon id
+        self.names = {}  # pokemon id -> name
+        self.positions = {}  # pokemon id -> bit position
+        self.bitsets = {attribute: {} for attribute in self.ATTRIBUTES}  # attribute -> value -> bits
+        self.value_names = {}  # attribute -> NameIndex over its values
+        self.obtainable = 0
+        self.aliases = {
+            alias: attribute for attribute, aliases in self.ATTRIBUTES.items() for alias in aliases
+        }
+
+    @classmethod
+    def build(cls, types_data, pvp_data, egg_groups_data, abilities_data, obtainable_data):
+        """Builds the index from the parsed datasets, keyed on their Pokémon `id` fields."""
+        index = cls()
+        members = {attribute: {} for attribute in cls.ATTRIBUTES}  # attribute -> value -> ids
+
+        # The first dataset to name an id wins, so types-data's form names are preferred
+        def collect(attribute, value, pokemon_list):
+            ids = members[attribute].setdefault(value, [])
+            for pokemon in pokemon_list:
+                index.names.setdefault(pokemon["id"], pokemon["name"])
+                ids.append(pokemon["id"])
+
+        for type_name, type_data in types_data.items():
+            collect("type", type_name, type_data["pokemon"])
+        for tier, pokemon_list in pvp_data.items():
+            collect("tier", tier, pokemon_list)
+        for group in egg_groups_data.values():
+            collect("egg", group["name"], group["pokemon_species"])
+        for ability in abilities_data.values():
+            collect("ability", ability["name"], ability["pokemon_with_ability"])
+
+        obtainable_ids = []
+        for pokemon in obtainable_data.get("true", ()):
+            index.names.setdefault(pokemon["id"], pokemon["name"])
+            obtainable_ids.append(pokemon["id"])
+
+        index.ids = sorted(index.names)
+        index.positions = {pokemon_id: position for position, pokemon_id in enumerate(index.ids)}
+        for attribute, values in members.items():
+            for value, ids in values.items():
+                index.bitsets[attribute][value] = index.bits(ids)
+            index.value_names[attribute] = NameIndex(list(values))
+        index.obtainable = index.bits(obtainable_ids)
+        return index
+
+    @property
+    def everything(self):
+        return (1 << len(self.ids)) - 1
+
+    def bits(self, ids):
+        """Returns the bitset with the bits of the given Pokémon ids set."""
+        bits = 0
+        for pokemon_id in ids:
+            bits |= 1 << self.positions[pokemon_id]
+        return bits
+
+    def pokemon(self, bits):
+        """Returns the (id, name) pairs of the Pokémon in a bitset, ordered by id."""
+        results = []
+        while bits:
+            lowest = bits & -bits
+            pokemon_id = self.ids[lowest.bit_length() - 1]
+            results.append((pokemon_id, self.names[pokemon_id]))
+            bits ^= lowest
+        return results
+
+    def parse(self, query):
+        """
+        Turns a query into a list of (attribute, values, negated) filters.
+
+        Terms are separated by spaces. Each is "attribute:value", with several
+        values separated by commas meaning any of them, or "obtainable" /
+        "unobtainable". A leading "-" or "!" excludes the matches instead.
+
+        Raises:
+        ValueError: With a message for the user, if a term can't be understood.
+        """
+        filters = []
+        for term in query.split():
+            negated = term[0] in "-!"
+            if negated:
+                term = term[1:]
+
+            if normalize(term) in ("obtainable", "unobtainable"):
+                filters.append(("obtainable", (), negated != (normalize(term) == "unobtainable")))
+                continue
+
+            key, _, raw_values = term.partition(":")
+            attribute = self.aliases.get(normalize(key))
+            if attribute is None or not raw_values:
+                raise ValueError(
+                    f"I don't understand '{term}'. Use type:, tier:, egg:, ability: or obtainable."
+                )
+
+            values = []
+            names = self.value_names[attribute]
+            for raw_value in raw_values.split(","):
+                value = names.resolve(raw_value)
+                if value is None:
+                    raise ValueError(f"Unknown {attribute} '{raw_value}'.{did_you_mean(names, raw_value)}")
+                values.append(value)
+            filters.append((attribute, tuple(values), negated))
+
+        if not filters:
+            raise ValueError("Give at least one filter, e.g. type:dragon tier:ou egg:monster")
+        return filters
+
+    def search(self, filters):
+        """Returns the bitset of the Pokémon matching every filter."""
+        bits = self.everything
+        for attribute, values, negated in filters:
+            if attribute == "obtainable":
+                matches = self.obtainable
+            else:
+                matches = 0
+                for value in values:
+                    matches |= self.bitsets[attribute][value]
+            bits &= ~matches if negated else matches
+        return bits & self.everything
@@ -0,0 +1,110 @@
+import gc
+import multiprocessing
+import signal
+import time
+from multiprocessing.connection import wait
+
+
+def shard_groups(shard_count, processes):
+    """
+    Splits the shard ids 0 to shard_count - 1 into one group per process.
+
+    Returns:
+    list: A list of shard ids for each process, e.g. [[0, 2], [1, 3]] for 4 shards in 2 processes.
+    """
+    return [list(range(index, shard_count, processes)) for index in range(processes)]
+
+
+class Supervisor:
+    """
+    Runs groups of shards in worker processes and restarts the ones that crash.
+
+    The workers are forked from this process after the data has been loaded,
+    so they all share the parsed datasets' memory pages copy-on-write instead
+    of each parsing data/*.json into its own copy. gc.freeze() moves those
+    objects out of the garbage collector's reach first, so collections in the
+    workers don't write to (and so copy) the shared pages.
+
+    A worker that exits with an error is restarted after a delay that doubles
+    with each crash in a row, up to `max_backoff` seconds. A worker that ran for
+    `stable_after` seconds before crashing starts over from the shortest delay.
+
+    Parameters:
+    target (callable): Run in each worker with its index and list of shard ids.
+    groups (list): The shard ids for each worker, see shard_groups().
+    max_backoff (float): The longest wait before restarting a worker.
+    stable_after (float): Seconds of uptime after which earlier crashes are forgotten.
+    """
+
+    def __init__(self, target, groups, max_backoff=300, stable_after=600):
+        self.target = target
+        self.groups = groups
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.context = multiprocessing.get_context("fork")
+        self.processes = {}  # worker index -> Process
+        self.started = {}  # worker index -> when it was started
+        self.crashes = {}  # worker index -> crashes in a row
+        self.restarts = {}  # worker index -> when to restart it
+        self.stopping = False
+
+    def worker(self, index):
+        # Signal handlers are inherited from the supervisor, put the defaults back
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        self.target(index, self.groups[index])
+
+    def start(self, index):
+        process = self.context.Process(target=self.worker, args=(index,), name=f"shards-{index}")
+        process.start()
+        self.processes[index] = process
+        self.started[index] = time.monotonic()
+        print(f"Started shards {self.groups[index]} in process {process.pid}")
+
+    def stop(self, *args):
+        """Stops every worker, as a signal handler or directly."""
+        self.stopping = True
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+    def run(self):
+        """Starts the workers and supervises them until stopped or until they all exit cleanly."""
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for index in range(len(self.groups)):
+            self.start(index)
+
+        while self.processes or self.restarts:
+            # Sleep until a worker exits or a restart is due
+            timeout = None
+            if self.restarts:
+                timeout = max(min(self.restarts.values()) - time.monotonic(), 0)
+            wait([process.sentinel for process in self.processes.values()], timeout)
+
+            for index, process in list(self.processes.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                del self.processes[index]
+                if self.stopping or process.exitcode == 0:
+                    continue
+
+                uptime = time.monotonic() - self.started[index]
+                self.crashes[index] = 1 if uptime >= self.stable_after else self.crashes.get(index, 0) + 1
+                delay = min(2 ** (self.crashes[index] - 1), self.max_backoff)
+                print(
+                    f"Error: shards {self.groups[index]} exited with code {process.exitcode}, "
+                    f"restarting in {delay} s"
+                )
+                self.restarts[index] = time.monotonic() + delay
+
+            for index, when in list(self.restarts.items()):
+                if self.stopping:
+                    del self.restarts[index]
+                elif when <= time.monotonic():
+                    del self.restarts[index]
+                    self.start(index)
@@ -0,0 +1,184 @@
+import numpy as np
+
+
+# Stats in the order of the columns below, with the labels used in replies
+STATS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+STAT_LABELS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+HP, ATTACK, SPECIAL_ATTACK, SPEED = 0, 1, 3, 5
+
+MAX_IV = 31
+MAX_EV = 252
+MAX_TOTAL_EVS = 510
+# Only every 4th EV raises a stat, so these are the EV amounts worth trying
+EV_STEPS = np.arange(0, MAX_EV + 1, 4)
+
+
+class BaseStats:
+    """
+    The base stats of every Pokémon as one matrix, built once per data snapshot.
+
+    Row i holds the six base stats of `names[i]`, so the stats of any number
+    of Pokémon, natures and spreads can be calculated in one NumPy expression
+    instead of a Python loop per Pokémon and nature.
+    """
+
+    def __init__(self, names, ids, matrix):
+        self.names = names  # row -> pokemon name (the pokemon-data key)
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.ids = ids  # row -> pokemon id
+        self.matrix = matrix  # (pokemon, 6) base stats
+
+    @classmethod
+    def from_json(cls, pokemon_data):
+        names = sorted(pokemon_data, key=lambda name: pokemon_data[name]["id"])
+        matrix = np.zeros((len(names), len(STATS)), dtype=np.int64)
+        for row, name in enumerate(names):
+            for stat in pokemon_data[name]["stats"]:
+                if stat["stat_name"] in STATS:
+                    matrix[row, STATS.index(stat["stat_name"])] = stat["base_stat"]
+        ids = np.array([pokemon_data[name]["id"] for name in names], dtype=np.int64)
+        return cls(names, ids, matrix)
+
+    def select(self, pokemon_ids):
+        """Returns the rows of the Pokémon with the given ids, skipping ids without base stats."""
+        return np.flatnonzero(np.isin(self.ids, list(pokemon_ids)))
+
+
+class Natures:
+    """
+    The 25 natures as a (25, 6) matrix of stat multipliers in tenths (9, 10 or 11).
+
+    Keeping the multipliers as integers keeps the calculation exact: the game
+    rounds down after multiplying by 0.9 or 1.1, which floats don't always do
+    the same way.
+    """
+
+    def __init__(self, names, matrix):
+        self.names = names  # row -> nature name
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.matrix = matrix
+
+    @classmethod
+    def from_json(cls, natures_data):
+        natures = sorted(natures_data.values(), key=lambda nature: nature["id"])
+        matrix = np.full((len(natures), len(STATS)), 10, dtype=np.int64)
+        for row, nature in enumerate(natures):
+            # Neutral natures raise and lower nothing (or the same stat)
+            if nature["increased_stat"] and nature["increased_stat"] != nature["decreased_stat"]:
+                matrix[row, STATS.index(nature["increased_stat"])] = 11
+                matrix[row, STATS.index(nature["decreased_stat"])] = 9
+        return cls([nature["name"] for nature in natures], matrix)
+
+    def describe(self, row):
+        """Returns e.g. "Jolly (+Spe -SpA)" or "Hardy (neutral)"."""
+        multipliers = self.matrix[row]
+        if (multipliers == 10).all():
+            return f"{self.names[row].title()} (neutral)"
+        return (
+            f"{self.names[row].title()} "
+            f"(+{STAT_LABELS[int(np.argmax(multipliers))]} -{STAT_LABELS[int(np.argmin(multipliers))]})"
+        )
+
+
+def calculate_stat(base, level, iv, ev, multiplier):
+    """
+    Calculates a stat other than HP, element-wise over arrays that broadcast together.
+
+    Parameters:
+    base, iv, ev: Base stats, IVs and EVs.
+    level (int): The Pokémon's level.
+    multiplier: Nature multipliers in tenths, see Natures.
+
+    Returns:
+    numpy.ndarray: The stats.
+    """
+    return ((2 * base + iv + ev // 4) * level // 100 + 5) * multiplier // 10
+
+
+def calculate(base, level, ivs, evs, multipliers):
+    """
+    Calculates all six stats, over arrays whose last axis is the six stats.
+
+    For example a (6,) row of base stats with the (25, 6) nature matrix gives
+    the stats for every nature, and an (n, 1, 6) block of base stats gives them
+    for n Pokémon and every nature at once.
+
+    Returns:
+    numpy.ndarray: The stats, in the broadcast shape of the arguments.
+    """
+    base = np.asarray(base)
+    stats = calculate_stat(base, level, ivs, evs, multipliers)
+    hp = (2 * base[..., HP] + np.asarray(ivs)[..., HP] + np.asarray(evs)[..., HP] // 4) * level // 100 + level + 10
+    stats[..., HP] = np.where(base[..., HP] == 1, 1, hp)  # Shedinja always has 1 HP
+    return stats
+
+
+def speed_benchmark(base, level, ivs, natures, target):
+    """
+    Finds each Pokémon's best nature and the fewest Speed EVs that reach a Speed stat.
+
+    Every nature is tried with every useful amount of Speed EVs in one
+    batched calculation. Among the natures that reach the target, the best is
+    the one giving the highest attacking stat (Attack or Special Attack,
+    whichever base stat is higher, with 252 EVs), then the one needing the
+    fewest Speed EVs, then one lowering the other attacking stat.
+
+    Parameters:
+    base (numpy.ndarray): (n, 6) base stats.
+    level (int): The Pokémon's level.
+    ivs (numpy.ndarray): The six IVs.
+    natures (Natures): The natures to choose from.
+    target (int): The Speed stat to reach.
+
+    Returns:
+    tuple: Arrays of n items: the best nature's row, its Speed EVs, the
+        resulting Speed, and whether the target can be reached at all.
+    """
+    # (n, natures, EV steps) Speed stats
+    speed = calculate_stat(
+        base[:, None, None, SPEED],
+        level,
+        ivs[SPEED],
+        EV_STEPS[None, None, :],
+        natures.matrix[None, :, SPEED, None],
+    )
+    reached = speed >= target
+    reachable = reached.any(axis=2)  # (n, natures)
+    step = reached.argmax(axis=2)  # the first EV step reaching the target
+    evs = EV_STEPS[step]
+
+    # The attacking stat each Pokémon would put its other EVs into
+    attacking = np.where(base[:, ATTACK] >= base[:, SPECIAL_ATTACK], ATTACK, SPECIAL_ATTACK)
+    other = ATTACK + SPECIAL_ATTACK - attacking
+    attack = calculate_stat(
+        base[np.arange(len(base)), attacking][:, None],
+        level,
+        ivs[attacking][:, None],
+        min(MAX_EV, MAX_TOTAL_EVS - MAX_EV),
+        natures.matrix[:, attacking].T,
+    )
+    # Ranking: higher attacking stat, then fewer Speed EVs, then lowering the unused attacking stat
+    score = attack * 10000 + (MAX_EV - evs) * 10 + (11 - natures.matrix[:, other].T)
+    score = np.where(reachable, score, -1)
+    best = score.argmax(axis=1)
+
+    rows = np.arange(len(base))
+    return best, evs[rows, best], speed[rows, best, step[rows, best]], reachable[rows, best]
+
+
+def parse_spread(value, maximum, total=None):
+    """
+    Parses IVs or EVs written as six numbers separated by slashes, or one number for all six.
+
+    Raises:
+    ValueError: If the spread isn't six numbers (or one) within the limits.
+    """
+    parts = value.split("/")
+    if len(parts) not in (1, len(STATS)) or not all(part.isdigit() for part in parts):
+        raise ValueError(f"'{value}' should be six numbers like 31/31/31/31/31/31.")
+    spread = np.array([int(part) for part in parts] * (len(STATS) if len(parts) == 1 else 1), dtype=np.int64)
+    if spread.max() > maximum:
+        raise ValueError(f"'{value}' has a value above {maximum}.")
+    if total is not None and spread.sum() > total:
+        raise ValueError(f"'{value}' adds up to more than {total}.")
+    return spread
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+from stubs import ROOT, import_bot  # noqa: E402
+
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def run(tmp_path_factory):
+    """
+    The bot module, imported once with the repository's data and without touching Discord.
+
+    Replies aren't paced, so tests don't wait on the outbox's rate limits.
+    """
+    files = tmp_path_factory.mktemp("bot")
+    return import_bot(
+        None,
+        subscriptions_file=str(files / "subscriptions.json"),
+        popularity_file="",
+        data_snapshot="",
+        channel_send_rate=1000000,
+        global_send_rate=1000000,
+    )
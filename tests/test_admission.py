@@ -0,0 +1,30 @@
+import asyncio
+
+import discord
+import pytest
+from stubs import StubContext, invoke
+
+
+def test_help_does_not_take_tokens(run):
+    ctx = StubContext()
+    ctx.bot = run.bot
+    ctx.permissions = discord.Permissions.none()
+    help_command = run.bot.help_command.copy()
+    help_command.context = ctx
+    # !help checks every command the way filter_commands does when it lists them
+    asyncio.run(help_command.filter_commands(run.bot.commands))
+
+    guild_id = ctx.guild.id
+    assert (guild_id, ctx.author.id) not in run.admission.buckets["user"]
+    assert ctx.channel.id not in run.admission.buckets["channel"]
+    assert guild_id not in run.admission.buckets["guild"]
+
+
+def test_invoked_commands_take_tokens(run):
+    ctx = StubContext()
+    tokens, _ = run.admission.limits["user"]
+    for _ in range(tokens):
+        asyncio.run(invoke(run.bot, "time", ctx=ctx))
+    with pytest.raises(run.Throttled) as rejected:
+        asyncio.run(invoke(run.bot, "time", ctx=ctx))
+    assert rejected.value.scope == "user"
@@ -0,0 +1,76 @@
+import pytest
+import responses
+from datastore import Snapshot
+
+
+TYPES_DATA = {
+    "dragon": {"pokemon": [{"name": "garchomp", "id": 445}], "moves": [{"name": "outrage"}]},
+    "ground": {"pokemon": [{"name": "garchomp", "id": 445}], "moves": [{"name": "earthquake"}]},
+    "steel": {"pokemon": [{"name": "skarmory", "id": 227}], "moves": []},
+    "flying": {"pokemon": [{"name": "skarmory", "id": 227}], "moves": []},
+    "ghost": {"pokemon": [{"name": "gengar", "id": 94}], "moves": []},
+    "poison": {"pokemon": [{"name": "gengar", "id": 94}], "moves": []},
+    "grass": {"pokemon": [{"name": "abomasnow", "id": 460}], "moves": []},
+    "ice": {"pokemon": [{"name": "abomasnow", "id": 460}], "moves": []},
+    "fire": {"pokemon": [], "moves": [{"name": "fire-fang"}]},
+    "rock": {"pokemon": [], "moves": [{"name": "stone-edge"}]},
+    "normal": {"pokemon": [], "moves": [{"name": "swords-dance"}]},
+}
+POKEMON_DATA = {
+    "garchomp": {
+        "name": "garchomp",
+        "id": 445,
+        "moves": [
+            {"name": name, "level": 1, "type": "level"}
+            for name in ("earthquake", "outrage", "fire-fang", "stone-edge", "swords-dance")
+        ],
+    },
+}
+MOVES_DATA = {
+    "fire-fang": {"damage_class": "physical", "power": 65},
+    "stone-edge": {"damage_class": "physical", "power": 100},
+    "swords-dance": {"damage_class": "status", "power": None},
+}
+
+
+@pytest.fixture
+def snapshot():
+    return Snapshot({"types-data": TYPES_DATA, "pokemon-data": POKEMON_DATA, "moves-data": MOVES_DATA}, {}, 1)
+
+
+def fields(pages):
+    return {field.name: field.value for field in pages[0]["embed"].fields}
+
+
+def test_moveset_coverage_and_best_additions(snapshot):
+    result = fields(responses.render_coverage(snapshot, "garchomp earthquake outrage"))
+    # Ground and Dragon hit Garchomp and Gengar super effectively, Abomasnow neutrally, and Skarmory resists both
+    assert result["Against every Pokémon"] == (
+        "Super effective against 2 of 4, neutral against 1, resisted by 1 and no effect on 0.\nWalled by: Skarmory"
+    )
+    assert result["Best moves to add"].splitlines() == [
+        "**Fire-Fang** (Fire, 65 power): +1 not resisted, +2 super effective",
+        "**Stone-Edge** (Rock, 100 power): +1 not resisted, +1 super effective",
+    ]
+
+
+def test_moveset_coverage_without_learnset_data(snapshot):
+    del snapshot.datasets["moves-data"]
+    result = fields(responses.render_coverage(snapshot, "garchomp earthquake"))
+    assert "Against every Pokémon" in result
+    assert result["Best moves to add"] == "Learnset data isn't available: the data folder has no moves-data.json."
+
+
+def test_coverage_without_types_data():
+    with pytest.raises(responses.NotFound, match="the data folder has no types-data.json"):
+        responses.render_coverage(Snapshot({}, {}, 1), "garchomp")
+
+
+def test_join_names_counts_the_names_left_out():
+    names = [f"Pokemon{index:02d}" for index in range(20)]
+    assert responses.join_names(names[:3], 100) == "Pokemon00, Pokemon01, Pokemon02"
+    listed = responses.join_names(names, 100)
+    assert len(listed) <= 100
+    kept, _, more = listed.partition(" and ")
+    assert more == f"{20 - len(kept.split(', '))} more"
+    assert kept.split(", ") == names[:len(kept.split(", "))]
@@ -0,0 +1,30 @@
+import json
+import os
+
+import pytest
+from datastore import DataStore
+
+
+def write(path, data):
+    with open(path, "w") as file:
+        json.dump(data, file)
+    # A later modification time, however coarse the filesystem's clock
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_reload_keeps_the_snapshot_when_a_file_is_malformed(tmp_path):
+    path = tmp_path / "natures-data.json"
+    write(path, {"hardy": {"id": 1, "name": "hardy"}})
+    store = DataStore(str(tmp_path))
+    snapshot = store.snapshot
+
+    write(path, {"hardy": {"id": "1", "name": "hardy"}, "bold": {"name": "bold"}})
+    with pytest.raises(ValueError, match="natures-data.json doesn't match its schema"):
+        store.reload()
+    assert store.snapshot is snapshot
+    assert store.get("natures-data") == {"hardy": {"id": 1, "name": "hardy"}}
+
+    write(path, {"hardy": {"id": 1, "name": "hardy"}, "bold": {"id": 2, "name": "bold"}})
+    assert store.reload() == ["natures-data"]
+    assert store.version == snapshot.version + 1
@@ -0,0 +1,10 @@
+import responses
+
+
+def test_long_queries_stay_out_of_the_title(run):
+    snapshot = run.store.snapshot
+    query = "type:" + ",".join(list(snapshot.get("types-data")) * 3)
+    assert len(query) > 256
+    embed = responses.render_find(snapshot, query)[0]["embed"]
+    assert len(embed.title) <= 256
+    assert embed.description == query
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from gameclock import Condition, next_phase_window, next_window, season
+
+NIGHT = frozenset({"Night"})
+# Midnight between January (Spring) and February (Summer)
+BOUNDARY = datetime(2024, 2, 1)
+
+
+def night_across(boundary):
+    """Returns a time at night whose night runs past `boundary`, and that night's window."""
+    # A game day lasts 6 real hours, so one of its nights ends within 6 hours after the boundary
+    now = boundary - timedelta(hours=6)
+    while now < boundary:
+        start, end = next_phase_window(NIGHT, now)
+        if start <= now < boundary < end:
+            return now, (start, end)
+        now += timedelta(minutes=1)
+    raise AssertionError(f"no night runs past {boundary}")
+
+
+def test_phase_window_runs_past_the_month_boundary():
+    now, window = night_across(BOUNDARY)
+    assert next_window(Condition(NIGHT, None), now) == window
+
+
+def test_phase_window_runs_into_a_month_of_another_allowed_season():
+    now, window = night_across(BOUNDARY)
+    assert next_window(Condition(NIGHT, frozenset({season(now), season(BOUNDARY)})), now) == window
+
+
+def test_phase_window_ends_with_its_season():
+    now, (start, _) = night_across(BOUNDARY)
+    assert next_window(Condition(NIGHT, frozenset({season(now)})), now) == (start, BOUNDARY)
+
+
+def test_season_window_runs_through_the_months_of_every_allowed_season():
+    # January is Spring, February Summer and March Autumn
+    now = datetime(2024, 1, 15)
+    assert next_window(Condition(None, frozenset({"Spring", "Summer"})), now) == (now, datetime(2024, 3, 1))
@@ -0,0 +1,28 @@
+import pytest
+import responses
+
+
+@pytest.mark.parametrize(
+    "renderer, dataset",
+    [
+        (responses.render_types, "types-data"),
+        (responses.render_tiers, "pvp-data"),
+        (responses.render_egggroup, "egg-groups-data"),
+    ],
+)
+def test_every_page_fits_an_embed_field(run, renderer, dataset):
+    snapshot = run.store.snapshot
+    for name in responses.name_index(snapshot, dataset).keys:
+        pages = renderer(snapshot, name)
+        for index in range(len(pages)):
+            for field in pages[index]["embed"].fields:
+                assert 0 < len(field.value) <= responses.FIELD_LIMIT, (name, index, field.name)
+
+
+def test_long_tiers_are_split_across_pages(run):
+    pages = responses.render_tiers(run.store.snapshot, "UN")
+    names = [
+        name for index in range(len(pages)) for name in pages[index]["embed"].fields[0].value.split(", ")
+    ]
+    assert len(pages) > 1
+    assert len(names) == len(run.store.snapshot.get("pvp-data")["UN"])
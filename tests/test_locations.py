@@ -0,0 +1,78 @@
+import pytest
+import responses
+from datastore import Snapshot
+from encounters import EncounterTable
+
+
+def encounter(**overrides):
+    return {
+        "pokemon": "pidgey",
+        "pokemon_id": 16,
+        "region_name": "Kanto",
+        "type": "Grass",
+        "rarity": "Uncommon",
+        "min_level": 5,
+        "max_level": 7,
+        **overrides,
+    }
+
+
+def test_every_locations_page_fits_an_embed_field(run):
+    snapshot = run.store.snapshot
+    for name in snapshot.get("location-data").pokemon_ids:
+        pages = responses.render_locations(snapshot, name)
+        for index in range(len(pages)):
+            for field in pages[index]["embed"].fields:
+                assert len(field.value) <= responses.FIELD_LIMIT, (name, index)
+
+
+def test_repeated_encounters_are_listed_once():
+    location_data = {
+        "KANTO_VIRIDIAN_FOREST": {
+            "name": "VIRIDIAN FOREST",
+            "encounters": [encounter(), encounter(), encounter(rarity="Rare")],
+        },
+    }
+    snapshot = Snapshot({"location-data": EncounterTable.from_json(location_data)}, {}, 1)
+    pages = responses.render_locations(snapshot, "pidgey")
+    assert pages[0]["embed"].fields[0].value.splitlines() == [
+        "Viridian Forest, Kanto (Lvl 5-7, Grass, Uncommon)",
+        "Viridian Forest, Kanto (Lvl 5-7, Grass, Rare)",
+    ]
+
+
+def test_every_where_page_fits_an_embed_field(run):
+    snapshot = run.store.snapshot
+    for name in snapshot.get("location-data").pokemon_ids:
+        try:
+            # Four months ahead, so the locations of every season are listed too
+            pages = responses.render_where(snapshot, f"{name} in:{4 * 31 * 24 * 60}")
+        except responses.NotFound:
+            continue
+        for index in range(len(pages)):
+            for field in pages[index]["embed"].fields:
+                assert len(field.value) <= responses.FIELD_LIMIT, (name, index)
+
+
+def test_where_needs_a_pokemon(run):
+    with pytest.raises(responses.NotFound, match="Give the name of a Pokémon"):
+        responses.render_where(run.store.snapshot, "in:5")
+
+
+def test_where_takes_multi_word_rarities():
+    location_data = {
+        "KANTO_VIRIDIAN_FOREST": {
+            "name": "VIRIDIAN FOREST",
+            "encounters": [encounter(rarity="Very Rare"), encounter(rarity="Very Common")],
+        },
+    }
+    snapshot = Snapshot({"location-data": EncounterTable.from_json(location_data)}, {}, 1)
+    for value in ("very-common", "veryCommon"):
+        pages = responses.render_where(snapshot, f"pidgey rarity:{value}")
+        assert pages[0]["embed"].fields[0].value.splitlines() == [
+            "Viridian Forest, Kanto (Lvl 5-7, Grass, Very Common): always"
+        ]
+    pages = responses.render_where(snapshot, "pidgey rarity:veryrare")
+    assert len(pages[0]["embed"].fields[0].value.splitlines()) == 2
+    with pytest.raises(responses.NotFound, match="very-rare, rare, uncommon, common, very-common"):
+        responses.render_where(snapshot, "pidgey rarity:frequent")
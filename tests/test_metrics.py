@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+from metrics import Metrics, RateLimitLogHandler
+
+URL = "https://discord.com/api/v10/channels/1/messages"
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def log():
+    """A stand-in for discord.http with the handler installed, and what its parent logger gets."""
+    parent = logging.getLogger("test_metrics")
+    parent.setLevel(logging.INFO)
+    parent.propagate = False
+    records = Records()
+    parent.addHandler(records)
+    metrics = Metrics()
+    handler = RateLimitLogHandler.install(metrics, "test_metrics.http")
+    yield logging.getLogger("test_metrics.http"), metrics, records.records
+    parent.removeHandler(records)
+    logging.getLogger("test_metrics.http").removeHandler(handler)
+
+
+def rate_limited(logger, retry_after, is_global=False):
+    """Logs a 429 the way discord.py 2.3's HTTPClient.request does."""
+    fmt = "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds."
+    logger.warning(fmt, "POST", URL, retry_after)
+    logger.debug("Rate limit is being handled by bucket hash %s with %r major parameters", "abc", "channel_id=1")
+    if is_global:
+        logger.warning("Global rate limit has been hit. Retrying in %.2f seconds.", retry_after)
+    logger.debug("Done sleeping for the rate limit. Retrying...")
+    if is_global:
+        logger.debug("Global rate limit is now over.")
+
+
+def test_counts_each_429_once(log):
+    logger, metrics, _ = log
+    rate_limited(logger, 1.5)
+    rate_limited(logger, 0.25, is_global=True)
+    rate_limited(logger, 2.0)
+    assert metrics.counter("rate_limits_total", scope="route") == 2
+    assert metrics.counter("rate_limits_total", scope="global") == 1
+    assert metrics.counter("rate_limit_wait_seconds_total", scope="route") == 3.5
+    assert metrics.counter("rate_limit_wait_seconds_total", scope="global") == 0.25
+
+
+def test_counts_429s_too_long_to_wait_for(log):
+    logger, metrics, _ = log
+    logger.warning(
+        "We are being rate limited. %s %s responded with 429. Timeout of %.2f was too long, erroring instead.",
+        "POST", URL, 120.0,
+    )
+    assert metrics.counter("rate_limits_total", scope="route") == 1
+    assert metrics.counter("rate_limit_wait_seconds_total") == 0
+
+
+def test_counts_preemptive_waits(log):
+    logger, metrics, _ = log
+    logger.debug("A rate limit bucket (%s) has been exhausted. Pre-emptively rate limiting...", "abc")
+    assert metrics.counter("rate_limit_preemptive_total") == 1
+    assert metrics.counter("rate_limits_total") == 0
+
+
+def test_only_forwards_what_the_parent_would_log(log):
+    logger, _, forwarded = log
+    rate_limited(logger, 1.0, is_global=True)
+    assert [record.levelno for record in forwarded] == [logging.WARNING, logging.WARNING]
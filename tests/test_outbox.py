@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from outbound import Outbox
+from stubs import StubContext, invoke
+
+
+@pytest.mark.parametrize(
+    "command, args",
+    [("hello", ()), ("time", ()), ("commands", ()), ("subscribe", ("tide",)), ("unsubscribe", ()), ("metrics", ())],
+)
+def test_replies_go_through_the_outbox(run, monkeypatch, command, args):
+    queued = []
+    send = run.outbox.send
+
+    async def record(channel_id, *rest, **kwargs):
+        queued.append(channel_id)
+        return await send(channel_id, *rest, **kwargs)
+
+    monkeypatch.setattr(run.outbox, "send", record)
+    ctx = StubContext()
+    asyncio.run(invoke(run.bot, command, *args, ctx=ctx))
+    assert ctx.replies
+    assert queued == [ctx.channel.id] * len(ctx.replies)
+
+
+def test_global_bucket_bursts_less_than_its_rate():
+    bucket = Outbox(global_rate=45, global_burst=5).global_bucket
+    bucket.refill(bucket.updated + 60)
+    assert bucket.tokens == 5
+    assert bucket.fill_rate == 45
+
+
+def test_keeps_a_bounded_number_of_channel_buckets():
+    outbox = Outbox(channel_rate=1000000, global_rate=1000000, max_buckets=3)
+
+    async def send(**kwargs):
+        return kwargs
+
+    async def reply_in(channels):
+        for channel_id in channels:
+            await outbox.send(channel_id, 1, None, send, content="hi")
+
+    asyncio.run(reply_in([1, 2, 3, 1, 4]))
+    # Channel 2 is the least recently used
+    assert list(outbox.buckets) == [3, 1, 4]
+    assert not outbox.queues and not outbox.tasks
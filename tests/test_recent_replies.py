@@ -0,0 +1,28 @@
+import asyncio
+
+from cache import RecentReplies
+from stubs import StubChannel, StubContext, StubGuild, invoke
+
+
+def ask_twice(run, command, argument):
+    guild = StubGuild()
+    channel = StubChannel(guild=guild)
+    for _ in range(2):
+        asyncio.run(invoke(run.bot, command, argument, ctx=StubContext(guild=guild, channel=channel)))
+    return channel.sent
+
+
+def test_repeated_replies_link_to_the_earlier_one(run, monkeypatch):
+    monkeypatch.setattr(run, "DUPLICATE_REPLY_WINDOW", 60)
+    monkeypatch.setattr(run, "recent_replies", RecentReplies(60))
+    first, second = ask_twice(run, "types", "dragon")
+    assert second.content == f"Same answer as just above: {first.jump_url}"
+
+
+def test_repeated_paginated_replies_are_sent_in_full(run, monkeypatch):
+    monkeypatch.setattr(run, "DUPLICATE_REPLY_WINDOW", 60)
+    monkeypatch.setattr(run, "recent_replies", RecentReplies(60))
+    # Only the user who asked can flip the first reply's pages
+    first, second = ask_twice(run, "locations", "pidgey")
+    assert first.view is not None and second.view is not None
+    assert second.embed.title == first.embed.title
@@ -0,0 +1,14 @@
+import os
+
+from scheduler import EventScheduler
+
+
+async def announce(channel_id, content):
+    pass
+
+
+def test_subscriptions_are_saved_and_loaded(tmp_path):
+    path = str(tmp_path / "subscriptions.json")
+    EventScheduler(announce, path).subscribe(1, ["tide", "phase"])
+    assert os.listdir(tmp_path) == ["subscriptions.json"]
+    assert EventScheduler(announce, path).subscriptions == {1: {"tide", "phase"}}
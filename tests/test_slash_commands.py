@@ -0,0 +1,48 @@
+import asyncio
+
+from discord.ext import commands
+from stubs import StubContext, StubInteraction, invoke
+
+
+def test_app_command_descriptions_fit_discords_limit(run):
+    # Discord rejects the whole tree sync if any description is longer than 100 characters
+    for command in run.bot.tree.get_commands():
+        assert 1 <= len(command.description) <= 100, command.name
+        for parameter in command.parameters:
+            assert len(parameter.description) <= 100, f"{command.name} {parameter.name}"
+
+
+def test_slash_commands_are_deferred_before_rendering(run, monkeypatch):
+    ctx = StubContext()
+    ctx.interaction = StubInteraction()
+    deferred = []
+    render = run.render
+
+    async def checked_render(*args):
+        deferred.append(ctx.interaction.response.deferred)
+        return await render(*args)
+
+    monkeypatch.setattr(run, "render", checked_render)
+    asyncio.run(invoke(run.bot, "types", "dragon", ctx=ctx))
+    assert deferred == [True]
+    assert ctx.replies[-1].embed.title == "Pokémon Type: Dragon"
+
+
+def test_throttled_slash_commands_are_answered(run):
+    ctx = StubContext()
+    ctx.interaction = StubInteraction()
+    # Prefix commands are only told once, but slash commands must always get an answer
+    asyncio.run(run.report_command_error(ctx, run.Throttled("user", 2.0, notify=False)))
+    assert ctx.interaction.response.sent == [
+        ("You're sending commands too quickly. Try again in 2 s.", {"ephemeral": True})
+    ]
+    assert ctx.replies == []
+
+
+def test_slash_commands_outside_the_command_channel_are_answered(run):
+    ctx = StubContext()
+    ctx.interaction = StubInteraction()
+    asyncio.run(run.report_command_error(ctx, commands.CheckFailure()))
+    assert ctx.interaction.response.sent == [
+        (f"Please use my commands in <#{run.COMMAND_CHANNEL_ID}>.", {"ephemeral": True})
+    ]
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+import responses
+from datastore import Snapshot
+from stubs import ROOT
+
+
+def pokemon(name, pokemon_id, *base_stats):
+    names = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    return {
+        "name": name,
+        "id": pokemon_id,
+        "stats": [{"stat_name": stat, "base_stat": base} for stat, base in zip(names, base_stats)],
+    }
+
+
+@pytest.fixture
+def snapshot():
+    with open(os.path.join(ROOT, "data", "natures-data.json"), "r") as file:
+        natures = json.load(file)
+    pokemon_data = {
+        "garchomp": pokemon("garchomp", 445, 108, 130, 95, 80, 85, 102),
+        "gible": pokemon("gible", 443, 58, 70, 45, 40, 45, 42),
+    }
+    return Snapshot({"pokemon-data": pokemon_data, "natures-data": natures}, {}, 1)
+
+
+def embed(pages):
+    return pages[0]["embed"]
+
+
+def test_stats_per_nature(snapshot):
+    lines = embed(responses.render_stats(snapshot, "garchomp")).description.splitlines()
+    # Level 50, 31 IVs, no EVs
+    assert lines[3].split() == ["Hardy", "(neutral)", "183", "150", "115", "100", "105", "122"]
+    jolly = next(line for line in lines if line.startswith("Jolly"))
+    assert jolly.split()[-6:] == ["183", "150", "115", "90", "105", "134"]
+
+
+def test_speed_benchmark(snapshot):
+    result = embed(responses.render_stats(snapshot, "garchomp speed:gible"))
+    # Max Speed Gible at level 50 has 103 Speed, Garchomp already has 122 without Speed EVs
+    assert "outspeed max Speed Gible (103)" in result.title
+    assert result.description.splitlines()[2].split()[-2:] == ["0", "122"]
+
+
+def test_stats_without_its_data(snapshot):
+    del snapshot.datasets["pokemon-data"]
+    with pytest.raises(responses.NotFound) as error:
+        responses.render_stats(snapshot, "garchomp")
+    assert str(error.value) == "Stats data isn't available: the data folder has no pokemon-data.json."
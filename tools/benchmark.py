@@ -0,0 +1,182 @@
+"""
+Offline benchmark for the bot's command handlers.
+
+Drives the handlers in run.py with stub contexts (see tools/stubs.py) over
+representative query mixes, and reports per-command latency percentiles,
+memory allocated and the number of messages each query produced. No Discord
+token or connection is needed, so regressions can be caught before deploying.
+
+Usage:
+    python tools/benchmark.py [--mix all|species|moves|typos] [--limit N] [--cold] [--data-dir DIR]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stubs import StubContext, import_bot, invoke  # noqa: E402
+
+
+def typo(name, rng):
+    """Returns the name with one character dropped, doubled or swapped with its neighbour."""
+    if len(name) < 3:
+        return name
+    index = rng.randrange(1, len(name) - 1)
+    edit = rng.choice(("drop", "double", "swap"))
+    if edit == "drop":
+        return name[:index] + name[index + 1:]
+    if edit == "double":
+        return name[:index] + name[index] + name[index:]
+    return name[:index - 1] + name[index] + name[index - 1] + name[index + 1:]
+
+
+def build_mixes(run, rng):
+    """
+    Returns the query mixes, each a list of (command, argument) pairs.
+
+    Species and move names are taken from whichever datasets are loaded, so the
+    mixes work with the data that ships in data/ as well as a full data folder.
+    """
+    snapshot = run.store.snapshot
+    species = set()
+    for dataset in ("pokemon-data", "egg-moves-data"):
+        if dataset in snapshot.datasets:
+            species.update(snapshot.get(dataset))
+    if "location-data" in snapshot.datasets:
+        species.update(snapshot.get("location-data").pokemon_ids)
+    species = sorted(species)
+
+    moves = set()
+    if "moves-data" in snapshot.datasets:
+        moves.update(snapshot.get("moves-data"))
+    elif "types-data" in snapshot.datasets:
+        for type_data in snapshot.get("types-data").values():
+            moves.update(move["name"] for move in type_data["moves"])
+    moves = sorted(moves)
+
+    species_mix = [
+        (command, name)
+        for name in species
+        for command in ("pokemon", "eggmoves", "locations", "learnmoves")
+    ]
+    moves_mix = [("move", name) for name in moves]
+    other_mix = (
+        [("ability", name) for name in sorted(snapshot.datasets.get("abilities-data", ()))]
+        + [("types", name) for name in sorted(snapshot.datasets.get("types-data", ()))]
+        + [("tiers", name) for name in sorted(snapshot.datasets.get("pvp-data", ()))]
+    )
+    typos_mix = [(command, typo(name, rng)) for command, name in species_mix + moves_mix]
+    rng.shuffle(typos_mix)
+
+    return {
+        "species": species_mix,
+        "moves": moves_mix,
+        "typos": typos_mix,
+        "all": species_mix + moves_mix + other_mix + typos_mix,
+    }
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run_mix(run, queries, cold):
+    """
+    Runs each query once and collects its latency, allocations and message count.
+
+    Returns:
+    dict: Command name mapped to lists of latencies (s), allocated bytes and message counts.
+    """
+    results = {}
+    for command, argument in queries:
+        if cold:
+            run.render_cache.clear()
+
+        ctx = StubContext()
+        gc.collect()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        await invoke(run.bot, command, argument, ctx=ctx)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+
+        result = results.setdefault(command, {"latency": [], "allocated": [], "messages": []})
+        result["latency"].append(elapsed)
+        result["allocated"].append(max(peak - before, 0))
+        result["messages"].append(len(ctx.replies))
+    return results
+
+
+def report(mix_name, results):
+    print(f"\nMix: {mix_name}")
+    print(
+        f"{'Command':<12}{'Runs':>6}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'KiB/run':>9}{'msgs/run':>9}{'max msgs':>9}"
+    )
+    for command, result in sorted(results.items()):
+        latency = [value * 1000 for value in result["latency"]]
+        runs = len(latency)
+        print(
+            f"{command:<12}{runs:>6}"
+            f"{percentile(latency, 0.5):>9.2f}{percentile(latency, 0.9):>9.2f}"
+            f"{percentile(latency, 0.99):>9.2f}{max(latency):>9.2f}"
+            f"{sum(result['allocated']) / runs / 1024:>9.1f}"
+            f"{sum(result['messages']) / runs:>9.2f}{max(result['messages']):>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot's command handlers offline.")
+    parser.add_argument("--mix", default="all", choices=("all", "species", "moves", "typos"))
+    parser.add_argument("--limit", type=int, default=0, help="Only run the first N queries of the mix.")
+    parser.add_argument("--cold", action="store_true", help="Clear the render cache before every query.")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the mix this many times (warms the cache).")
+    parser.add_argument("--data-dir", help="Data folder to load instead of data/.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Send replies unpaced, so the latencies are the handlers' own and not the outbox's rate limits
+    run = import_bot(args.data_dir, channel_send_rate=1000000, global_send_rate=1000000)
+    print(f"Loaded data in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    queries = build_mixes(run, random.Random(args.seed))[args.mix]
+    if args.limit:
+        queries = queries[: args.limit]
+
+    async def benchmark():
+        tracemalloc.start()
+        results = {}
+        for _ in range(args.repeat):
+            for command, result in (await run_mix(run, queries, args.cold)).items():
+                merged = results.setdefault(command, {"latency": [], "allocated": [], "messages": []})
+                for key, values in result.items():
+                    merged[key].extend(values)
+        tracemalloc.stop()
+        return results
+
+    # Handlers print their errors (e.g. a dataset missing from data/), keep the report readable
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        results = asyncio.run(benchmark())
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    report(args.mix, results)
+    cache = run.render_cache
+    print(f"\nRender cache: {cache.hits} hits, {cache.misses} misses, {len(cache)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Validates the data files and builds the snapshot the bot loads at startup.
+
+Every data/*.json file is checked against the schema in schema.py, and the
+Pokémon ids and names the datasets refer to each other by are cross-checked.
+The datasets are then parsed the same way the bot does, their name indexes,
+search bitsets, breeding graph and stat and type tables are built, and all of
+it is written to one versioned pickle file. On startup the bot loads that file instead of parsing
+the JSON, and falls back to parsing any file that changed since the snapshot
+was built.
+
+Run it again after updating the data folder, on the machine the bot runs on
+(the snapshot records the files' modification times).
+
+Usage:
+    python tools/build_snapshot.py [--data-dir DIR] [--output FILE] [--strict]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stubs import ROOT, import_bot  # noqa: E402
+
+sys.path.insert(0, ROOT)
+from datastore import SNAPSHOT_FORMAT  # noqa: E402
+from names import normalize  # noqa: E402
+from schema import SCHEMAS, validate  # noqa: E402
+
+
+# Where each dataset lists the Pokémon it refers to, as (name, id) pairs
+REFERENCES = {
+    "abilities-data": lambda data: (p for a in data.values() for p in a["pokemon_with_ability"]),
+    "egg-groups-data": lambda data: (p for g in data.values() for p in g["pokemon_species"]),
+    "gender-rates": lambda data: (p for r in data.values() for p in r["pokemon_list"]),
+    "obtainable-data": lambda data: (p for pokemon in data.values() for p in pokemon),
+    "pvp-data": lambda data: (p for pokemon in data.values() for p in pokemon),
+    "types-data": lambda data: (p for t in data.values() for p in t["pokemon"]),
+}
+
+
+def check_schemas(data_dir):
+    """
+    Parses every JSON file in the data folder and validates it against its schema.
+
+    Returns:
+    tuple: The parsed datasets by name, and the list of error messages.
+    """
+    datasets, errors = {}, []
+    for entry in sorted(os.listdir(data_dir)):
+        if not entry.endswith(".json"):
+            continue
+        name = entry[:-5]
+        try:
+            with open(os.path.join(data_dir, entry), "r") as file:
+                datasets[name] = json.load(file)
+        except ValueError as e:
+            errors.append(f"{entry}: invalid JSON: {e}")
+            continue
+
+        if name not in SCHEMAS:
+            print(f"  {entry}: no schema, not validated")
+            continue
+        errors.extend(f"{entry}{message}" for message in validate(datasets[name], SCHEMAS[name]))
+    return datasets, errors
+
+
+def check_references(datasets):
+    """
+    Checks that every Pokémon id the datasets refer to means the same Pokémon everywhere.
+
+    Form names (e.g. "wormadam-plant") may share an id with their species
+    ("wormadam"). When pokemon-data.json is present, every id must also be in it.
+
+    Returns:
+    list: Warning messages.
+    """
+    warnings = []
+    names = {}  # pokemon id -> normalized name first seen for it
+    known_ids = None
+    if "pokemon-data" in datasets:
+        known_ids = {pokemon["id"] for pokemon in datasets["pokemon-data"].values()}
+
+    for dataset, references in REFERENCES.items():
+        if dataset not in datasets:
+            continue
+        for pokemon in references(datasets[dataset]):
+            name = normalize(pokemon["name"])
+            seen = names.setdefault(pokemon["id"], name)
+            if not (seen.startswith(name) or name.startswith(seen)):
+                warnings.append(f"{dataset}: id {pokemon['id']} is {name}, elsewhere {seen}")
+            if known_ids is not None and pokemon["id"] not in known_ids:
+                warnings.append(f"{dataset}: {name} (id {pokemon['id']}) is not in pokemon-data")
+
+    if "location-data" in datasets:
+        for location in datasets["location-data"].values():
+            for encounter in location["encounters"]:
+                seen = names.get(encounter["pokemon_id"])
+                name = normalize(encounter["pokemon"])
+                if seen is not None and not (seen.startswith(name) or name.startswith(seen)):
+                    warnings.append(
+                        f"location-data: id {encounter['pokemon_id']} is {name}, elsewhere {seen}"
+                    )
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the data files and build the startup snapshot.")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "data"))
+    parser.add_argument("--output", help="Snapshot file to write (default: <data-dir>/snapshot.pickle).")
+    parser.add_argument("--strict", action="store_true", help="Fail on cross-reference warnings too.")
+    args = parser.parse_args()
+    data_dir = os.path.abspath(args.data_dir)
+    output = os.path.abspath(args.output or os.path.join(data_dir, "snapshot.pickle"))
+
+    print(f"Validating {data_dir}")
+    datasets, errors = check_schemas(data_dir)
+    warnings = check_references(datasets)
+    for message in errors:
+        print(f"  Error: {message}")
+    for message in warnings[:50]:
+        print(f"  Warning: {message}")
+    if len(warnings) > 50:
+        print(f"  ... and {len(warnings) - 50} more warnings")
+    if errors or (args.strict and warnings):
+        sys.exit(1)
+    del datasets
+
+    # Parse the data exactly as the bot does, without an existing snapshot
+    started = time.perf_counter()
+    run = import_bot(data_dir, data_snapshot="")
+    store = run.store
+    snapshot = store.snapshot
+    run.build_name_indexes(snapshot)
+    for dataset, build in (
+        (("types-data", "pvp-data", "egg-groups-data", "abilities-data", "obtainable-data"),
+         run.responses.search_index),
+        (("egg-moves-data", "egg-groups-data", "gender-rates"), run.responses.breeding_graph),
+        (("pokemon-data", "natures-data"), run.responses.stat_tables),
+        (("types-data",), run.responses.type_table),
+    ):
+        if all(name in snapshot.datasets for name in dataset):
+            build(snapshot)
+    print(f"Parsed {len(snapshot.datasets)} datasets from JSON in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    store.write_snapshot(output)
+    print(f"Wrote {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MB, format {SNAPSHOT_FORMAT})")
+
+    # Load it back the way the bot will, to report the startup time
+    started = time.perf_counter()
+    loaded = run.DataStore(
+        data_dir, loaders=store.loaders, skip=store.skip, snapshot_path=output
+    )
+    print(
+        f"Loads in {(time.perf_counter() - started) * 1000:.0f} ms "
+        f"({len(loaded.from_snapshot)} datasets from the snapshot, {len(loaded.parsed)} parsed from JSON)"
+    )
+
+
+if __name__ == "__main__":
+    main()
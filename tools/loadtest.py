@@ -0,0 +1,333 @@
+"""
+Load test for the bot's command handlers against a local stand-in for Discord.
+
+Commands arrive at a fixed rate from many simulated guilds, channels and
+users, the way the gateway would deliver them, and run through the same
+handlers, render cache, worker pool and outbox as in production. Replies go
+to a fake REST API that adds latency and enforces Discord-like rate limits
+(5 messages per 5 seconds per channel, 50 requests per second overall),
+waiting on them or answering with simulated 429s the way discord.py
+experiences them. No Discord token or connection is needed.
+
+Reports throughput, latency percentiles from arrival to the last reply,
+event loop lag, 429s and memory growth.
+
+Usage:
+    python tools/loadtest.py [--rate 500] [--duration 10] [--guilds 50]
+        [--mix p=30,eggmoves=15,locations=15,m=25,time=15] [--throttle]
+        [--set global_send_rate=100] [--data-dir DIR]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark import build_mixes, percentile  # noqa: E402
+from stubs import ROOT, StubChannel, StubContext, StubGuild, StubUser, import_bot, invoke  # noqa: E402
+
+sys.path.insert(0, ROOT)
+from metrics import peak_memory_mb  # noqa: E402
+
+
+def resident_memory_mb():
+    """Returns the current resident memory in MB where /proc is available, otherwise the peak."""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_memory_mb()
+
+
+class Window:
+    """A Discord-style rate limit: `limit` requests per window of `seconds`, counted from the first."""
+
+    def __init__(self, limit, seconds):
+        self.limit = limit
+        self.seconds = seconds
+        self.reset = 0.0
+        self.used = 0
+
+    def take(self, now):
+        """Counts a request, or returns the seconds until the window resets if it's used up."""
+        if now >= self.reset:
+            self.reset = now + self.seconds
+            self.used = 0
+        if self.used >= self.limit:
+            return self.reset - now
+        self.used += 1
+        return 0
+
+
+class FakeDiscord:
+    """
+    The guilds, channels and users commands come from, and the REST API replies go to.
+
+    Messages to a channel are sent one at a time, as discord.py does per rate
+    limit bucket, and count against the channel's limit (5 per 5 seconds) and
+    the global one (50 per second), then wait a random round-trip latency.
+    When the channel's limit is used up the request waits for it to reset
+    without a 429, as discord.py does from the rate limit headers. When the
+    global limit is used up the request gets a 429, logged to discord.http
+    the way discord.py logs it (so the bot's rate limit metrics count it).
+    Like discord.py, it then holds every request back on one shared event
+    until the limit resets, so only the request that got the 429 counts it.
+
+    Parameters:
+    guilds (int): How many guilds to simulate.
+    channels (int): Channels per guild.
+    users (int): Users per guild.
+    latency (float): Mean REST latency in seconds.
+    channel_rate (int): Messages per 5 seconds allowed per channel.
+    global_rate (int): Requests per second allowed overall.
+    """
+
+    def __init__(self, guilds, channels, users, latency, channel_rate=5, global_rate=50, seed=0):
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.channel_rate = channel_rate
+        self.global_window = Window(global_rate, 1.0)
+        self.global_over = None  # asyncio.Event, set unless a global 429 is being waited out
+        self.windows = {}  # channel id -> Window
+        self.locks = {}  # channel id -> asyncio.Lock
+        self.log = logging.getLogger("discord.http")
+        self.sent = 0
+        self.rate_limited = 0
+        self.bucket_waits = 0
+
+        self.guilds = []
+        for _ in range(guilds):
+            guild = StubGuild()
+            self.guilds.append(
+                (
+                    guild,
+                    [StubChannel(guild=guild, send_hook=self.send) for _ in range(channels)],
+                    [StubUser() for _ in range(users)],
+                )
+            )
+
+    async def send(self, channel, kwargs):
+        """The send_hook of every channel."""
+        window = self.windows.setdefault(channel.id, Window(self.channel_rate, 5.0))
+        async with self.locks.setdefault(channel.id, asyncio.Lock()):
+            wait = window.take(time.monotonic())
+            if wait:
+                self.bucket_waits += 1
+                await asyncio.sleep(wait)
+                window.take(time.monotonic())
+
+            if self.global_over is None:
+                self.global_over = asyncio.Event()
+                self.global_over.set()
+            while True:
+                # Woken requests check again, another one may have hit the next 429 first
+                while not self.global_over.is_set():
+                    await self.global_over.wait()
+                retry_after = self.global_window.take(time.monotonic())
+                if not retry_after:
+                    break
+                self.rate_limited += 1
+                self.log.warning(
+                    "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.",
+                    "POST", f"/channels/{channel.id}/messages", retry_after,
+                )
+                self.log.warning("Global rate limit has been hit. Retrying in %.2f seconds.", retry_after)
+                self.global_over.clear()
+                await asyncio.sleep(retry_after)
+                self.log.debug("Done sleeping for the rate limit. Retrying...")
+                self.global_over.set()
+
+            self.sent += 1
+            # Only the count matters, don't keep every message of the run in memory
+            channel.sent.clear()
+            await asyncio.sleep(self.rng.expovariate(1 / self.latency))
+
+    def context(self):
+        """Returns a context for a command from a random user in a random channel."""
+        guild, channels, users = self.rng.choice(self.guilds)
+        return StubContext(guild=guild, channel=self.rng.choice(channels), author=self.rng.choice(users))
+
+
+def parse_mix(text):
+    """Parses "p=30,eggmoves=15" into a list of (command, weight) pairs."""
+    mix = []
+    for part in text.split(","):
+        command, _, weight = part.partition("=")
+        mix.append((command.strip(), float(weight or 1)))
+    return mix
+
+
+async def measure_lag(lags, interval=0.01):
+    """Records how late the event loop wakes a task that sleeps for `interval` seconds."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def load_test(run, discord, commands, weights, arguments, rate, duration):
+    """
+    Sends `rate` commands per second for `duration` seconds, then waits for every reply.
+
+    Returns:
+    dict: Per-command latencies, the outcome counts, loop lags and elapsed time.
+    """
+    rng = discord.rng
+    latencies = {}
+    outcomes = {"ok": 0, "throttled": 0, "error": 0}
+    lags = []
+    lag_task = asyncio.create_task(measure_lag(lags))
+
+    async def one(command, argument):
+        started = time.perf_counter()
+        ctx = discord.context()
+        ctx.command = run.bot.get_command(command)
+        try:
+            args = (argument,) if argument is not None else ()
+            await invoke(run.bot, command, *args, ctx=ctx)
+        except run.Throttled:
+            outcomes["throttled"] += 1
+            return
+        except Exception:
+            outcomes["error"] += 1
+            return
+        outcomes["ok"] += 1
+        latencies.setdefault(ctx.command.name, []).append(time.perf_counter() - started)
+
+    tasks = []
+    started = time.perf_counter()
+    count = int(rate * duration)
+    for index in range(count):
+        # Open loop: commands arrive on schedule whether or not earlier ones finished
+        delay = started + index / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        command = rng.choices(commands, weights)[0]
+        argument = rng.choice(arguments[command]) if arguments.get(command) else None
+        tasks.append(asyncio.create_task(one(command, argument)))
+    offered = time.perf_counter() - started
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    lag_task.cancel()
+    return {"latencies": latencies, "outcomes": outcomes, "lags": lags, "offered": offered, "elapsed": elapsed}
+
+
+def report(run, discord, results, memory_before, memory_after):
+    outcomes = results["outcomes"]
+    completed = sum(outcomes.values())
+    print(
+        f"\n{completed} commands in {results['elapsed']:.1f} s ({completed / results['elapsed']:.0f}/s, "
+        f"offered over {results['offered']:.1f} s): {outcomes['ok']} answered, "
+        f"{outcomes['throttled']} throttled, {outcomes['error']} failed"
+    )
+    print(f"{'Command':<12}{'Runs':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    every = []
+    for command, latencies in sorted(results["latencies"].items()):
+        latencies = [value * 1000 for value in latencies]
+        every.extend(latencies)
+        print(
+            f"{command:<12}{len(latencies):>7}{percentile(latencies, 0.5):>9.1f}"
+            f"{percentile(latencies, 0.99):>9.1f}{max(latencies):>9.1f}"
+        )
+    if every:
+        print(
+            f"{'all':<12}{len(every):>7}{percentile(every, 0.5):>9.1f}"
+            f"{percentile(every, 0.99):>9.1f}{max(every):>9.1f}"
+        )
+
+    lags = [value * 1000 for value in results["lags"]]
+    print(
+        f"\nEvent loop lag: p50 {percentile(lags, 0.5):.1f} ms, p99 {percentile(lags, 0.99):.1f} ms, "
+        f"max {max(lags, default=0):.1f} ms"
+    )
+    print(
+        f"Messages sent: {discord.sent}, global 429s: {discord.rate_limited} "
+        f"({run.metrics.counter('rate_limits_total', scope='global'):.0f} counted by the bot), "
+        f"waits for a channel's limit: {discord.bucket_waits}, merged in the outbox: {run.outbox.merged}"
+    )
+    cache = run.render_cache
+    print(f"Render cache: {cache.hits} hits, {cache.misses} misses, {run.in_flight.shared} coalesced")
+    if memory_before is not None and memory_after is not None:
+        print(f"Memory: {memory_before:.0f} MB before, {memory_after:.0f} MB after ({memory_after - memory_before:+.0f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the bot's handlers against a fake Discord.")
+    parser.add_argument("--rate", type=float, default=500, help="Commands per second.")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to send commands for.")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--channels", type=int, default=3, help="Channels per guild.")
+    parser.add_argument("--users", type=int, default=200, help="Users per guild.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean REST latency in seconds.")
+    parser.add_argument(
+        "--mix", default="p=30,eggmoves=15,locations=15,m=25,time=15",
+        help="Command weights, by command name or alias.",
+    )
+    parser.add_argument("--throttle", action="store_true", help="Apply the bot's per-user/channel/guild throttle.")
+    parser.add_argument(
+        "--set", action="append", default=[], metavar="KEY=VALUE",
+        help="A config.yml setting for the bot, e.g. global_send_rate=100. Can be repeated.",
+    )
+    parser.add_argument("--data-dir", help="Data folder to load instead of data/.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = {"popularity_file": ""}
+    for setting in args.set:
+        key, _, value = setting.partition("=")
+        settings[key] = yaml.safe_load(value)
+    run = import_bot(args.data_dir, **settings)
+    if not args.throttle:
+        # invoke() runs the before_invoke hook, where the throttle is applied
+        run.admission.limits = {}
+    mix = parse_mix(args.mix)
+    for command, _ in mix:
+        if run.bot.get_command(command) is None:
+            parser.error(f"unknown command {command}")
+
+    # Arguments per command, from the benchmark's species and move lists
+    queries = build_mixes(run, random.Random(args.seed))["all"]
+    arguments = {}
+    for command, argument in queries:
+        arguments.setdefault(command, []).append(argument)
+    arguments = {
+        command: arguments.get(run.bot.get_command(command).name, []) for command, _ in mix
+    }
+    for command, _ in mix:
+        if run.bot.get_command(command).clean_params and not arguments[command]:
+            parser.error(f"no arguments for {command} in this data folder")
+
+    discord = FakeDiscord(args.guilds, args.channels, args.users, args.latency, seed=args.seed)
+    print(
+        f"Sending {args.rate:.0f} commands/s for {args.duration:.0f} s from "
+        f"{args.guilds} guilds x {args.channels} channels x {args.users} users"
+    )
+
+    # Handlers print their errors (e.g. a dataset missing from data/), keep the report readable
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    memory_before = resident_memory_mb()
+    try:
+        results = asyncio.run(
+            load_test(
+                run, discord, [command for command, _ in mix], [weight for _, weight in mix],
+                arguments, args.rate, args.duration,
+            )
+        )
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    memory_after = resident_memory_mb()
+
+    report(run, discord, results, memory_before, memory_after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Stand-ins for the Discord objects the command handlers use, for running them offline.
+
+The handlers in run.py only touch a small part of commands.Context: reply(),
+message.reply(), author, channel and guild. These stubs provide just that and
+record every reply, so handlers can be driven without a bot token.
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ids = itertools.count(1)
+
+
+def import_bot(data_dir=None, **settings):
+    """
+    Imports run.py without connecting to Discord.
+
+    A throwaway config file is written and passed through BOT_CONFIG, so no real
+    token or config.yml is needed.
+
+    Parameters:
+    data_dir (str): Optional data folder to load instead of the repository's data/.
+    settings: Any other config.yml settings to use.
+
+    Returns:
+    module: The imported run module, with `bot`, `store` and the handlers.
+    """
+    settings = {"token": "offline", "command_channel_id": 0, **settings}
+    if data_dir:
+        settings["data_dir"] = os.path.abspath(data_dir)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yml", delete=False) as file:
+        for key, value in settings.items():
+            file.write(f"{key}: {value!r}\n")
+
+    os.environ["BOT_CONFIG"] = file.name
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    try:
+        import run
+    finally:
+        os.unlink(file.name)
+    return run
+
+
+class StubUser:
+    def __init__(self, user_id=None, name="Tester"):
+        self.id = user_id or next(_ids)
+        self.display_name = name
+        self.name = name
+        self.mention = f"<@{self.id}>"
+
+
+class StubGuild:
+    def __init__(self, guild_id=None):
+        self.id = guild_id or next(_ids)
+
+
+class StubChannel:
+    """
+    A text channel that records what is sent to it.
+
+    Parameters:
+    send_hook (coroutine function): Optional, awaited with the channel and the
+        send kwargs before each message is recorded. Used to simulate latency
+        and rate limits.
+    """
+
+    def __init__(self, channel_id=None, guild=None, send_hook=None):
+        self.id = channel_id or next(_ids)
+        self.guild = guild
+        self.sent = []
+        self.send_hook = send_hook
+
+    async def send(self, content=None, **kwargs):
+        if self.send_hook is not None:
+            await self.send_hook(self, kwargs)
+        message = StubMessage(self, content=content, **kwargs)
+        self.sent.append(message)
+        return message
+
+
+class StubMessage:
+    def __init__(self, channel, content=None, author=None, **kwargs):
+        self.id = next(_ids)
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.author = author
+        self.embed = kwargs.get("embed")
+        self.view = kwargs.get("view")
+        self.reference = kwargs.get("reference")
+        self.edits = []
+
+    @property
+    def jump_url(self):
+        guild_id = self.guild.id if self.guild else "@me"
+        return f"https://discord.com/channels/{guild_id}/{self.channel.id}/{self.id}"
+
+    async def reply(self, content=None, **kwargs):
+        kwargs.pop("mention_author", None)
+        return await self.channel.send(content, reference=self, **kwargs)
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+        return self
+
+
+class StubInteractionResponse:
+    """Records how a slash command's interaction was answered: deferred, or with a message."""
+
+    def __init__(self):
+        self.deferred = False
+        self.sent = []
+
+    def is_done(self):
+        return self.deferred or bool(self.sent)
+
+    async def defer(self, ephemeral=False):
+        self.deferred = True
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+class StubInteraction:
+    def __init__(self):
+        self.response = StubInteractionResponse()
+
+
+class StubContext:
+    """
+    Just enough of commands.Context to run the command handlers.
+
+    Every message the handler sends is recorded in `replies`. Contexts that
+    share a channel also share its list of sent messages.
+    """
+
+    def __init__(self, command=None, content="", author=None, channel=None, guild=None):
+        self.guild = guild if guild is not None else StubGuild()
+        self.channel = channel if channel is not None else StubChannel(guild=self.guild)
+        self.author = author if author is not None else StubUser()
+        self.message = StubMessage(self.channel, content=content, author=self.author)
+        self.command = command
+        self.command_failed = False
+        self.interaction = None
+
+    @property
+    def replies(self):
+        return self.channel.sent
+
+    async def reply(self, content=None, **kwargs):
+        return await self.message.reply(content, **kwargs)
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, ephemeral=False):
+        if self.interaction is not None:
+            await self.interaction.response.defer(ephemeral=ephemeral)
+
+
+async def invoke(bot, name, *args, ctx=None):
+    """
+    Runs a command's handler with before/after hooks, the way the bot would.
+
+    Checks such as in_command_channel are skipped. Arguments for a "rest of the
+    message" parameter (one declared after `*`) are joined with spaces, the way
+    discord.py passes them.
+
+    Returns:
+    StubContext: The context, with the replies that were sent.
+    """
+    command = bot.get_command(name)
+    ctx = ctx or StubContext()
+    ctx.command = command
+    if bot._before_invoke is not None:
+        await bot._before_invoke(ctx)
+    kwargs = {}
+    for position, (parameter, param) in enumerate(command.clean_params.items()):
+        if param.kind == param.KEYWORD_ONLY:
+            kwargs[parameter] = " ".join(args[position:])
+            args = args[:position]
+    try:
+        await command.callback(ctx, *args, **kwargs)
+    except Exception:
+        ctx.command_failed = True
+        raise
+    finally:
+        if bot._after_invoke is not None:
+            await bot._after_invoke(ctx)
+    return ctx
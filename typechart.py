@@ -0,0 +1,153 @@
+import numpy as np
+
+from names import NameIndex
+
+
+# The 17 types of PokeMMO (generation 5, no Fairy type), in the order of the matrix rows and columns
+TYPES = (
+    "normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel",
+)
+
+# Attacking type -> (super effective against, not very effective against, no effect on)
+CHART = {
+    "normal": ((), ("rock", "steel"), ("ghost",)),
+    "fire": (("grass", "ice", "bug", "steel"), ("fire", "water", "rock", "dragon"), ()),
+    "water": (("fire", "ground", "rock"), ("water", "grass", "dragon"), ()),
+    "electric": (("water", "flying"), ("electric", "grass", "dragon"), ("ground",)),
+    "grass": (
+        ("water", "ground", "rock"),
+        ("fire", "grass", "poison", "flying", "bug", "dragon", "steel"),
+        (),
+    ),
+    "ice": (("grass", "ground", "flying", "dragon"), ("fire", "water", "ice", "steel"), ()),
+    "fighting": (
+        ("normal", "ice", "rock", "dark", "steel"),
+        ("poison", "flying", "psychic", "bug"),
+        ("ghost",),
+    ),
+    "poison": (("grass",), ("poison", "ground", "rock", "ghost"), ("steel",)),
+    "ground": (("fire", "electric", "poison", "rock", "steel"), ("grass", "bug"), ("flying",)),
+    "flying": (("grass", "fighting", "bug"), ("electric", "rock", "steel"), ()),
+    "psychic": (("fighting", "poison"), ("psychic", "steel"), ("dark",)),
+    "bug": (
+        ("grass", "psychic", "dark"),
+        ("fire", "fighting", "poison", "flying", "ghost", "steel"),
+        (),
+    ),
+    "rock": (("fire", "ice", "flying", "bug"), ("fighting", "ground", "steel"), ()),
+    "ghost": (("psychic", "ghost"), ("dark", "steel"), ("normal",)),
+    "dragon": (("dragon",), ("steel",), ()),
+    "dark": (("psychic", "ghost"), ("fighting", "dark", "steel"), ()),
+    "steel": (("ice", "rock"), ("fire", "water", "electric", "steel"), ()),
+}
+
+
+def effectiveness_matrix():
+    """
+    Returns the type chart as a (17, 17) array of damage multipliers.
+
+    Rows are attacking types and columns defending types, both in TYPES order.
+    """
+    matrix = np.ones((len(TYPES), len(TYPES)))
+    for attacking, (strong, weak, immune) in CHART.items():
+        row = TYPES.index(attacking)
+        for multiplier, defending in ((2.0, strong), (0.5, weak), (0.0, immune)):
+            for name in defending:
+                matrix[row, TYPES.index(name)] = multiplier
+    return matrix
+
+
+EFFECTIVENESS = effectiveness_matrix()
+
+
+class TypeTable:
+    """
+    How every attacking type fares against every Pokémon, built once per data snapshot.
+
+    `defense` has a row per Pokémon and a column per attacking type, holding
+    the combined multiplier against the Pokémon's one or two types. The best
+    multiplier a set of moves gets against every Pokémon is then the maximum
+    over a few columns, and adding each candidate move to a moveset can be
+    scored for all candidates at once.
+    """
+
+    def __init__(self, names, ids, types, move_types):
+        self.names = names  # row -> pokemon name
+        self.ids = ids  # row -> pokemon id
+        self.types = types  # (pokemon, 2) type indexes, the second -1 for single-typed Pokémon
+        self.rows = {name: row for row, name in enumerate(names)}
+        self.move_types = move_types  # move name -> type index
+
+        # Single-typed Pokémon get a neutral second type
+        chart = np.hstack([EFFECTIVENESS, np.ones((len(TYPES), 1))])
+        self.defense = chart[:, types[:, 0]].T * chart[:, types[:, 1]].T
+        self.pokemon_names = NameIndex(names)
+        self.move_names = NameIndex(list(move_types))
+
+    @classmethod
+    def from_json(cls, types_data):
+        pokemon_types = {}  # (name, id) -> type indexes
+        move_types = {}
+        for type_name, type_data in types_data.items():
+            if type_name not in TYPES:
+                continue
+            for pokemon in type_data["pokemon"]:
+                pokemon_types.setdefault((pokemon["name"], pokemon["id"]), []).append(TYPES.index(type_name))
+            for move in type_data["moves"]:
+                move_types[move["name"]] = TYPES.index(type_name)
+
+        pokemon = sorted(pokemon_types, key=lambda key: (key[1], key[0]))
+        types = np.full((len(pokemon), 2), -1, dtype=np.int64)
+        for row, key in enumerate(pokemon):
+            types[row, : len(pokemon_types[key][:2])] = pokemon_types[key][:2]
+        ids = np.array([pokemon_id for _, pokemon_id in pokemon], dtype=np.int64)
+        return cls([name for name, _ in pokemon], ids, types, move_types)
+
+    def type_names(self, row):
+        return [TYPES[index] for index in self.types[row] if index >= 0]
+
+    def select(self, pokemon_ids):
+        """Returns the rows of the Pokémon with the given ids."""
+        return np.flatnonzero(np.isin(self.ids, list(pokemon_ids)))
+
+
+def best_multipliers(defense, attack_types):
+    """Returns the best multiplier any of the attacking types gets against each row of `defense`."""
+    if len(attack_types) == 0:
+        return np.zeros(len(defense))
+    return defense[:, list(attack_types)].max(axis=1)
+
+
+def team_weaknesses(defense):
+    """
+    Counts how many team members are weak to, resist and are immune to each attacking type.
+
+    Parameters:
+    defense (numpy.ndarray): The team members' rows of TypeTable.defense.
+
+    Returns:
+    tuple: Three arrays with a count per attacking type.
+    """
+    return (defense > 1).sum(axis=0), ((defense < 1) & (defense > 0)).sum(axis=0), (defense == 0).sum(axis=0)
+
+
+def rank_additions(defense, attack_types, candidate_types):
+    """
+    Scores adding each candidate move type to a moveset, for all candidates at once.
+
+    Parameters:
+    defense (numpy.ndarray): The target Pokémon's rows of TypeTable.defense.
+    attack_types (list): The type indexes of the moves already chosen.
+    candidate_types (numpy.ndarray): The type index of each candidate move.
+
+    Returns:
+    tuple: Per candidate, how many targets that resisted every chosen move it
+        hits at least neutrally, and how many more targets it lets the moveset
+        hit super effectively.
+    """
+    current = best_multipliers(defense, attack_types)[:, None]
+    added = np.maximum(current, defense[:, candidate_types])  # (targets, candidates)
+    unresisted = (added >= 1).sum(axis=0) - (current >= 1).sum()
+    super_effective = (added > 1).sum(axis=0) - (current > 1).sum()
+    return unresisted, super_effective
@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Busy(Exception):
+    """Raised when a command already has too many requests waiting for a worker."""
+
+
+class WorkerPool:
+    """
+    Runs blocking lookup and render work off the event loop, on a bounded thread pool.
+
+    Each command gets its own concurrency limit, so one slow command can't take
+    every worker, and a cap on how many requests may wait for that limit. Past
+    the cap, requests are turned away with Busy instead of queueing without end.
+    The event loop itself only awaits, so gateway heartbeats are never held up
+    by a large query.
+
+    Parameters:
+    max_workers (int): Number of worker threads shared by all commands.
+    concurrency (dict): Command name mapped to how many of its requests may run
+        at once. The "default" entry applies to commands that aren't listed.
+    max_waiting (int): How many requests per command may wait for a free slot.
+    """
+
+    def __init__(self, max_workers=4, concurrency=None, max_waiting=10):
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="worker")
+        self.concurrency = {"default": 2, **(concurrency or {})}
+        self.max_waiting = max_waiting
+        self.semaphores = {}
+        self.waiting = {}
+
+    def semaphore(self, command):
+        if command not in self.semaphores:
+            limit = self.concurrency.get(command, self.concurrency["default"])
+            self.semaphores[command] = asyncio.Semaphore(limit)
+        return self.semaphores[command]
+
+    async def run(self, command, function, *args):
+        """
+        Runs function(*args) on a worker thread within the command's concurrency limit.
+
+        Raises:
+        Busy: If max_waiting requests for this command are already waiting.
+        """
+        semaphore = self.semaphore(command)
+        if semaphore.locked() and self.waiting.get(command, 0) >= self.max_waiting:
+            raise Busy(command)
+
+        self.waiting[command] = self.waiting.get(command, 0) + 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting[command] -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            semaphore.release()